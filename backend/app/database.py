@@ -1,4 +1,4 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, Index, text
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from pydantic_settings import BaseSettings
@@ -12,6 +12,18 @@ class Settings(BaseSettings):
     secret_key: str = os.getenv("SECRET_KEY", "your-secret-key-here")
     algorithm: str = "HS256"
     access_token_expire_minutes: int = 30
+    uploads_sendfile_mode: str = os.getenv("UPLOADS_SENDFILE_MODE", "")
+    uploads_accel_prefix: str = os.getenv("UPLOADS_ACCEL_PREFIX", "/protected-uploads")
+    uploads_require_signature: bool = os.getenv("UPLOADS_REQUIRE_SIGNATURE", "false").lower() == "true"
+    upload_url_expire_minutes: int = int(os.getenv("UPLOAD_URL_EXPIRE_MINUTES", "60"))
+    review_note_spread: float = float(os.getenv("REVIEW_NOTE_SPREAD", "2.0"))
+    review_question_variance: float = float(os.getenv("REVIEW_QUESTION_VARIANCE", "6.0"))
+    cards_cache_ttl_seconds: int = int(os.getenv("CARDS_CACHE_TTL_SECONDS", "15"))
+    progress_snapshot_interval_seconds: int = int(os.getenv("PROGRESS_SNAPSHOT_INTERVAL_SECONDS", "300"))
+    dashboard_stream_heartbeat_seconds: int = int(os.getenv("DASHBOARD_STREAM_HEARTBEAT_SECONDS", "15"))
+    next_project_target_assessments: int = int(os.getenv("NEXT_PROJECT_TARGET_ASSESSMENTS", "3"))
+    next_project_claim_minutes: int = int(os.getenv("NEXT_PROJECT_CLAIM_MINUTES", "30"))
+    sync_cursor_overlap_seconds: int = int(os.getenv("SYNC_CURSOR_OVERLAP_SECONDS", "30"))
 
 settings = Settings()
 
@@ -24,6 +36,16 @@ SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 Base = declarative_base()
 
+def live_unique_index(name: str, *columns: str) -> Index:
+    """Índice único parcial: a unicidade vale apenas entre registros não excluídos (deleted_at nulo)."""
+    return Index(
+        name,
+        *columns,
+        unique=True,
+        postgresql_where=text("deleted_at IS NULL"),
+        sqlite_where=text("deleted_at IS NULL")
+    )
+
 def get_db():
     db = SessionLocal()
     try:
@@ -0,0 +1,24 @@
+from enum import Enum
+
+class AggregationRule(Enum):
+    MEAN = "mean"
+    MEDIAN = "median"
+    TRIMMED_MEAN = "trimmed_mean"
+    DROP_OUTLIER = "drop_outlier"
+    
+    def get_label(self) -> str:
+        return {
+            self.MEAN: "Média das avaliações",
+            self.MEDIAN: "Mediana das avaliações",
+            self.TRIMMED_MEAN: "Média sem a maior e a menor avaliação",
+            self.DROP_OUTLIER: "Média sem a avaliação mais distante",
+        }[self]
+    
+    @classmethod
+    def get_values(cls) -> dict:
+        return {
+            cls.MEAN.value: "Média das avaliações",
+            cls.MEDIAN.value: "Mediana das avaliações",
+            cls.TRIMMED_MEAN.value: "Média sem a maior e a menor avaliação",
+            cls.DROP_OUTLIER.value: "Média sem a avaliação mais distante",
+        }
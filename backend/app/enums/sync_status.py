@@ -0,0 +1,24 @@
+from enum import Enum
+
+class SyncStatus(Enum):
+    APPLIED = "applied"
+    DUPLICATE = "duplicate"
+    STALE = "stale"
+    ERROR = "error"
+    
+    def get_label(self) -> str:
+        return {
+            self.APPLIED: "Respostas gravadas",
+            self.DUPLICATE: "Envio já processado anteriormente",
+            self.STALE: "Respostas mais recentes já gravadas",
+            self.ERROR: "Envio rejeitado",
+        }[self]
+    
+    @classmethod
+    def get_values(cls) -> dict:
+        return {
+            cls.APPLIED.value: "Respostas gravadas",
+            cls.DUPLICATE.value: "Envio já processado anteriormente",
+            cls.STALE.value: "Respostas mais recentes já gravadas",
+            cls.ERROR.value: "Envio rejeitado",
+        }
@@ -13,6 +13,12 @@ from .event import Event
 from .password_reset import PasswordReset
 from .password_reset_config import PasswordResetConfig
 from .document import Document
+from .score import AssessmentScore, ProjectQuestionScore, ProjectScore, EvaluatorScoreStat, ProjectNormalizedScore
+from .scoring_profile import ScoringProfile, ScoringProfileWeight
+from .rollup import YearRollup, CategoryYearRollup, SchoolYearRollup
+from .progress_snapshot import ProgressSnapshot
+from .assessment_schedule import AssessmentSchedule
+from .sync_receipt import SyncReceipt
 from .relationships import evaluator_categories, student_projects, supervisor_projects, award_question
 from app.database import Base
 
@@ -32,6 +38,19 @@ __all__ = [
     "PasswordReset",
     "PasswordResetConfig",
     "Document",
+    "AssessmentScore",
+    "ProjectQuestionScore",
+    "ProjectScore",
+    "EvaluatorScoreStat",
+    "ProjectNormalizedScore",
+    "ScoringProfile",
+    "ScoringProfileWeight",
+    "YearRollup",
+    "CategoryYearRollup",
+    "SchoolYearRollup",
+    "ProgressSnapshot",
+    "AssessmentSchedule",
+    "SyncReceipt",
     "Base",
     "evaluator_categories",
     "student_projects",
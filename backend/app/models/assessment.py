@@ -1,10 +1,13 @@
 from sqlalchemy import Column, Integer, DateTime, ForeignKey
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
-from app.database import Base
+from app.database import Base, live_unique_index
 
 class Assessment(Base):
     __tablename__ = "assessments"
+    __table_args__ = (
+        live_unique_index("uq_assessments_live_evaluator_project", "evaluator_id", "project_id"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     evaluator_id = Column(Integer, ForeignKey("evaluators.id"), nullable=False)
@@ -16,13 +19,19 @@ class Assessment(Base):
     evaluator = relationship("Evaluator", back_populates="assessments")
     project = relationship("Project", back_populates="assessments")
     responses = relationship("Response", back_populates="assessment")
+    score_summary = relationship("AssessmentScore", uselist=False, viewonly=True)
     
     @property
     def has_response(self) -> bool:
+        if self.score_summary is not None:
+            return self.score_summary.has_response
         return len(self.responses) > 0
     
     @property
     def note(self) -> float:
+        if self.score_summary is not None:
+            return self.score_summary.note
+        
         responses_with_score = [r for r in self.responses if r.score is not None]
         
         if not responses_with_score:
@@ -1,10 +1,13 @@
 from sqlalchemy import Column, Integer, String, DateTime, ForeignKey
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
-from app.database import Base
+from app.database import Base, live_unique_index
 
 class Category(Base):
     __tablename__ = "categories"
+    __table_args__ = (
+        live_unique_index("uq_categories_live_name", "name"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String(255), nullable=False)
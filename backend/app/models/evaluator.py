@@ -1,10 +1,13 @@
 from sqlalchemy import Column, Integer, String, DateTime, ForeignKey
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
-from app.database import Base
+from app.database import Base, live_unique_index
 
 class Evaluator(Base):
     __tablename__ = "evaluators"
+    __table_args__ = (
+        live_unique_index("uq_evaluators_live_user", "user_id"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
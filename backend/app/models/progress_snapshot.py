@@ -0,0 +1,21 @@
+from sqlalchemy import Column, Integer, DateTime, Index
+from sqlalchemy.sql import func
+from app.database import Base
+
+class ProgressSnapshot(Base):
+    __tablename__ = "progress_snapshots"
+    __table_args__ = (
+        Index("ix_progress_snapshots_year_taken_at", "year", "taken_at"),
+    )
+    
+    id = Column(Integer, primary_key=True, index=True)
+    year = Column(Integer, nullable=False)
+    taken_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+    total_projetos = Column(Integer, nullable=False, default=0)
+    trabalhos_avaliados = Column(Integer, nullable=False, default=0)
+    avaliadores_ativos = Column(Integer, nullable=False, default=0)
+    faltam_1_avaliacao = Column(Integer, nullable=False, default=0)
+    faltam_2_avaliacoes = Column(Integer, nullable=False, default=0)
+    faltam_3_avaliacoes = Column(Integer, nullable=False, default=0)
+    progresso_geral = Column(Integer, nullable=False, default=0)
+    progresso_geral_inicial = Column(Integer, nullable=False, default=0)
@@ -22,6 +22,8 @@ class Project(Base):
     students = relationship("Student", secondary="student_projects", back_populates="projects")
     supervisors = relationship("Supervisor", secondary="supervisor_projects", back_populates="projects")
     assessments = relationship("Assessment", back_populates="project")
+    score_summary = relationship("ProjectScore", uselist=False, viewonly=True)
+    normalized_summary = relationship("ProjectNormalizedScore", uselist=False, viewonly=True)
     
     @property
     def school_grade(self) -> str:
@@ -47,9 +49,18 @@ class Project(Base):
     
     @property
     def final_note(self) -> float:
+        if self.score_summary is not None:
+            return self.score_summary.final_note
+        
         assessments_with_responses = [a for a in self.assessments if a.has_response]
         if not assessments_with_responses:
             return 0.0
         
         total_notes = sum(a.note for a in assessments_with_responses)
-        return round(total_notes / len(assessments_with_responses), 2) 
\ No newline at end of file
+        return round(total_notes / len(assessments_with_responses), 2) 
+    
+    @property
+    def normalized_note(self):
+        if self.normalized_summary is not None:
+            return self.normalized_summary.normalized_note
+        return None
@@ -0,0 +1,39 @@
+from sqlalchemy import Column, Integer, Float, DateTime, ForeignKey
+from sqlalchemy.sql import func
+from app.database import Base
+
+class YearRollup(Base):
+    __tablename__ = "year_rollups"
+
+    year = Column(Integer, primary_key=True)
+    projects_count = Column(Integer, nullable=False, default=0)
+    evaluated_projects_count = Column(Integer, nullable=False, default=0)
+    assessments_count = Column(Integer, nullable=False, default=0)
+    completed_assessments_count = Column(Integer, nullable=False, default=0)
+    evaluators_count = Column(Integer, nullable=False, default=0)
+    students_count = Column(Integer, nullable=False, default=0)
+    schools_count = Column(Integer, nullable=False, default=0)
+    average_note = Column(Float, nullable=True)
+    closed_at = Column(DateTime(timezone=True), nullable=True)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+class CategoryYearRollup(Base):
+    __tablename__ = "category_year_rollups"
+
+    year = Column(Integer, primary_key=True)
+    category_id = Column(Integer, ForeignKey("categories.id", ondelete="CASCADE"), primary_key=True)
+    projects_count = Column(Integer, nullable=False, default=0)
+    evaluated_projects_count = Column(Integer, nullable=False, default=0)
+    assessments_count = Column(Integer, nullable=False, default=0)
+    average_note = Column(Float, nullable=True)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+class SchoolYearRollup(Base):
+    __tablename__ = "school_year_rollups"
+
+    year = Column(Integer, primary_key=True)
+    school_id = Column(Integer, ForeignKey("schools.id", ondelete="CASCADE"), primary_key=True)
+    students_count = Column(Integer, nullable=False, default=0)
+    projects_count = Column(Integer, nullable=False, default=0)
+    average_note = Column(Float, nullable=True)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
@@ -1,11 +1,14 @@
 from sqlalchemy import Column, Integer, String, DateTime
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
-from app.database import Base
+from app.database import Base, live_unique_index
 from app.enums.school_type import SchoolType
 
 class School(Base):
     __tablename__ = "schools"
+    __table_args__ = (
+        live_unique_index("uq_schools_live_name", "name"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String(255), nullable=False)
@@ -0,0 +1,57 @@
+from sqlalchemy import Column, Integer, Float, DateTime, ForeignKey
+from sqlalchemy.sql import func
+from app.database import Base
+
+class AssessmentScore(Base):
+    __tablename__ = "assessment_scores"
+
+    assessment_id = Column(Integer, ForeignKey("assessments.id", ondelete="CASCADE"), primary_key=True)
+    project_id = Column(Integer, ForeignKey("projects.id", ondelete="CASCADE"), nullable=False, index=True)
+    evaluator_id = Column(Integer, ForeignKey("evaluators.id", ondelete="CASCADE"), nullable=False, index=True)
+    responses_count = Column(Integer, nullable=False, default=0)
+    scored_count = Column(Integer, nullable=False, default=0)
+    score_sum = Column(Integer, nullable=False, default=0)
+    note = Column(Float, nullable=False, default=0.0, index=True)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+    @property
+    def has_response(self) -> bool:
+        return self.responses_count > 0
+
+class ProjectQuestionScore(Base):
+    __tablename__ = "project_question_scores"
+
+    project_id = Column(Integer, ForeignKey("projects.id", ondelete="CASCADE"), primary_key=True)
+    question_id = Column(Integer, ForeignKey("questions.id", ondelete="CASCADE"), primary_key=True, index=True)
+    responses_count = Column(Integer, nullable=False, default=0)
+    score_sum = Column(Integer, nullable=False, default=0)
+    average = Column(Float, nullable=False, default=0.0)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+class ProjectScore(Base):
+    __tablename__ = "project_scores"
+
+    project_id = Column(Integer, ForeignKey("projects.id", ondelete="CASCADE"), primary_key=True)
+    assessments_count = Column(Integer, nullable=False, default=0)
+    final_note = Column(Float, nullable=False, default=0.0, index=True)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+class EvaluatorScoreStat(Base):
+    __tablename__ = "evaluator_score_stats"
+
+    evaluator_id = Column(Integer, ForeignKey("evaluators.id", ondelete="CASCADE"), primary_key=True)
+    year = Column(Integer, primary_key=True)
+    responses_count = Column(Integer, nullable=False, default=0)
+    mean = Column(Float, nullable=False, default=0.0)
+    stddev = Column(Float, nullable=False, default=0.0)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+class ProjectNormalizedScore(Base):
+    __tablename__ = "project_normalized_scores"
+
+    project_id = Column(Integer, ForeignKey("projects.id", ondelete="CASCADE"), primary_key=True)
+    year = Column(Integer, nullable=False, index=True)
+    assessments_count = Column(Integer, nullable=False, default=0)
+    z_score = Column(Float, nullable=False, default=0.0)
+    normalized_note = Column(Float, nullable=False, default=0.0, index=True)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
@@ -0,0 +1,29 @@
+from sqlalchemy import Column, Integer, String, DateTime, Text, Float, ForeignKey
+from sqlalchemy.orm import relationship
+from sqlalchemy.sql import func
+from app.database import Base
+from app.enums.aggregation_rule import AggregationRule
+
+class ScoringProfile(Base):
+    __tablename__ = "scoring_profiles"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    name = Column(String(255), nullable=False)
+    description = Column(Text, nullable=True)
+    year = Column(Integer, nullable=False)
+    aggregation = Column(String(20), nullable=False, default=AggregationRule.MEAN.value)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    deleted_at = Column(DateTime(timezone=True), nullable=True)
+    
+    weights = relationship("ScoringProfileWeight", back_populates="profile", cascade="all, delete-orphan")
+
+class ScoringProfileWeight(Base):
+    __tablename__ = "scoring_profile_weights"
+    
+    scoring_profile_id = Column(Integer, ForeignKey("scoring_profiles.id", ondelete="CASCADE"), primary_key=True)
+    question_id = Column(Integer, ForeignKey("questions.id"), primary_key=True)
+    weight = Column(Float, nullable=False, default=1.0)
+    
+    profile = relationship("ScoringProfile", back_populates="weights")
+    question = relationship("Question")
@@ -0,0 +1,14 @@
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Text
+from sqlalchemy.sql import func
+from app.database import Base
+
+class SyncReceipt(Base):
+    __tablename__ = "sync_receipts"
+
+    evaluator_id = Column(Integer, ForeignKey("evaluators.id", ondelete="CASCADE"), primary_key=True)
+    idempotency_key = Column(String(64), primary_key=True)
+    assessment_id = Column(Integer, ForeignKey("assessments.id", ondelete="CASCADE"), nullable=False, index=True)
+    client_timestamp = Column(DateTime(timezone=True), nullable=False)
+    status = Column(String(20), nullable=False)
+    result = Column(Text, nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
@@ -1 +1 @@
-from . import documents, web_auth, cards, password_reset_configs, import_general 
\ No newline at end of file
+from . import documents, web_auth, cards, password_reset_configs, import_general, scores, rollups, schedules 
\ No newline at end of file
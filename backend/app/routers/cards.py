@@ -1,98 +1,109 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Header
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
-from sqlalchemy import or_, not_, exists, and_, func, distinct
-from app.database import get_db
-from app.models.project import Project
-from app.models.assessment import Assessment
-from app.models.evaluator import Evaluator
-from app.models.response import Response
-from app.schemas.cards import CardsResponse
+from app.database import get_db, settings
+from app.models.progress_snapshot import ProgressSnapshot
+from app.schemas.cards import CardsResponse, ProgressResponse, ProgressHistoryResponse
+from app.services.cards_service import get_cards, get_progress
+from app.services.dashboard_stream_service import dashboard_stream
+from typing import Optional
+from datetime import datetime
 
 router = APIRouter()
 
 @router.get("", response_model=CardsResponse)
 @router.get("/", response_model=CardsResponse)
-async def get_cards_data(db: Session = Depends(get_db)):
+async def get_cards_data(
+    year: Optional[int] = Query(None, description="Ano do evento (padrão: ano atual)"),
+    db: Session = Depends(get_db)
+):
     try:
-        total_projetos = db.query(Project).filter(Project.deleted_at == None).count()
+        filter_year = year if year is not None else datetime.now().year
         
-        projetos_sem_avaliacao = db.query(Project).filter(
-            Project.deleted_at == None,
-            ~exists().where(
-                and_(
-                    Assessment.project_id == Project.id,
-                    Assessment.deleted_at == None,
-                    exists().where(
-                        and_(
-                            Response.assessment_id == Assessment.id,
-                            Response.deleted_at == None
-                        )
-                    )
-                )
-            )
-        ).count()
+        return CardsResponse(**get_cards(db, filter_year))
         
-        projetos_avaliados = total_projetos - projetos_sem_avaliacao
-        
-        avaliadores_ativos = db.query(Evaluator).filter(Evaluator.deleted_at == None).count()
-        
-        faltam_1_avaliacao = (
-            db.query(Project)
-            .join(Assessment, and_(
-                Assessment.project_id == Project.id,
-                Assessment.deleted_at == None
-            ))
-            .join(Response, and_(
-                Response.assessment_id == Assessment.id,
-                Response.deleted_at == None
-            ))
-            .filter(Project.deleted_at == None)
-            .group_by(Project.id)
-            .having(func.count(distinct(Assessment.id)) == 2)
-            .count()
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Erro ao buscar dados dos cards: {str(e)}"
         )
 
-        faltam_2_avaliacoes = (
-            db.query(Project)
-            .join(Assessment, and_(
-                Assessment.project_id == Project.id,
-                Assessment.deleted_at == None
-            ))
-            .join(Response, and_(
-                Response.assessment_id == Assessment.id,
-                Response.deleted_at == None
-            ))
-            .filter(Project.deleted_at == None)
-            .group_by(Project.id)
-            .having(func.count(distinct(Assessment.id)) == 1)
-            .count()
+@router.get("/progress", response_model=ProgressResponse)
+async def get_progress_data(
+    year: Optional[int] = Query(None, description="Ano do evento (padrão: ano atual)"),
+    db: Session = Depends(get_db)
+):
+    """Progresso das avaliações por categoria, área, nível de ensino e tipo de projeto"""
+    try:
+        filter_year = year if year is not None else datetime.now().year
+        
+        return ProgressResponse(**get_progress(db, filter_year))
+        
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Erro ao buscar progresso das avaliações: {str(e)}"
         )
 
-        faltam_3_avaliacoes = projetos_sem_avaliacao
+@router.get("/history", response_model=ProgressHistoryResponse)
+async def get_progress_history(
+    year: Optional[int] = Query(None, description="Ano do evento (padrão: ano atual)"),
+    since: Optional[datetime] = Query(None, description="Registros a partir deste momento"),
+    until: Optional[datetime] = Query(None, description="Registros até este momento"),
+    limit: int = Query(500, ge=1, le=5000),
+    db: Session = Depends(get_db)
+):
+    """Série temporal do progresso das avaliações, lida do histórico registrado"""
+    try:
+        filter_year = year if year is not None else datetime.now().year
         
-        progresso_geral = 0
-        progresso_geral_inicial = 0
-        if total_projetos > 0:
-            progresso_geral_inicial = round((projetos_avaliados / total_projetos) * 100)
-            soma_projetos_nao_finalizados = faltam_1_avaliacao + faltam_2_avaliacoes + faltam_3_avaliacoes
-            progresso_geral = round(((total_projetos - soma_projetos_nao_finalizados) / total_projetos) * 100)
-
-        return CardsResponse(
-            total_projetos=total_projetos,
-            trabalhos_para_avaliar=projetos_sem_avaliacao,
-            trabalhos_avaliados=projetos_avaliados,
-            avaliadores_ativos=avaliadores_ativos,
-            progresso_geral=progresso_geral,
-            progresso_geral_inicial=progresso_geral_inicial,
-            status_avaliacoes={
-                "faltam_1_avaliacao": faltam_1_avaliacao,
-                "faltam_2_avaliacoes": faltam_2_avaliacoes,
-                "faltam_3_avaliacoes": faltam_3_avaliacoes
-            }
+        query = db.query(ProgressSnapshot).filter(ProgressSnapshot.year == filter_year)
+        if since is not None:
+            query = query.filter(ProgressSnapshot.taken_at >= since)
+        if until is not None:
+            query = query.filter(ProgressSnapshot.taken_at <= until)
+        
+        # Os registros mais recentes, devolvidos em ordem cronológica
+        snapshots = query.order_by(ProgressSnapshot.taken_at.desc()).limit(limit).all()
+        
+        return ProgressHistoryResponse(
+            year=filter_year,
+            interval_seconds=settings.progress_snapshot_interval_seconds,
+            points=[
+                {
+                    "taken_at": snapshot.taken_at,
+                    "total_projetos": snapshot.total_projetos,
+                    "trabalhos_avaliados": snapshot.trabalhos_avaliados,
+                    "avaliadores_ativos": snapshot.avaliadores_ativos,
+                    "progresso_geral": snapshot.progresso_geral,
+                    "progresso_geral_inicial": snapshot.progresso_geral_inicial,
+                    "status_avaliacoes": {
+                        "faltam_1_avaliacao": snapshot.faltam_1_avaliacao,
+                        "faltam_2_avaliacoes": snapshot.faltam_2_avaliacoes,
+                        "faltam_3_avaliacoes": snapshot.faltam_3_avaliacoes
+                    }
+                }
+                for snapshot in reversed(snapshots)
+            ]
         )
         
     except Exception as e:
         raise HTTPException(
             status_code=500,
-            detail=f"Erro ao buscar dados dos cards: {str(e)}"
-        ) 
\ No newline at end of file
+            detail=f"Erro ao buscar histórico de progresso: {str(e)}"
+        )
+
+@router.get("/stream")
+async def stream_dashboard(last_event_id: Optional[str] = Header(None)):
+    """
+    Stream SSE do painel: um evento "snapshot" com cards e progresso completos e,
+    a cada gravação de respostas ou avaliações, um evento "delta" só com o que mudou.
+    """
+    return StreamingResponse(
+        dashboard_stream.events(last_event_id, settings.dashboard_stream_heartbeat_seconds),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "X-Accel-Buffering": "no"
+        }
+    )
@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query, UploadFile, File
+from fastapi import APIRouter, Depends, HTTPException, status, Query, UploadFile, File, Form
 from fastapi.responses import FileResponse
 from sqlalchemy.orm import Session, joinedload
 from app.database import get_db
@@ -6,8 +6,14 @@ from app.models.assessment import Assessment
 from app.models.evaluator import Evaluator
 from app.models.project import Project
 from app.models.response import Response
+from app.models.score import AssessmentScore
+from app.services.score_service import refresh_scores
+from app.services.assignment_service import assign_evaluators
+from app.services.upsert_service import insert_ignoring_conflicts
+from app.services.bulk_assignment_service import apply_assignments, read_assignment_sheet, resolve_sheet_pairs
 from app.schemas.assessment import (
-    AssessmentCreate, AssessmentUpdate, AssessmentListResponse, AssessmentDetailResponse
+    AssessmentCreate, AssessmentUpdate, AssessmentListResponse, AssessmentDetailResponse,
+    AutoAssignRequest, AutoAssignResponse, BulkAssignmentRequest, BulkAssignmentResponse
 )
 from typing import Optional
 import csv
@@ -16,7 +22,7 @@ import pandas as pd
 from datetime import datetime
 import os
 import tempfile
-from sqlalchemy import and_
+from sqlalchemy import and_, exists, func
 
 router = APIRouter()
 
@@ -30,6 +36,9 @@ async def get_assessments(
     has_response: Optional[bool] = Query(None, description="Filter by assessments with/without responses"),
     pin: Optional[str] = Query(None, description="Filter by evaluator PIN"),
     project_title: Optional[str] = Query(None, description="Filter by project title"),
+    min_note: Optional[float] = Query(None, description="Filter by minimum note"),
+    max_note: Optional[float] = Query(None, description="Filter by maximum note"),
+    order_by: Optional[str] = Query(None, description="Order by note (note, -note)"),
     db: Session = Depends(get_db)
 ):
     try:
@@ -38,7 +47,8 @@ async def get_assessments(
         query = db.query(Assessment).options(
             joinedload(Assessment.evaluator),
             joinedload(Assessment.project),
-            joinedload(Assessment.responses)
+            joinedload(Assessment.responses),
+            joinedload(Assessment.score_summary)
         ).filter(Assessment.deleted_at == None)
         
         # Flags para controlar joins
@@ -72,16 +82,32 @@ async def get_assessments(
         
         # Filtro por presença de respostas
         if has_response is not None:
-            if has_response:
-                query = query.join(Response, and_(
-                    Assessment.id == Response.assessment_id,
-                    Response.deleted_at == None
-                )).distinct()
-            else:
-                query = query.outerjoin(Response, and_(
-                    Assessment.id == Response.assessment_id,
-                    Response.deleted_at == None
-                )).filter(Response.id == None)
+            response_exists = exists().where(and_(
+                Response.assessment_id == Assessment.id,
+                Response.deleted_at == None
+            ))
+            query = query.filter(response_exists if has_response else ~response_exists)
+        
+        # Filtros e ordenação pela nota persistida
+        if min_note is not None or max_note is not None or order_by:
+            note_column = func.coalesce(AssessmentScore.note, 0)
+            query = query.outerjoin(AssessmentScore, AssessmentScore.assessment_id == Assessment.id)
+            
+            if min_note is not None:
+                query = query.filter(note_column >= min_note)
+            
+            if max_note is not None:
+                query = query.filter(note_column <= max_note)
+            
+            if order_by == "note":
+                query = query.order_by(note_column.asc(), Assessment.id)
+            elif order_by == "-note":
+                query = query.order_by(note_column.desc(), Assessment.id)
+            elif order_by:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="Ordenação inválida. Use note ou -note"
+                )
         
         assessments = query.offset(skip).limit(limit).all()
         
@@ -134,6 +160,8 @@ async def get_assessments(
             message="Avaliações recuperadas com sucesso",
             data=assessment_data
         )
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -230,26 +258,24 @@ async def create_assessment(assessment_data: AssessmentCreate, db: Session = Dep
                 detail="Projeto não encontrado"
             )
         
-        existing_assessment = db.query(Assessment).filter(
-            Assessment.evaluator_id == assessment_data.evaluator_id,
-            Assessment.project_id == assessment_data.project_id,
-            Assessment.deleted_at == None,
-        ).first()
+        # O índice único entre avaliações não excluídas impede duplicatas mesmo com requisições concorrentes
+        inserted = insert_ignoring_conflicts(
+            db,
+            Assessment,
+            [{"evaluator_id": assessment_data.evaluator_id, "project_id": assessment_data.project_id}],
+            index_elements=["evaluator_id", "project_id"]
+        )
         
-        if existing_assessment:
+        if not inserted:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Já existe uma avaliação para este avaliador e projeto"
             )
         
-        assessment = Assessment(
-            evaluator_id=assessment_data.evaluator_id,
-            project_id=assessment_data.project_id
-        )
-        
-        db.add(assessment)
+        refresh_scores(db, [assessment_data.project_id])
         db.commit()
-        db.refresh(assessment)
+        
+        assessment = db.query(Assessment).filter(Assessment.id == inserted[0].id).first()
         
         assessment_dict = {
             "id": assessment.id,
@@ -305,6 +331,122 @@ async def create_assessment(assessment_data: AssessmentCreate, db: Session = Dep
             detail=f"Erro ao criar avaliação: {str(e)}"
         )
 
+@router.post("/auto-assign", response_model=AutoAssignResponse)
+async def auto_assign_assessments(request: AutoAssignRequest, db: Session = Depends(get_db)):
+    """Distribui avaliadores aos projetos por categoria, equilibrando a carga e evitando conflitos de escola"""
+    try:
+        year = request.year if request.year is not None else datetime.now().year
+        
+        result = assign_evaluators(
+            db,
+            year,
+            evaluators_per_project=request.evaluators_per_project,
+            max_per_evaluator=request.max_per_evaluator,
+            category_id=request.category_id,
+            dry_run=request.dry_run
+        )
+        
+        if not request.dry_run:
+            db.commit()
+        
+        return AutoAssignResponse(
+            status=True,
+            message=f"{result['created_count']} avaliações {'sugeridas' if request.dry_run else 'criadas'}, {len(result['unfilled'])} projetos sem avaliadores suficientes",
+            data=result
+        )
+    except Exception as e:
+        db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Erro ao distribuir avaliações: {str(e)}"
+        )
+
+def _bulk_assignment_message(result: dict) -> str:
+    action = "sugeridas" if result["dry_run"] else "aplicadas"
+    message = (
+        f"Alterações {action}: {result['created_count']} avaliações criadas, "
+        f"{result['removed_count']} removidas, {result['unchanged_count']} mantidas"
+    )
+    if result["errors"]:
+        message += f", {len(result['errors'])} erros"
+    return message
+
+@router.post("/bulk", response_model=BulkAssignmentResponse)
+async def bulk_assign_assessments(request: BulkAssignmentRequest, db: Session = Depends(get_db)):
+    """Aplica vários pares avaliador/projeto em uma única transação"""
+    try:
+        year = request.year if request.year is not None else datetime.now().year
+
+        result = apply_assignments(
+            db,
+            year,
+            [(None, (pair.evaluator_id, pair.project_id)) for pair in request.pairs],
+            replace=request.replace,
+            dry_run=request.dry_run
+        )
+
+        if not request.dry_run:
+            db.commit()
+
+        return BulkAssignmentResponse(
+            status=True,
+            message=_bulk_assignment_message(result),
+            data=result
+        )
+    except Exception as e:
+        db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Erro ao aplicar avaliações em lote: {str(e)}"
+        )
+
+@router.post("/bulk/import", response_model=BulkAssignmentResponse)
+async def bulk_assign_assessments_from_file(
+    file: UploadFile = File(...),
+    year: Optional[int] = Form(None),
+    replace: bool = Form(False),
+    dry_run: bool = Form(False),
+    db: Session = Depends(get_db)
+):
+    """Aplica as avaliações de um CSV/XLSX no molde de importação ou no layout do saipru.csv"""
+    try:
+        if not file.filename.endswith(('.csv', '.xlsx', '.xls', '.xlsm')):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Arquivo deve ser CSV ou Excel"
+            )
+
+        year = year if year is not None else datetime.now().year
+
+        try:
+            df = read_assignment_sheet(await file.read(), file.filename)
+            pairs, errors = resolve_sheet_pairs(db, year, df)
+        except ValueError as e:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=str(e)
+            )
+
+        result = apply_assignments(db, year, pairs, replace=replace, dry_run=dry_run)
+        result["errors"] = errors + result["errors"]
+
+        if not dry_run:
+            db.commit()
+
+        return BulkAssignmentResponse(
+            status=True,
+            message=_bulk_assignment_message(result),
+            data=result
+        )
+    except HTTPException:
+        raise
+    except Exception as e:
+        db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Erro ao importar avaliações em lote: {str(e)}"
+        )
+
 @router.put("/{assessment_id}", response_model=AssessmentDetailResponse)
 async def update_assessment(
     assessment_id: int,
@@ -350,10 +492,13 @@ async def update_assessment(
                     detail="Já existe uma avaliação para este avaliador e projeto"
                 )
         
+        previous_project_id = assessment.project_id
+        
         update_data = assessment_data.dict(exclude_unset=True)
         for field, value in update_data.items():
             setattr(assessment, field, value)
         
+        refresh_scores(db, {previous_project_id, assessment.project_id})
         db.commit()
         db.refresh(assessment)
         
@@ -422,7 +567,9 @@ async def delete_assessment(assessment_id: int, db: Session = Depends(get_db)):
                 detail="Avaliação não encontrada"
             )
         
+        project_id = assessment.project_id
         db.delete(assessment)
+        refresh_scores(db, [project_id])
         db.commit()
         
         return {
@@ -524,46 +671,29 @@ async def import_assessments_csv(
         csv_text = content.decode('utf-8')
         
         # Usar pandas para ler o CSV
-        df = pd.read_csv(io.StringIO(csv_text))
-        
-        imported_count = 0
-        errors = []
-        
-        for index, row in df.iterrows():
-            try:
-                # Verificar se o avaliador existe
-                evaluator = db.query(Evaluator).filter(Evaluator.id == row['evaluator_id']).first()
-                if not evaluator:
-                    errors.append(f"Linha {index + 2}: Avaliador com ID {row['evaluator_id']} não encontrado")
-                    continue
-                
-                # Verificar se o projeto existe
-                project = db.query(Project).filter(Project.id == row['project_id']).first()
-                if not project:
-                    errors.append(f"Linha {index + 2}: Projeto com ID {row['project_id']} não encontrado")
-                    continue
-                
-                # Verificar se já existe avaliação para este avaliador e projeto
-                existing_assessment = db.query(Assessment).filter(
-                    Assessment.evaluator_id == row['evaluator_id'],
-                    Assessment.project_id == row['project_id'],
-                    Assessment.deleted_at == None
-                ).first()
-                if existing_assessment:
-                    errors.append(f"Linha {index + 2}: Já existe uma avaliação para este avaliador e projeto")
-                    continue
-                
-                # Criar nova avaliação
-                assessment = Assessment(
-                    evaluator_id=row['evaluator_id'],
-                    project_id=row['project_id']
-                )
-                
-                db.add(assessment)
-                imported_count += 1
-                
-            except Exception as e:
-                errors.append(f"Linha {index + 2}: {str(e)}")
+        df = pd.read_csv(io.StringIO(csv_text), dtype=str).fillna("")
+        df.columns = [str(column).strip() for column in df.columns]
+        
+        missing = [column for column in ("evaluator_id", "project_id") if column not in df.columns]
+        if missing:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Colunas obrigatórias ausentes: {', '.join(missing)}"
+            )
+        
+        # Validação por conjuntos e inserção em lote das avaliações que ainda não existem
+        pairs, errors = resolve_sheet_pairs(db, None, df)
+        result = apply_assignments(db, None, pairs)
+        errors += result["errors"]
+        imported_count = result["created_count"]
+        
+        # Pares já existentes (ou repetidos no arquivo) continuam sendo informados por linha
+        existing_pairs = {(item["evaluator_id"], item["project_id"]) for item in result["unchanged"]}
+        seen_pairs = set()
+        for line, pair in pairs:
+            if pair in existing_pairs or pair in seen_pairs:
+                errors.append(f"Linha {line}: Já existe uma avaliação para este avaliador e projeto")
+            seen_pairs.add(pair)
         
         db.commit()
         
@@ -576,6 +706,14 @@ async def import_assessments_csv(
             }
         }
         
+    except HTTPException:
+        raise
+    except ValueError as e:
+        db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
     except Exception as e:
         db.rollback()
         raise HTTPException(
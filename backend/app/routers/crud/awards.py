@@ -4,8 +4,9 @@ from sqlalchemy.orm import Session, joinedload
 from app.database import get_db
 from app.models.award import Award
 from app.schemas.award import (
-    AwardCreate, AwardUpdate, AwardListResponse, AwardDetailResponse
+    AwardCreate, AwardUpdate, AwardListResponse, AwardDetailResponse, AwardRankingResponse
 )
+from app.services.award_ranking_service import get_award_ranking
 from typing import Optional
 import csv
 import io
@@ -13,7 +14,7 @@ import pandas as pd
 from datetime import datetime
 import os
 import tempfile
-from sqlalchemy import and_
+from sqlalchemy import and_, func
 
 router = APIRouter()
 
@@ -147,6 +148,39 @@ async def get_award(
             detail=f"Error retrieving award: {str(e)}"
         )
 
+@router.get("/{award_id}/ranking", response_model=AwardRankingResponse)
+async def get_award_ranking_by_id(
+    award_id: int,
+    year: Optional[int] = Query(None, description="Filter by year (defaults to current year)"),
+    db: Session = Depends(get_db)
+):
+    try:
+        award = db.query(Award).filter(Award.id == award_id, Award.deleted_at == None).options(
+            joinedload(Award.questions)
+        ).first()
+        
+        if not award:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Award not found"
+            )
+        
+        filter_year = year if year is not None else datetime.now().year
+        ranking = get_award_ranking(db, award, filter_year)
+        
+        return AwardRankingResponse(
+            status=True,
+            message="Award ranking retrieved successfully",
+            data=ranking
+        )
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error retrieving award ranking: {str(e)}"
+        )
+
 @router.post("/", response_model=AwardDetailResponse)
 async def create_award(award_data: AwardCreate, db: Session = Depends(get_db)):
     try:
@@ -271,7 +305,7 @@ async def delete_award(award_id: int, db: Session = Depends(get_db)):
             )
         
         from datetime import datetime
-        award.deleted_at = datetime.utcnow()
+        award.deleted_at = func.now()
         
         db.commit()
         
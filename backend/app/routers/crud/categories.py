@@ -1,19 +1,20 @@
 from fastapi import APIRouter, Depends, HTTPException, status, Query, UploadFile, File
 from fastapi.responses import FileResponse
 from sqlalchemy.orm import Session, joinedload
+from sqlalchemy.exc import IntegrityError
 from app.database import get_db
 from app.models.category import Category
+from app.services.upsert_service import insert_ignoring_conflicts, split_conflicts
 from app.schemas.category import (
     CategoryCreate, CategoryUpdate, CategoryListResponse, CategoryDetailResponse
 )
 from typing import Optional
 import csv
 import io
-from datetime import datetime
 import pandas as pd
 import os
 import tempfile
-from sqlalchemy import and_
+from sqlalchemy import and_, select, func
 
 router = APIRouter()
 
@@ -285,6 +286,12 @@ async def create_category(category_data: CategoryCreate, db: Session = Depends(g
         )
     except HTTPException:
         raise
+    except IntegrityError:
+        db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="A category with this name already exists"
+        )
     except Exception as e:
         db.rollback()
         raise HTTPException(
@@ -404,6 +411,12 @@ async def update_category(
         )
     except HTTPException:
         raise
+    except IntegrityError:
+        db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="A category with this name already exists"
+        )
     except Exception as e:
         db.rollback()
         raise HTTPException(
@@ -422,7 +435,7 @@ async def delete_category(category_id: int, db: Session = Depends(get_db)):
                 detail="Category not found"
             )
         
-        category.deleted_at = datetime.utcnow()
+        category.deleted_at = func.now()
         
         db.commit()
         
@@ -525,39 +538,45 @@ async def import_categories_csv(
         csv_text = content.decode('utf-8')
         
         # Usar pandas para ler o CSV
-        df = pd.read_csv(io.StringIO(csv_text))
+        df = pd.read_csv(io.StringIO(csv_text), dtype=object)
+        df = df.where(pd.notna(df), None)
         
-        imported_count = 0
         errors = []
-        
-        for index, row in df.iterrows():
-            try:
-                # Verificar se a categoria já existe
-                existing_category = db.query(Category).filter(Category.name == row['name']).first()
-                if existing_category:
-                    errors.append(f"Linha {index + 2}: Categoria {row['name']} já existe")
+        rows = []
+        lines = []
+        
+        # Categorias pai verificadas com uma única consulta; valores não numéricos
+        # viram NaN e são reportados na linha correspondente
+        parent_column = pd.to_numeric(df['main_category_id'], errors='coerce') if 'main_category_id' in df else pd.Series(index=df.index, dtype=float)
+        parent_ids = {int(value) for value in parent_column.dropna()}
+        existing_parent_ids = set(db.scalars(
+            select(Category.id).where(Category.id.in_(parent_ids))
+        )) if parent_ids else set()
+        
+        for index, (row, parent_value) in enumerate(zip(df.to_dict("records"), parent_column), start=2):
+            name = str(row.get('name') or '').strip()
+            if not name:
+                errors.append(f"Linha {index}: Nome da categoria é obrigatório")
+                continue
+            
+            main_category_id = None
+            if row.get('main_category_id'):
+                if pd.isna(parent_value):
+                    errors.append(f"Linha {index}: ID da categoria pai inválido ({row['main_category_id']})")
                     continue
-                
-                # Verificar se a categoria pai existe (se especificada)
-                main_category_id = None
-                if pd.notna(row.get('main_category_id')) and row['main_category_id']:
-                    parent_category = db.query(Category).filter(Category.id == row['main_category_id']).first()
-                    if not parent_category:
-                        errors.append(f"Linha {index + 2}: Categoria pai com ID {row['main_category_id']} não encontrada")
-                        continue
-                    main_category_id = row['main_category_id']
-                
-                # Criar nova categoria
-                category = Category(
-                    name=row['name'],
-                    main_category_id=main_category_id
-                )
-                
-                db.add(category)
-                imported_count += 1
-                
-            except Exception as e:
-                errors.append(f"Linha {index + 2}: {str(e)}")
+                main_category_id = int(parent_value)
+                if main_category_id not in existing_parent_ids:
+                    errors.append(f"Linha {index}: Categoria pai com ID {main_category_id} não encontrada")
+                    continue
+            
+            rows.append({"name": name, "main_category_id": main_category_id})
+            lines.append(index)
+        
+        # Inserção em lote; nomes já existentes são rejeitados pelo índice único
+        inserted = insert_ignoring_conflicts(db, Category, rows, index_elements=["name"], returning=("id", "name"))
+        for position in split_conflicts(rows, inserted, ["name"]):
+            errors.append(f"Linha {lines[position]}: Categoria {rows[position]['name']} já existe")
+        imported_count = len(inserted)
         
         db.commit()
         
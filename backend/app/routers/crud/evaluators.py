@@ -6,7 +6,10 @@ from app.models.evaluator import Evaluator
 from app.models.user import User
 from app.models.category import Category
 from app.models.assessment import Assessment
+from app.models.response import Response
 from app.models.project import Project
+from app.services.score_service import refresh_scores
+from app.services.upsert_service import insert_ignoring_conflicts
 from app.schemas.evaluator import (
     EvaluatorCreate, EvaluatorUpdate, EvaluatorListResponse, EvaluatorDetailResponse, PinGenerateResponse
 )
@@ -18,7 +21,7 @@ import io
 import pandas as pd
 import os
 import tempfile
-from sqlalchemy import and_
+from sqlalchemy import and_, or_, func, select
 
 router = APIRouter()
 
@@ -228,36 +231,37 @@ async def create_evaluator(evaluator_data: EvaluatorCreate, db: Session = Depend
                 detail="Usuário não encontrado"
             )
 
-        existing_evaluator = db.query(Evaluator).filter(Evaluator.user_id == evaluator_data.user_id).first()
-        if existing_evaluator:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Usuário já possui um perfil de avaliador"
-            )
-
+        year = evaluator_data.year or datetime.now().year
         pin = evaluator_data.PIN
-        if pin:
-            existing_pin = db.query(Evaluator).filter(Evaluator.PIN == pin).first()
-            if existing_pin:
+        
+        # Os índices únicos (PIN e usuário entre avaliadores ativos) rejeitam
+        # duplicatas no próprio INSERT; a causa só é consultada quando há conflito
+        while True:
+            inserted = insert_ignoring_conflicts(
+                db,
+                Evaluator,
+                [{"user_id": evaluator_data.user_id, "PIN": pin or str(random.randint(1111, 9999)), "year": year}],
+                returning=("id", "PIN")
+            )
+            if inserted:
+                break
+            
+            existing_evaluator = db.query(Evaluator.id).filter(
+                Evaluator.user_id == evaluator_data.user_id,
+                Evaluator.deleted_at == None
+            ).first()
+            if existing_evaluator:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="Usuário já possui um perfil de avaliador"
+                )
+            if pin:
                 raise HTTPException(
                     status_code=status.HTTP_400_BAD_REQUEST,
                     detail="PIN já está em uso, por favor escolha outro"
                 )
-        else:
-            while True:
-                pin = str(random.randint(1111, 9999))
-                existing_pin = db.query(Evaluator).filter(Evaluator.PIN == pin).first()
-                if not existing_pin:
-                    break
-        
-        evaluator = Evaluator(
-            user_id=evaluator_data.user_id,
-            PIN=pin,
-            year=getattr(evaluator_data, 'year', datetime.now().year)
-        )
         
-        db.add(evaluator)
-        db.flush()  # Flush para obter o ID do evaluator
+        evaluator = db.query(Evaluator).filter(Evaluator.id == inserted[0].id).first()
         
         # Processar categories
         if evaluator_data.categories:
@@ -396,18 +400,42 @@ async def update_evaluator(
             assessments_to_update = db.query(Assessment).filter(
                 Assessment.id.in_(evaluator_data.assessments),
                 Assessment.deleted_at == None
-            ).all()
-
-            for assessment in assessments_to_update:
-                assessment.evaluator_id = evaluator.id
-
-            assessments_to_delete = db.query(Assessment).filter(
+            )
+            
+            # Duas avaliações informadas para o mesmo projeto violariam o índice único
+            # (avaliador, projeto); as demais avaliações do avaliador são removidas antes
+            duplicated_project = db.query(Assessment.project_id).filter(
+                Assessment.id.in_(evaluator_data.assessments),
+                Assessment.deleted_at == None
+            ).group_by(Assessment.project_id).having(func.count() > 1).first()
+            if duplicated_project:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=f"Mais de uma avaliação informada para o projeto {duplicated_project.project_id}"
+                )
+            
+            assessments_to_remove = db.query(Assessment).filter(
                 Assessment.evaluator_id == evaluator.id,
+                Assessment.deleted_at == None,
                 ~Assessment.id.in_(evaluator_data.assessments)
-            ).all()
-
-            for assessment in assessments_to_delete:
-                db.delete(assessment)
+            )
+            answered = select(Response.assessment_id).where(Response.assessment_id == Assessment.id).exists()
+            
+            changed_project_ids = {
+                row.project_id
+                for row in db.query(Assessment.project_id).filter(or_(
+                    and_(Assessment.id.in_(evaluator_data.assessments), Assessment.deleted_at == None),
+                    and_(Assessment.evaluator_id == evaluator.id, Assessment.deleted_at == None, ~Assessment.id.in_(evaluator_data.assessments))
+                )).distinct()
+            }
+            
+            # Remoção e reatribuição em lote, em vez de uma instrução por avaliação; a
+            # remoção vem antes para liberar os pares (avaliador, projeto) do índice único.
+            # Avaliações já respondidas são excluídas logicamente para manter as respostas
+            assessments_to_remove.filter(answered).update({Assessment.deleted_at: func.now()}, synchronize_session=False)
+            assessments_to_remove.filter(~answered).delete(synchronize_session=False)
+            assessments_to_update.update({Assessment.evaluator_id: evaluator.id}, synchronize_session=False)
+            refresh_scores(db, changed_project_ids)
         
         db.commit()
         db.refresh(evaluator)
@@ -473,7 +501,7 @@ async def delete_evaluator(evaluator_id: int, db: Session = Depends(get_db)):
                 detail="Evaluator not found"
             )
         
-        evaluator.deleted_at = datetime.utcnow()
+        evaluator.deleted_at = func.now()
         
         db.commit()
         
@@ -3,6 +3,7 @@ from fastapi.responses import FileResponse
 from sqlalchemy.orm import Session
 from app.database import get_db
 from app.models.event import Event
+from app.utils.uploads import signed_upload_url
 from app.schemas.event import (
     EventListResponse, EventDetailResponse
 )
@@ -16,7 +17,7 @@ import pandas as pd
 from datetime import datetime
 import os
 import tempfile
-from sqlalchemy import and_
+from sqlalchemy import and_, func
 import json
 
 router = APIRouter()
@@ -62,7 +63,7 @@ async def get_events(
                 "year": event.year,
                 "app_primary_color": event.app_primary_color,
                 "app_font_color": event.app_font_color,
-                "app_logo_url": event.app_logo_url,
+                "app_logo_url": signed_upload_url(event.app_logo_url),
                 "created_at": event.created_at,
                 "updated_at": event.updated_at,
                 "deleted_at": event.deleted_at,
@@ -99,7 +100,7 @@ async def get_event(
             "year": event.year,
             "app_primary_color": event.app_primary_color,
             "app_font_color": event.app_font_color,
-            "app_logo_url": event.app_logo_url,
+            "app_logo_url": signed_upload_url(event.app_logo_url),
             "created_at": event.created_at,
             "updated_at": event.updated_at,
             "deleted_at": event.deleted_at,
@@ -168,7 +169,7 @@ async def create_event(
             "id": event.id,
             "year": event.year,
             "app_primary_color": event.app_primary_color,
-            "app_logo_url": event.app_logo_url,
+            "app_logo_url": signed_upload_url(event.app_logo_url),
             "created_at": event.created_at,
             "updated_at": event.updated_at,
             "deleted_at": event.deleted_at,
@@ -263,7 +264,7 @@ async def update_event(
             "year": event.year,
             "app_primary_color": event.app_primary_color,
             "app_font_color": event.app_font_color,
-            "app_logo_url": event.app_logo_url,
+            "app_logo_url": signed_upload_url(event.app_logo_url),
             "created_at": event.created_at,
             "updated_at": event.updated_at,
             "deleted_at": event.deleted_at,
@@ -295,7 +296,7 @@ async def delete_event(event_id: int, db: Session = Depends(get_db)):
             )
         
         from datetime import datetime
-        event.deleted_at = datetime.utcnow()
+        event.deleted_at = func.now()
         
         db.commit()
         
@@ -7,6 +7,8 @@ from app.models.category import Category
 from app.models.assessment import Assessment
 from app.models.evaluator import Evaluator
 from app.models.user import User
+from app.models.score import ProjectScore
+from app.utils.uploads import signed_upload_url
 from app.schemas.project import (
     ProjectListResponse, ProjectDetailResponse
 )
@@ -18,7 +20,7 @@ import csv
 import io
 import pandas as pd
 import tempfile
-from sqlalchemy import and_, func
+from sqlalchemy import and_, func, insert, select
 
 router = APIRouter()
 
@@ -45,6 +47,9 @@ async def get_projects(
     project_type: Optional[int] = Query(None, description="Filter by project type (1=Tecnológico, 2=Científico)"),
     external_id: Optional[str] = Query(None, description="Filter by external ID"),
     assessments_count: Optional[int] = Query(None, description="Filter by number of assessments"),
+    min_final_note: Optional[float] = Query(None, description="Filter by minimum final note"),
+    max_final_note: Optional[float] = Query(None, description="Filter by maximum final note"),
+    order_by: Optional[str] = Query(None, description="Order by final note (final_note, -final_note)"),
     db: Session = Depends(get_db)
 ):
     try:
@@ -79,7 +84,9 @@ async def get_projects(
                 joinedload(Project.students),
                 joinedload(Project.supervisors),
                 joinedload(Project.assessments).joinedload(Assessment.evaluator).joinedload(Evaluator.user),
-                joinedload(Project.assessments).joinedload(Assessment.responses)
+                joinedload(Project.assessments).joinedload(Assessment.responses),
+                joinedload(Project.score_summary),
+                joinedload(Project.normalized_summary)
             )
         )
         
@@ -100,6 +107,27 @@ async def get_projects(
                 .filter(func.coalesce(subquery.c.count, 0) == assessments_count)
             )
         
+        # Filtros e ordenação pela nota final persistida
+        if min_final_note is not None or max_final_note is not None or order_by:
+            final_note_column = func.coalesce(ProjectScore.final_note, 0)
+            query = query.outerjoin(ProjectScore, ProjectScore.project_id == Project.id)
+            
+            if min_final_note is not None:
+                query = query.filter(final_note_column >= min_final_note)
+            
+            if max_final_note is not None:
+                query = query.filter(final_note_column <= max_final_note)
+            
+            if order_by == "final_note":
+                query = query.order_by(final_note_column.asc(), Project.id)
+            elif order_by == "-final_note":
+                query = query.order_by(final_note_column.desc(), Project.id)
+            elif order_by:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="Ordenação inválida. Use final_note ou -final_note"
+                )
+        
         projects = query.offset(skip).limit(limit).all()
         
         project_data = []
@@ -112,7 +140,9 @@ async def get_projects(
                 "category_id": project.category_id,
                 "projectType": project.projectType,
                 "external_id": project.external_id,
-                "file": project.file,
+                "file": signed_upload_url(project.file),
+                "final_note": project.final_note,
+                "normalized_note": project.normalized_note,
                 "created_at": project.created_at,
                 "updated_at": project.updated_at,
                 "deleted_at": project.deleted_at,
@@ -181,6 +211,8 @@ async def get_projects(
             message=f"Projetos recuperados com sucesso para o ano {filter_year}",
             data=project_data
         )
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -217,7 +249,7 @@ async def get_project(
             "category_id": project.category_id,
             "projectType": project.projectType,
             "external_id": project.external_id,
-            "file": project.file,
+            "file": signed_upload_url(project.file),
             "created_at": project.created_at,
             "updated_at": project.updated_at,
             "deleted_at": project.deleted_at,
@@ -337,7 +369,7 @@ async def create_project(
             "category_id": project.category_id,
             "projectType": project.projectType,
             "external_id": project.external_id,
-            "file": project.file,
+            "file": signed_upload_url(project.file),
             "created_at": project.created_at,
             "updated_at": project.updated_at,
             "deleted_at": project.deleted_at,
@@ -430,7 +462,7 @@ async def update_project(
             "category_id": project.category_id,
             "projectType": project.projectType,
             "external_id": project.external_id,
-            "file": project.file,
+            "file": signed_upload_url(project.file),
             "created_at": project.created_at,
             "updated_at": project.updated_at,
             "deleted_at": project.deleted_at,
@@ -465,7 +497,7 @@ async def delete_project(project_id: int, db: Session = Depends(get_db)):
                 detail="Projeto não encontrado"
             )
         
-        project.deleted_at = datetime.utcnow()
+        project.deleted_at = func.now()
         db.commit()
         
         return {
@@ -572,44 +604,70 @@ async def import_projects_csv(
         csv_text = content.decode('utf-8')
         
         # Usar pandas para ler o CSV
-        df = pd.read_csv(io.StringIO(csv_text))
+        df = pd.read_csv(io.StringIO(csv_text), dtype=object)
+        df = df.where(pd.notna(df), None)
         
-        imported_count = 0
         errors = []
-        
-        for index, row in df.iterrows():
+        rows = []
+        lines = []
+        
+        # Categorias verificadas com uma única consulta; valores não numéricos
+        # viram NaN e são reportados na linha correspondente
+        category_column = pd.to_numeric(df['category_id'], errors='coerce') if 'category_id' in df else pd.Series(index=df.index, dtype=float)
+        category_ids = {int(value) for value in category_column.dropna()}
+        existing_category_ids = set(db.scalars(
+            select(Category.id).where(Category.id.in_(category_ids))
+        )) if category_ids else set()
+        
+        for index, (row, category_value) in enumerate(zip(df.to_dict("records"), category_column), start=2):
             try:
-                # Verificar se a categoria existe
-                category = db.query(Category).filter(Category.id == row['category_id']).first()
-                if not category:
-                    errors.append(f"Linha {index + 2}: Categoria com ID {row['category_id']} não encontrada")
+                title = str(row.get('title') or '').strip()
+                if not title or not row.get('year') or not row.get('category_id') or not row.get('projectType'):
+                    errors.append(f"Linha {index}: title, year, category_id e projectType são obrigatórios")
                     continue
                 
-                # Verificar se o projeto já existe
-                existing_project = db.query(Project).filter(
-                    Project.title == row['title'],
-                    Project.year == row['year']
-                ).first()
-                if existing_project:
-                    errors.append(f"Linha {index + 2}: Projeto {row['title']} para o ano {row['year']} já existe")
+                if pd.isna(category_value):
+                    errors.append(f"Linha {index}: ID da categoria inválido ({row['category_id']})")
+                    continue
+                category_id = int(category_value)
+                if category_id not in existing_category_ids:
+                    errors.append(f"Linha {index}: Categoria com ID {category_id} não encontrada")
                     continue
                 
-                # Criar novo projeto
-                project = Project(
-                    title=row['title'],
-                    description=row.get('description'),
-                    year=row['year'],
-                    category_id=row['category_id'],
-                    projectType=row['projectType'],
-                    external_id=row.get('external_id'),
-                    file=row.get('file')
-                )
-                
-                db.add(project)
-                imported_count += 1
+                rows.append({
+                    "title": title,
+                    "description": row.get('description'),
+                    "year": int(float(row['year'])),
+                    "category_id": category_id,
+                    "projectType": int(float(row['projectType'])),
+                    "external_id": row.get('external_id'),
+                    "file": row.get('file')
+                })
+                lines.append(index)
                 
             except Exception as e:
-                errors.append(f"Linha {index + 2}: {str(e)}")
+                errors.append(f"Linha {index}: {str(e)}")
+        
+        # Projetos já existentes (mesmo título e ano) verificados com uma única consulta;
+        # repetições dentro do próprio arquivo também são descartadas
+        existing_keys = set(db.execute(
+            select(Project.title, Project.year).where(
+                Project.deleted_at == None,
+                Project.title.in_({item['title'] for item in rows})
+            )
+        ).tuples()) if rows else set()
+        new_rows = []
+        for line, item in zip(lines, rows):
+            key = (item['title'], item['year'])
+            if key in existing_keys:
+                errors.append(f"Linha {line}: Projeto {item['title']} para o ano {item['year']} já existe")
+                continue
+            existing_keys.add(key)
+            new_rows.append(item)
+        
+        if new_rows:
+            db.execute(insert(Project), new_rows)
+        imported_count = len(new_rows)
         
         db.commit()
         
@@ -4,8 +4,10 @@ from sqlalchemy.orm import Session, joinedload
 from app.database import get_db
 from app.models.question import Question
 from app.schemas.question import (
-    QuestionCreate, QuestionUpdate, QuestionListResponse, QuestionDetailResponse
+    QuestionCreate, QuestionUpdate, QuestionListResponse, QuestionDetailResponse, QuestionStatsResponse
 )
+from app.services.question_stats_service import get_question_stats, invalidate_question_stats
+from app.services.question_set_service import invalidate_question_set
 from typing import Optional
 from datetime import datetime
 import csv
@@ -13,7 +15,7 @@ import io
 import pandas as pd
 import os
 import tempfile
-from sqlalchemy import and_
+from sqlalchemy import and_, func
 
 router = APIRouter()
 
@@ -102,6 +104,25 @@ async def get_questions(
             detail=f"Error retrieving questions: {str(e)}"
         )
 
+@router.get("/stats", response_model=QuestionStatsResponse)
+async def get_questions_stats(
+    year: Optional[int] = Query(None, description="Filter by year (defaults to current year)"),
+    db: Session = Depends(get_db)
+):
+    try:
+        filter_year = year if year is not None else datetime.now().year
+        
+        return QuestionStatsResponse(
+            status=True,
+            message=f"Question statistics retrieved successfully for year {filter_year}",
+            data=get_question_stats(db, filter_year)
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error retrieving question statistics: {str(e)}"
+        )
+
 @router.get("/{question_id}", response_model=QuestionDetailResponse)
 async def get_question(
     question_id: int,
@@ -179,6 +200,8 @@ async def create_question(question_data: QuestionCreate, db: Session = Depends(g
         db.add(question)
         db.commit()
         db.refresh(question)
+        invalidate_question_stats()
+        invalidate_question_set()
         
         question_dict = {
             "id": question.id,
@@ -244,6 +267,8 @@ async def update_question(
         
         db.commit()
         db.refresh(question)
+        invalidate_question_stats()
+        invalidate_question_set()
         
         question_dict = {
             "id": question.id,
@@ -301,9 +326,11 @@ async def delete_question(question_id: int, db: Session = Depends(get_db)):
                 detail="Question not found"
             )
         
-        question.deleted_at = datetime.utcnow()
+        question.deleted_at = func.now()
         
         db.commit()
+        invalidate_question_stats()
+        invalidate_question_set()
         
         return {
             "status": True,
@@ -430,6 +457,8 @@ async def import_questions_csv(
                 errors.append(f"Linha {index + 2}: {str(e)}")
         
         db.commit()
+        invalidate_question_stats()
+        invalidate_question_set()
         
         return {
             "status": True,
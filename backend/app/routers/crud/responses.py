@@ -5,6 +5,7 @@ from app.database import get_db
 from app.models.response import Response
 from app.models.question import Question
 from app.models.assessment import Assessment
+from app.services.score_service import refresh_scores, project_ids_for_assessments
 from app.schemas.response import (
     ResponseCreate, ResponseUpdate, ResponseListResponse, ResponseDetailResponse
 )
@@ -15,7 +16,7 @@ import pandas as pd
 from datetime import datetime
 import os
 import tempfile
-from sqlalchemy import and_
+from sqlalchemy import and_, func
 
 router = APIRouter()
 
@@ -193,6 +194,7 @@ async def create_response(response_data: ResponseCreate, db: Session = Depends(g
         )
         
         db.add(response)
+        refresh_scores(db, [assessment.project_id])
         db.commit()
         db.refresh(response)
         
@@ -283,10 +285,13 @@ async def update_response(
                     detail="Já existe uma resposta para esta pergunta e avaliação"
                 )
         
+        previous_assessment_id = response.assessment_id
+        
         update_data = response_data.dict(exclude_unset=True)
         for field, value in update_data.items():
             setattr(response, field, value)
         
+        refresh_scores(db, project_ids_for_assessments(db, {previous_assessment_id, response.assessment_id}))
         db.commit()
         db.refresh(response)
         
@@ -345,8 +350,9 @@ async def delete_response(response_id: int, db: Session = Depends(get_db)):
             )
         
         from datetime import datetime
-        response.deleted_at = datetime.utcnow()
+        response.deleted_at = func.now()
         
+        refresh_scores(db, project_ids_for_assessments(db, [response.assessment_id]))
         db.commit()
         
         return {
@@ -454,6 +460,7 @@ async def import_responses_csv(
         
         imported_count = 0
         errors = []
+        imported_assessment_ids = set()
         
         for index, row in df.iterrows():
             try:
@@ -487,11 +494,13 @@ async def import_responses_csv(
                 )
                 
                 db.add(response)
+                imported_assessment_ids.add(assessment.id)
                 imported_count += 1
                 
             except Exception as e:
                 errors.append(f"Linha {index + 2}: {str(e)}")
         
+        refresh_scores(db, project_ids_for_assessments(db, imported_assessment_ids))
         db.commit()
         
         return {
@@ -1,9 +1,11 @@
 from fastapi import APIRouter, Depends, HTTPException, status, Query, UploadFile, File
 from fastapi.responses import FileResponse
 from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import and_, or_
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy import and_, or_, func
 from app.database import get_db
 from app.models.school import School
+from app.services.upsert_service import insert_ignoring_conflicts, split_conflicts
 from app.schemas.school import (
     SchoolCreate, SchoolUpdate, SchoolListResponse, SchoolDetailResponse
 )
@@ -206,6 +208,12 @@ async def create_school(school_data: SchoolCreate, db: Session = Depends(get_db)
             message="School created successfully",
             data=school_dict
         )
+    except IntegrityError:
+        db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="A school with this name already exists"
+        )
     except Exception as e:
         db.rollback()
         raise HTTPException(
@@ -274,6 +282,12 @@ async def update_school(
         )
     except HTTPException:
         raise
+    except IntegrityError:
+        db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="A school with this name already exists"
+        )
     except Exception as e:
         db.rollback()
         raise HTTPException(
@@ -293,7 +307,7 @@ async def delete_school(school_id: int, db: Session = Depends(get_db)):
             )
         
         from datetime import datetime
-        school.deleted_at = datetime.utcnow()
+        school.deleted_at = func.now()
         
         db.commit()
         
@@ -398,32 +412,32 @@ async def import_schools_csv(
         csv_text = content.decode('utf-8')
         
         # Usar pandas para ler o CSV
-        df = pd.read_csv(io.StringIO(csv_text))
+        df = pd.read_csv(io.StringIO(csv_text), dtype=object)
+        df = df.where(pd.notna(df), None)
         
-        imported_count = 0
         errors = []
-        
-        for index, row in df.iterrows():
-            try:
-                # Verificar se a escola já existe
-                existing_school = db.query(School).filter(School.name == row['name']).first()
-                if existing_school:
-                    errors.append(f"Linha {index + 2}: Escola {row['name']} já existe")
-                    continue
-                
-                # Criar nova escola
-                school = School(
-                    name=row['name'],
-                    type=row.get('type', 'estadual'),
-                    city=row.get('city'),
-                    state=row.get('state')
-                )
-                
-                db.add(school)
-                imported_count += 1
-                
-            except Exception as e:
-                errors.append(f"Linha {index + 2}: {str(e)}")
+        rows = []
+        lines = []
+        
+        for index, row in enumerate(df.to_dict("records"), start=2):
+            name = str(row.get('name') or '').strip()
+            if not name:
+                errors.append(f"Linha {index}: Nome da escola é obrigatório")
+                continue
+            
+            rows.append({
+                "name": name,
+                "type": row.get('type') or 'estadual',
+                "city": row.get('city'),
+                "state": row.get('state')
+            })
+            lines.append(index)
+        
+        # Inserção em lote; nomes já existentes são rejeitados pelo índice único
+        inserted = insert_ignoring_conflicts(db, School, rows, index_elements=["name"], returning=("id", "name"))
+        for position in split_conflicts(rows, inserted, ["name"]):
+            errors.append(f"Linha {lines[position]}: Escola {rows[position]['name']} já existe")
+        imported_count = len(inserted)
         
         db.commit()
         
@@ -0,0 +1,296 @@
+from fastapi import APIRouter, Depends, HTTPException, status, Query
+from sqlalchemy.orm import Session, joinedload
+from sqlalchemy import func
+from app.database import get_db
+from app.models.scoring_profile import ScoringProfile, ScoringProfileWeight
+from app.schemas.scoring_profile import (
+    ScoringProfileBase, ScoringProfileCreate, ScoringProfileUpdate,
+    ScoringProfileListResponse, ScoringProfileDetailResponse, ScoringComparisonResponse
+)
+from app.enums.aggregation_rule import AggregationRule
+from app.services.scoring_profile_service import compare_profiles
+from typing import List, Optional
+from datetime import datetime
+
+router = APIRouter()
+
+BASELINE_PROFILE = {
+    "id": None,
+    "name": "Pesos iguais",
+    "aggregation": AggregationRule.MEAN.value,
+    "weights": {}
+}
+
+def _profile_dict(profile: ScoringProfile) -> dict:
+    return {
+        "id": profile.id,
+        "name": profile.name,
+        "description": profile.description,
+        "year": profile.year,
+        "aggregation": profile.aggregation,
+        "weights": [
+            {"question_id": weight.question_id, "weight": weight.weight}
+            for weight in profile.weights
+        ],
+        "created_at": profile.created_at,
+        "updated_at": profile.updated_at,
+        "deleted_at": profile.deleted_at
+    }
+
+def _validate_aggregation(aggregation: str) -> None:
+    if aggregation not in AggregationRule.get_values():
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Invalid aggregation rule. Allowed: {', '.join(AggregationRule.get_values())}"
+        )
+
+@router.get("/", response_model=ScoringProfileListResponse)
+async def get_scoring_profiles(
+    year: Optional[int] = Query(None, description="Filter by year (defaults to current year)"),
+    db: Session = Depends(get_db)
+):
+    try:
+        filter_year = year if year is not None else datetime.now().year
+        profiles = db.query(ScoringProfile).filter(
+            ScoringProfile.deleted_at == None,
+            ScoringProfile.year == filter_year
+        ).options(joinedload(ScoringProfile.weights)).order_by(ScoringProfile.id).all()
+        
+        return ScoringProfileListResponse(
+            status=True,
+            message=f"Scoring profiles retrieved successfully for year {filter_year}",
+            data=[_profile_dict(profile) for profile in profiles]
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error retrieving scoring profiles: {str(e)}"
+        )
+
+@router.get("/compare", response_model=ScoringComparisonResponse)
+async def compare_scoring_profiles(
+    profile_ids: List[int] = Query([], description="Profiles to compare side by side"),
+    year: Optional[int] = Query(None, description="Year of the projects (defaults to current year)"),
+    include_baseline: bool = Query(True, description="Include the equal-weights ranking"),
+    db: Session = Depends(get_db)
+):
+    try:
+        filter_year = year if year is not None else datetime.now().year
+        
+        profiles = db.query(ScoringProfile).filter(
+            ScoringProfile.deleted_at == None,
+            ScoringProfile.id.in_(profile_ids)
+        ).options(joinedload(ScoringProfile.weights)).all() if profile_ids else []
+        
+        profiles_by_id = {profile.id: profile for profile in profiles}
+        missing = [profile_id for profile_id in profile_ids if profile_id not in profiles_by_id]
+        if missing:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Scoring profiles not found: {', '.join(map(str, missing))}"
+            )
+        
+        compared = [BASELINE_PROFILE] if include_baseline else []
+        compared += [
+            {
+                "id": profile.id,
+                "name": profile.name,
+                "aggregation": profile.aggregation,
+                "weights": {weight.question_id: weight.weight for weight in profile.weights}
+            }
+            for profile in (profiles_by_id[profile_id] for profile_id in profile_ids)
+        ]
+        
+        return ScoringComparisonResponse(
+            status=True,
+            message=f"Scoring profiles compared successfully for year {filter_year}",
+            data=compare_profiles(db, filter_year, compared)
+        )
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error comparing scoring profiles: {str(e)}"
+        )
+
+@router.post("/simulate", response_model=ScoringComparisonResponse)
+async def simulate_scoring_profiles(
+    profiles: List[ScoringProfileBase],
+    include_baseline: bool = Query(True, description="Include the equal-weights ranking"),
+    db: Session = Depends(get_db)
+):
+    """Compara perfis informados no corpo da requisição, sem salvá-los"""
+    try:
+        if not profiles:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="At least one profile is required"
+            )
+        for profile in profiles:
+            _validate_aggregation(profile.aggregation)
+        
+        compared = [BASELINE_PROFILE] if include_baseline else []
+        compared += [
+            {
+                "id": None,
+                "name": profile.name,
+                "aggregation": profile.aggregation,
+                "weights": {weight.question_id: weight.weight for weight in profile.weights}
+            }
+            for profile in profiles
+        ]
+        
+        year = profiles[0].year
+        return ScoringComparisonResponse(
+            status=True,
+            message=f"Scoring profiles simulated successfully for year {year}",
+            data=compare_profiles(db, year, compared)
+        )
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error simulating scoring profiles: {str(e)}"
+        )
+
+@router.get("/{profile_id}", response_model=ScoringProfileDetailResponse)
+async def get_scoring_profile(profile_id: int, db: Session = Depends(get_db)):
+    try:
+        profile = db.query(ScoringProfile).filter(
+            ScoringProfile.id == profile_id,
+            ScoringProfile.deleted_at == None
+        ).options(joinedload(ScoringProfile.weights)).first()
+        
+        if not profile:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Scoring profile not found"
+            )
+        
+        return ScoringProfileDetailResponse(
+            status=True,
+            message="Scoring profile retrieved successfully",
+            data=_profile_dict(profile)
+        )
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error retrieving scoring profile: {str(e)}"
+        )
+
+@router.post("/", response_model=ScoringProfileDetailResponse)
+async def create_scoring_profile(profile_data: ScoringProfileCreate, db: Session = Depends(get_db)):
+    try:
+        _validate_aggregation(profile_data.aggregation)
+        
+        profile = ScoringProfile(
+            name=profile_data.name,
+            description=profile_data.description,
+            year=profile_data.year,
+            aggregation=profile_data.aggregation,
+            weights=[
+                ScoringProfileWeight(question_id=weight.question_id, weight=weight.weight)
+                for weight in profile_data.weights
+            ]
+        )
+        
+        db.add(profile)
+        db.commit()
+        db.refresh(profile)
+        
+        return ScoringProfileDetailResponse(
+            status=True,
+            message="Scoring profile created successfully",
+            data=_profile_dict(profile)
+        )
+    except HTTPException:
+        raise
+    except Exception as e:
+        db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error creating scoring profile: {str(e)}"
+        )
+
+@router.put("/{profile_id}", response_model=ScoringProfileDetailResponse)
+async def update_scoring_profile(
+    profile_id: int,
+    profile_data: ScoringProfileUpdate,
+    db: Session = Depends(get_db)
+):
+    try:
+        profile = db.query(ScoringProfile).filter(
+            ScoringProfile.id == profile_id,
+            ScoringProfile.deleted_at == None
+        ).first()
+        
+        if not profile:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Scoring profile not found"
+            )
+        
+        update_data = profile_data.dict(exclude_unset=True)
+        if "aggregation" in update_data:
+            _validate_aggregation(update_data["aggregation"])
+        
+        weights = update_data.pop("weights", None)
+        for field, value in update_data.items():
+            setattr(profile, field, value)
+        
+        if weights is not None:
+            profile.weights = [
+                ScoringProfileWeight(question_id=weight["question_id"], weight=weight["weight"])
+                for weight in weights
+            ]
+        
+        db.commit()
+        db.refresh(profile)
+        
+        return ScoringProfileDetailResponse(
+            status=True,
+            message="Scoring profile updated successfully",
+            data=_profile_dict(profile)
+        )
+    except HTTPException:
+        raise
+    except Exception as e:
+        db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error updating scoring profile: {str(e)}"
+        )
+
+@router.delete("/{profile_id}")
+async def delete_scoring_profile(profile_id: int, db: Session = Depends(get_db)):
+    try:
+        profile = db.query(ScoringProfile).filter(
+            ScoringProfile.id == profile_id,
+            ScoringProfile.deleted_at == None
+        ).first()
+        
+        if not profile:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Scoring profile not found"
+            )
+        
+        profile.deleted_at = func.now()
+        db.commit()
+        
+        return {
+            "status": True,
+            "message": "Scoring profile deleted successfully"
+        }
+    except HTTPException:
+        raise
+    except Exception as e:
+        db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error deleting scoring profile: {str(e)}"
+        )
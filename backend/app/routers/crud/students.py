@@ -15,7 +15,7 @@ import io
 import pandas as pd
 import os
 import tempfile
-from sqlalchemy import and_
+from sqlalchemy import and_, func
 
 router = APIRouter()
 
@@ -370,7 +370,7 @@ async def delete_student(student_id: int, db: Session = Depends(get_db)):
                 detail="Estudante não encontrado"
             )
         
-        student.deleted_at = datetime.utcnow()
+        student.deleted_at = func.now()
         db.commit()
         
         return {
@@ -14,7 +14,7 @@ import io
 import pandas as pd
 import os
 import tempfile
-from sqlalchemy import and_
+from sqlalchemy import and_, func
 
 router = APIRouter()
 
@@ -313,7 +313,7 @@ async def delete_supervisor(supervisor_id: int, db: Session = Depends(get_db)):
                 detail="Orientador não encontrado"
             )
         
-        supervisor.deleted_at = datetime.utcnow()
+        supervisor.deleted_at = func.now()
         db.commit()
         
         return {
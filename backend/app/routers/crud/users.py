@@ -1,7 +1,7 @@
 from fastapi import APIRouter, Depends, HTTPException, status, Query, UploadFile, File
 from fastapi.responses import FileResponse
 from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import and_, or_
+from sqlalchemy import and_, or_, func
 from app.database import get_db
 from app.models.user import User
 from app.schemas.user import (
@@ -249,7 +249,7 @@ async def delete_user(user_id: int, db: Session = Depends(get_db)):
             )
         
         from datetime import datetime
-        user.deleted_at = datetime.utcnow()
+        user.deleted_at = func.now()
         user.active = False
         
         db.commit()
@@ -1,6 +1,7 @@
 from fastapi import APIRouter, Depends, HTTPException, status, Query
 from fastapi.responses import FileResponse
 from sqlalchemy.orm import Session
+from sqlalchemy import func
 from app.database import get_db
 from app.models.document import Document
 from app.schemas.documents import (
@@ -199,7 +200,7 @@ async def delete_document(document_id: int, db: Session = Depends(get_db)):
             )
         
         from datetime import datetime
-        document.deleted_at = datetime.utcnow()
+        document.deleted_at = func.now()
         
         db.commit()
         
@@ -1,4 +1,5 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from fastapi import Response as HTTPResponse
 from sqlalchemy.orm import Session, joinedload
 from app.database import get_db
 from app.models.user import User
@@ -7,12 +8,51 @@ from app.models.assessment import Assessment
 from app.models.project import Project
 from app.models.student import Student
 from app.models.category import Category
-from app.schemas.mobile_assessment import AssessmentResponse
+from app.schemas.mobile_assessment import AssessmentResponse, BundleResponse, NextProjectResponse
 from app.utils.auth import get_current_evaluator
+from app.utils.uploads import etag_matches, signed_upload_url
+from app.services.mobile_sync_service import get_evaluator_bundle, load_assessment_payloads
+from app.services.next_project_service import expire_claimed_assessments, next_project_queue
+from app.services.score_service import refresh_scores
 from datetime import datetime
 
 router = APIRouter()
 
+def _assessment_dict(assessment: Assessment) -> dict:
+    project = assessment.project
+    students = project.students
+    
+    return {
+        "id": assessment.id,
+        "evaluator_id": assessment.evaluator_id,
+        "project_id": assessment.project_id,
+        "has_response": assessment.has_response,
+        "note": assessment.note,
+        "project": {
+            "id": project.id,
+            "title": project.title,
+            "description": project.description,
+            "year": project.year,
+            "file": signed_upload_url(project.file),
+            "category_id": project.category_id,
+            "projectType": project.projectType,
+            "external_id": project.external_id,
+            "school_grade": project.school_grade,
+            "students": [
+                {
+                    "id": student.id,
+                    "name": student.name,
+                    "school_grade": student.school_grade
+                } for student in students
+            ],
+            "category": {
+                "id": project.category.id,
+                "name": project.category.name
+            } if project.category else None
+        },
+        "responses": []
+    }
+
 @router.get("/assessments", response_model=AssessmentResponse)
 async def get_assessments(
     evaluator: User = Depends(get_current_evaluator),
@@ -26,54 +66,11 @@ async def get_assessments(
                 data=[]
             )
         
-        current_year = datetime.now().year
+        expire_claimed_assessments(db)
+        db.commit()
         
-        assessments = db.query(Assessment).join(Project).options(
-            joinedload(Assessment.project).joinedload(Project.students),
-            joinedload(Assessment.project).joinedload(Project.category)
-        ).filter(
-            Assessment.evaluator_id == evaluator.id,
-            Project.year == current_year
-        ).limit(20).all()
-
-        assessment_data = []
-        for assessment in assessments:
-            project = assessment.project
-            students = project.students
-
-            print(project.file)
-            
-            assessment_dict = {
-                "id": assessment.id,
-                "evaluator_id": assessment.evaluator_id,
-                "project_id": assessment.project_id,
-                "has_response": assessment.has_response,
-                "note": assessment.note,
-                "project": {
-                    "id": project.id,
-                    "title": project.title,
-                    "description": project.description,
-                    "year": project.year,
-                    "file": project.file,
-                    "category_id": project.category_id,
-                    "projectType": project.projectType,
-                    "external_id": project.external_id,
-                    "school_grade": project.school_grade,
-                    "students": [
-                        {
-                            "id": student.id,
-                            "name": student.name,
-                            "school_grade": student.school_grade
-                        } for student in students
-                    ],
-                    "category": {
-                        "id": project.category.id,
-                        "name": project.category.name
-                    } if project.category else None
-                },
-                "responses": []
-            }
-            assessment_data.append(assessment_dict)
+        # Todas as avaliações do ano com estudantes, categoria e nota em um número fixo de consultas
+        assessment_data = load_assessment_payloads(db, evaluator.id, datetime.now().year)
         
         return AssessmentResponse(
             status=True,
@@ -86,4 +83,98 @@ async def get_assessments(
             status=False,
             message="Erro ao recuperar avaliações.",
             data=[]
-        ) 
\ No newline at end of file
+        )
+
+@router.get("/bundle", response_model=BundleResponse)
+async def get_bundle(
+    request: Request,
+    response: HTTPResponse,
+    evaluator: Evaluator = Depends(get_current_evaluator),
+    db: Session = Depends(get_db)
+):
+    """Tema, avaliações, estado das respostas e questões do avaliador em uma única chamada"""
+    try:
+        expire_claimed_assessments(db)
+        db.commit()
+        
+        bundle = get_evaluator_bundle(db, evaluator.id, datetime.now().year)
+        
+        etag = f'"{bundle["version"]}"'
+        response.headers["etag"] = etag
+        response.headers["cache-control"] = "private, no-cache"
+        if_none_match = request.headers.get("if-none-match")
+        if if_none_match and etag_matches(if_none_match, etag):
+            return HTTPResponse(status_code=304, headers={"etag": etag, "cache-control": "private, no-cache"})
+        
+        return BundleResponse(
+            status=True,
+            message="Dados do avaliador recuperados com sucesso.",
+            data=bundle
+        )
+        
+    except Exception as e:
+        return BundleResponse(
+            status=False,
+            message="Erro ao recuperar dados do avaliador.",
+            data=None
+        )
+
+@router.get("/next-project", response_model=NextProjectResponse)
+async def get_next_project(
+    evaluator: Evaluator = Depends(get_current_evaluator),
+    db: Session = Depends(get_db)
+):
+    """Reserva para o avaliador o projeto elegível com menos avaliações e cria a avaliação"""
+    project_id = None
+    try:
+        if not evaluator:
+            return NextProjectResponse(
+                status=False,
+                message="Usuário não autorizado ou não é um avaliador.",
+                data=None
+            )
+        
+        expire_claimed_assessments(db)
+        
+        assessed_project_ids = {
+            row[0] for row in db.query(Assessment.project_id).filter(
+                Assessment.evaluator_id == evaluator.id,
+                Assessment.deleted_at == None
+            )
+        }
+        category_ids = [category.id for category in evaluator.categories]
+        
+        project_id = next_project_queue.claim(evaluator.id, category_ids, assessed_project_ids)
+        if project_id is None:
+            return NextProjectResponse(
+                status=False,
+                message="Nenhum projeto disponível para avaliação no momento.",
+                data=None
+            )
+        
+        assessment = Assessment(evaluator_id=evaluator.id, project_id=project_id)
+        db.add(assessment)
+        refresh_scores(db, [project_id])
+        db.commit()
+        next_project_queue.attach_assessment(project_id, evaluator.id, assessment.id)
+        
+        assessment = db.query(Assessment).options(
+            joinedload(Assessment.project).joinedload(Project.students),
+            joinedload(Assessment.project).joinedload(Project.category)
+        ).filter(Assessment.id == assessment.id).first()
+        
+        return NextProjectResponse(
+            status=True,
+            message="Próximo projeto reservado com sucesso.",
+            data=_assessment_dict(assessment)
+        )
+        
+    except Exception as e:
+        db.rollback()
+        if project_id is not None:
+            next_project_queue.release(project_id, evaluator.id)
+        return NextProjectResponse(
+            status=False,
+            message="Erro ao buscar o próximo projeto.",
+            data=None
+        )
@@ -1,5 +1,6 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Request, Query, status
+from fastapi import Response as HTTPResponse
+from sqlalchemy.orm import Session, joinedload
 from app.database import get_db
 from app.models.user import User
 from app.models.evaluator import Evaluator
@@ -8,19 +9,71 @@ from app.models.question import Question
 from app.models.project import Project
 from app.models.response import Response
 from app.schemas.mobile_question import QuestionResponse
+from app.services.question_set_service import get_question_set
 from app.utils.auth import get_current_evaluator
+from app.utils.uploads import etag_matches
 from app.enums.project_type import ProjectType
+from datetime import datetime
+from typing import Optional
+import hashlib
 
 router = APIRouter()
 
+def _not_modified(request: Request, response: HTTPResponse, etag: str) -> Optional[HTTPResponse]:
+    response.headers["etag"] = etag
+    response.headers["cache-control"] = "no-cache"
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and etag_matches(if_none_match, etag):
+        return HTTPResponse(status_code=304, headers={"etag": etag, "cache-control": "no-cache"})
+    return None
+
+@router.get("/questions", response_model=QuestionResponse)
+async def get_question_set_by_type(
+    request: Request,
+    response: HTTPResponse,
+    project_type: int = Query(..., description="Tipo de projeto (1 = tecnológico, 2 = científico)"),
+    year: Optional[int] = Query(None, description="Ano das questões (padrão: ano atual)"),
+    evaluator: Evaluator = Depends(get_current_evaluator),
+    db: Session = Depends(get_db)
+):
+    """Conjunto de questões do ano para um tipo de projeto, com ETag para revalidação"""
+    if project_type not in ProjectType.get_values():
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Tipo de projeto inválido"
+        )
+    
+    try:
+        question_set = get_question_set(db, year or datetime.now().year, ProjectType(project_type))
+        
+        not_modified = _not_modified(request, response, f'"{question_set["version"]}"')
+        if not_modified is not None:
+            return not_modified
+        
+        return QuestionResponse(
+            status=True,
+            message="Questões recuperadas com sucesso",
+            data=question_set
+        )
+        
+    except Exception as e:
+        return QuestionResponse(
+            status=False,
+            message="Erro ao recuperar questões"
+        )
+
 @router.get("/questions/{assessment_id}", response_model=QuestionResponse)
 async def get_questions_by_assessment(
     assessment_id: int,
+    request: Request,
+    response: HTTPResponse,
     evaluator: Evaluator = Depends(get_current_evaluator),
     db: Session = Depends(get_db)
 ):
     try:
-        assessment = db.query(Assessment).filter(Assessment.id == assessment_id).first()
+        assessment = db.query(Assessment).options(
+            joinedload(Assessment.project)
+        ).filter(Assessment.id == assessment_id).first()
         
         if not assessment:
             return QuestionResponse(
@@ -37,31 +90,37 @@ async def get_questions_by_assessment(
         project = assessment.project
         project_type = ProjectType(project.projectType)
         
-        questions = db.query(Question).filter(Question.deleted_at == None).all()
+        question_set = get_question_set(db, project.year, project_type)
         
-        responses = db.query(Response).filter(Response.assessment_id == assessment_id).all()
+        responses = db.query(Response).filter(
+            Response.assessment_id == assessment_id,
+            Response.deleted_at == None
+        ).all()
+        
+        # ETag combina a versão das questões com o estado das respostas da avaliação
+        response_state = sorted(
+            (item.id, item.question_id, item.response, item.score, str(item.updated_at or item.created_at))
+            for item in responses
+        )
+        etag = '"' + hashlib.sha256(f"{question_set['version']}:{response_state}".encode()).hexdigest()[:32] + '"'
+        not_modified = _not_modified(request, response, etag)
+        if not_modified is not None:
+            return not_modified
         
-        responses_map = {response.question_id: response for response in responses}
+        responses_map = {item.question_id: item for item in responses}
         
         questions_data = []
-        for question in questions:
-            question_dict = {
-                "id": question.id,
-                "scientific_text": question.scientific_text,
-                "technological_text": question.technological_text,
-                "type": question.type,
-                "number_alternatives": question.number_alternatives,
-                "display_text": question.display_text
-            }
+        for question in question_set["questions"]:
+            question_dict = dict(question)
             
-            if question.id in responses_map:
-                response = responses_map[question.id]
+            if question["id"] in responses_map:
+                question_response = responses_map[question["id"]]
                 question_dict["response"] = {
-                    "id": response.id,
-                    "question_id": response.question_id,
-                    "response": response.response,
-                    "score": response.score,
-                    "created_at": response.created_at.isoformat() if response.created_at else None
+                    "id": question_response.id,
+                    "question_id": question_response.question_id,
+                    "response": question_response.response,
+                    "score": question_response.score,
+                    "created_at": question_response.created_at.isoformat() if question_response.created_at else None
                 }
             else:
                 question_dict["response"] = None
@@ -74,6 +133,7 @@ async def get_questions_by_assessment(
                 "label": project_type.get_label()
             },
             "questions": questions_data,
+            "questions_version": question_set["version"],
             "has_responses": len(responses) > 0
         }
         
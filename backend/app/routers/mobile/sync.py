@@ -0,0 +1,52 @@
+from fastapi import APIRouter, Depends
+from sqlalchemy.orm import Session
+from app.database import get_db
+from app.models.evaluator import Evaluator
+from app.schemas.mobile_sync import SyncRequest, SyncResponse
+from app.utils.auth import get_current_evaluator
+from app.enums.sync_status import SyncStatus
+from app.services.mobile_sync_service import apply_sync_batch, decode_cursor, get_sync_delta
+from datetime import datetime
+
+router = APIRouter()
+
+@router.post("/sync", response_model=SyncResponse)
+async def sync_responses(
+    request: SyncRequest,
+    evaluator: Evaluator = Depends(get_current_evaluator),
+    db: Session = Depends(get_db)
+):
+    """
+    Sincronização do aplicativo offline: grava em uma única transação as
+    respostas de várias avaliações (com chave de idempotência e horário do
+    cliente) e devolve as alterações do servidor desde o cursor informado.
+    """
+    try:
+        results = apply_sync_batch(db, evaluator.id, request.items)
+        db.commit()
+        
+        delta = get_sync_delta(
+            db,
+            evaluator.id,
+            request.year or datetime.now().year,
+            decode_cursor(request.cursor)
+        )
+        
+        applied = sum(1 for result in results if result["status"] == SyncStatus.APPLIED.value)
+        
+        return SyncResponse(
+            status=True,
+            message=f"Sincronização concluída. {applied} de {len(results)} envios aplicados.",
+            data={
+                "results": results,
+                "delta": delta
+            }
+        )
+        
+    except Exception as e:
+        db.rollback()
+        print(f"Erro ao sincronizar respostas: {str(e)}")
+        return SyncResponse(
+            status=False,
+            message=f"Erro ao sincronizar respostas: {str(e)}"
+        )
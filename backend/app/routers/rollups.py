@@ -0,0 +1,93 @@
+from fastapi import APIRouter, Depends, HTTPException, status, Query
+from sqlalchemy.orm import Session
+from app.database import get_db
+from app.schemas.rollup import TrendsResponse
+from app.services.rollup_service import refresh_rollups, refresh_stale_rollups, close_year, reopen_year, get_trends
+from typing import Optional
+
+router = APIRouter()
+
+@router.get("/trends", response_model=TrendsResponse)
+async def get_rollup_trends(
+    from_year: Optional[int] = Query(None, description="Primeiro ano da série"),
+    to_year: Optional[int] = Query(None, description="Último ano da série"),
+    db: Session = Depends(get_db)
+):
+    """Comparativo entre edições servido pelos consolidados anuais"""
+    try:
+        refresh_stale_rollups(db)
+        return TrendsResponse(
+            status=True,
+            message="Tendências recuperadas com sucesso",
+            data=get_trends(db, from_year, to_year)
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Erro ao recuperar tendências: {str(e)}"
+        )
+
+@router.post("/{year}/refresh")
+async def refresh_year_rollups(year: int, db: Session = Depends(get_db)):
+    """Recalcula os consolidados de um ano"""
+    try:
+        refresh_rollups(db, year)
+        db.commit()
+        
+        return {
+            "status": True,
+            "message": f"Consolidados de {year} recalculados com sucesso"
+        }
+    except Exception as e:
+        db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Erro ao recalcular consolidados: {str(e)}"
+        )
+
+@router.post("/{year}/close")
+async def close_year_rollups(year: int, db: Session = Depends(get_db)):
+    """Encerra o ano: os consolidados são reconstruídos e deixam de ser atualizados"""
+    try:
+        rollup = close_year(db, year)
+        db.commit()
+        
+        return {
+            "status": True,
+            "message": f"Ano {year} encerrado com sucesso",
+            "data": {
+                "year": rollup.year,
+                "closed_at": rollup.closed_at
+            }
+        }
+    except Exception as e:
+        db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Erro ao encerrar o ano: {str(e)}"
+        )
+
+@router.post("/{year}/reopen")
+async def reopen_year_rollups(year: int, db: Session = Depends(get_db)):
+    """Reabre o ano para atualização incremental dos consolidados"""
+    try:
+        rollup = reopen_year(db, year)
+        if rollup is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Consolidados de {year} não encontrados"
+            )
+        db.commit()
+        
+        return {
+            "status": True,
+            "message": f"Ano {year} reaberto com sucesso"
+        }
+    except HTTPException:
+        raise
+    except Exception as e:
+        db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Erro ao reabrir o ano: {str(e)}"
+        )
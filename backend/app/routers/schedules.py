@@ -0,0 +1,147 @@
+from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi.responses import FileResponse
+from sqlalchemy.orm import Session
+from app.database import get_db
+from app.models.evaluator import Evaluator
+from app.models.project import Project
+from app.models.user import User
+from app.schemas.schedule import TimetableRequest, TimetableResponse, ScheduleListResponse
+from app.services.timetable_service import generate_timetable, get_schedule_rows
+from typing import Optional
+from datetime import datetime
+import csv
+import tempfile
+
+router = APIRouter()
+
+def _schedule_entries(db: Session, year: int, evaluator_id: Optional[int] = None, project_id: Optional[int] = None):
+    rows = get_schedule_rows(db, year, evaluator_id, project_id)
+    
+    evaluator_ids = {row.evaluator_id for row in rows}
+    project_ids = {row.project_id for row in rows}
+    evaluator_names = dict(
+        db.query(Evaluator.id, User.name).join(User, User.id == Evaluator.user_id)
+        .filter(Evaluator.id.in_(evaluator_ids)).all()
+    ) if evaluator_ids else {}
+    projects = {
+        project.id: project
+        for project in db.query(Project.id, Project.title, Project.external_id).filter(Project.id.in_(project_ids)).all()
+    } if project_ids else {}
+    
+    return [
+        {
+            "assessment_id": row.assessment_id,
+            "evaluator_id": row.evaluator_id,
+            "evaluator_name": evaluator_names.get(row.evaluator_id),
+            "project_id": row.project_id,
+            "project_title": projects[row.project_id].title if row.project_id in projects else None,
+            "project_external_id": projects[row.project_id].external_id if row.project_id in projects else None,
+            "slot": row.slot,
+            "starts_at": row.starts_at,
+            "ends_at": row.ends_at
+        }
+        for row in rows
+    ]
+
+@router.post("/generate", response_model=TimetableResponse)
+async def generate_schedule(request: TimetableRequest, db: Session = Depends(get_db)):
+    """Gera os horários das avaliações pendentes do ano"""
+    try:
+        if request.ends_at <= request.starts_at:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="O fim da sessão deve ser posterior ao início"
+            )
+        
+        year = request.year if request.year is not None else datetime.now().year
+        
+        result = generate_timetable(
+            db,
+            year,
+            request.starts_at,
+            request.ends_at,
+            request.slot_minutes,
+            dry_run=request.dry_run
+        )
+        
+        if not request.dry_run:
+            db.commit()
+        
+        return TimetableResponse(
+            status=True,
+            message=f"{result['scheduled_count']} avaliações agendadas, {len(result['unscheduled'])} sem horário disponível",
+            data=result
+        )
+    except HTTPException:
+        raise
+    except Exception as e:
+        db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Erro ao gerar horários: {str(e)}"
+        )
+
+@router.get("/", response_model=ScheduleListResponse)
+async def get_schedules(
+    year: Optional[int] = Query(None, description="Filtrar por ano (padrão: ano atual)"),
+    evaluator_id: Optional[int] = Query(None, description="Filter by evaluator ID"),
+    project_id: Optional[int] = Query(None, description="Filter by project ID"),
+    db: Session = Depends(get_db)
+):
+    try:
+        filter_year = year if year is not None else datetime.now().year
+        
+        return ScheduleListResponse(
+            status=True,
+            message="Horários recuperados com sucesso",
+            data=_schedule_entries(db, filter_year, evaluator_id, project_id)
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Erro ao recuperar horários: {str(e)}"
+        )
+
+@router.get("/export/csv")
+async def export_schedules_csv(
+    year: Optional[int] = Query(None, description="Filtrar por ano (padrão: ano atual)"),
+    evaluator_id: Optional[int] = Query(None, description="Filter by evaluator ID"),
+    db: Session = Depends(get_db)
+):
+    """Exporta a agenda de cada avaliador para CSV"""
+    try:
+        filter_year = year if year is not None else datetime.now().year
+        entries = _schedule_entries(db, filter_year, evaluator_id)
+        
+        # Criar arquivo temporário
+        temp_file = tempfile.NamedTemporaryFile(mode='w', delete=False, suffix='.csv', encoding='utf-8')
+        
+        writer = csv.writer(temp_file)
+        
+        # Cabeçalhos
+        writer.writerow(["evaluator_id", "avaliador", "inicio", "fim", "project_id", "codigo", "projeto"])
+        
+        # Dados, agrupados por avaliador e em ordem de horário
+        for entry in entries:
+            writer.writerow([
+                entry["evaluator_id"],
+                entry["evaluator_name"] or "",
+                entry["starts_at"].strftime("%d/%m/%Y %H:%M"),
+                entry["ends_at"].strftime("%H:%M"),
+                entry["project_id"],
+                entry["project_external_id"] or "",
+                entry["project_title"] or ""
+            ])
+        
+        temp_file.close()
+        
+        return FileResponse(
+            path=temp_file.name,
+            filename=f"agenda_avaliadores_{filter_year}.csv",
+            media_type="text/csv"
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Erro ao exportar horários: {str(e)}"
+        )
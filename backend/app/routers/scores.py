@@ -0,0 +1,147 @@
+from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi.responses import FileResponse
+from sqlalchemy.orm import Session
+from app.database import get_db, settings
+from app.schemas.scores import ScoreMatrixResponse, LeaderboardResponse, ScoreNormalizationResponse, ReviewQueueResponse
+from app.services.score_service import get_score_matrix
+from app.services.leaderboard_service import leaderboard, DIMENSIONS
+from app.services.normalization_service import normalize_scores
+from app.services.disagreement_service import get_review_queue
+from app.services.results_export_service import write_results_workbook
+from typing import Optional
+from datetime import datetime
+import tempfile
+
+router = APIRouter()
+
+@router.get("/matrix", response_model=ScoreMatrixResponse)
+async def get_scores_matrix(
+    year: Optional[int] = Query(None, description="Filtrar por ano (padrão: ano atual)"),
+    by_evaluator: bool = Query(False, description="Separar as médias por avaliador"),
+    category_id: Optional[int] = Query(None, description="Filter by category ID"),
+    db: Session = Depends(get_db)
+):
+    try:
+        filter_year = year if year is not None else datetime.now().year
+        
+        matrix = get_score_matrix(db, filter_year, by_evaluator=by_evaluator, category_id=category_id)
+        
+        return ScoreMatrixResponse(
+            status=True,
+            message="Matriz de notas recuperada com sucesso",
+            data=matrix
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Erro ao recuperar matriz de notas: {str(e)}"
+        )
+
+@router.get("/leaderboard", response_model=LeaderboardResponse)
+async def get_leaderboard(
+    dimension: str = Query("general", description="general, category, area, school_grade ou project_type"),
+    key: int = Query(0, description="ID da categoria/área, nível de ensino ou tipo de projeto"),
+    limit: int = Query(10, ge=1, le=1000),
+):
+    if dimension not in DIMENSIONS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Dimensão inválida. Use: {', '.join(DIMENSIONS)}"
+        )
+    
+    return LeaderboardResponse(
+        status=True,
+        message="Classificação recuperada com sucesso",
+        data={
+            "year": leaderboard.year,
+            "updated_at": leaderboard.updated_at,
+            "dimension": dimension,
+            "key": key,
+            "entries": leaderboard.top(dimension, key, limit),
+            "boards": leaderboard.boards()
+        }
+    )
+
+@router.post("/normalize", response_model=ScoreNormalizationResponse)
+async def normalize_project_scores(
+    year: Optional[int] = Query(None, description="Filtrar por ano (padrão: ano atual)"),
+    db: Session = Depends(get_db)
+):
+    """Recalcula as notas normalizadas pelo viés de cada avaliador"""
+    try:
+        filter_year = year if year is not None else datetime.now().year
+        
+        summary = normalize_scores(db, filter_year)
+        db.commit()
+        
+        return ScoreNormalizationResponse(
+            status=True,
+            message="Notas normalizadas recalculadas com sucesso",
+            data=summary
+        )
+    except Exception as e:
+        db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Erro ao normalizar notas: {str(e)}"
+        )
+
+@router.get("/review-queue", response_model=ReviewQueueResponse)
+async def get_scores_review_queue(
+    year: Optional[int] = Query(None, description="Filtrar por ano (padrão: ano atual)"),
+    note_spread: Optional[float] = Query(None, ge=0, description="Diferença mínima entre a maior e a menor nota"),
+    question_variance: Optional[float] = Query(None, ge=0, description="Variância mínima das notas de uma questão"),
+    category_id: Optional[int] = Query(None, description="Filter by category ID"),
+    skip: int = Query(0, ge=0),
+    limit: int = Query(20, ge=1, le=200),
+    db: Session = Depends(get_db)
+):
+    """Projetos com avaliações divergentes que precisam de revisão"""
+    try:
+        filter_year = year if year is not None else datetime.now().year
+        
+        queue = get_review_queue(
+            db,
+            filter_year,
+            note_spread if note_spread is not None else settings.review_note_spread,
+            question_variance if question_variance is not None else settings.review_question_variance,
+            skip=skip,
+            limit=limit,
+            category_id=category_id
+        )
+        
+        return ReviewQueueResponse(
+            status=True,
+            message="Fila de revisão recuperada com sucesso",
+            data=queue
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Erro ao recuperar fila de revisão: {str(e)}"
+        )
+
+@router.get("/export/xlsx")
+async def export_results_xlsx(
+    year: Optional[int] = Query(None, description="Filtrar por ano (padrão: ano atual)"),
+    db: Session = Depends(get_db)
+):
+    """Exporta a planilha de resultados: uma aba por categoria, notas por avaliador e questão"""
+    try:
+        filter_year = year if year is not None else datetime.now().year
+        
+        temp_file = tempfile.NamedTemporaryFile(delete=False, suffix='.xlsx')
+        temp_file.close()
+        
+        write_results_workbook(db, filter_year, temp_file.name)
+        
+        return FileResponse(
+            path=temp_file.name,
+            filename=f"resultados_{filter_year}.xlsx",
+            media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Erro ao exportar resultados: {str(e)}"
+        )
@@ -1,4 +1,4 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from typing import Optional, List
 from datetime import datetime
 
@@ -36,4 +36,62 @@ class AssessmentListResponse(BaseModel):
 class AssessmentDetailResponse(BaseModel):
     status: bool
     message: str
-    data: AssessmentWithRelations 
\ No newline at end of file
+    data: AssessmentWithRelations
+
+class AutoAssignRequest(BaseModel):
+    year: Optional[int] = None
+    evaluators_per_project: int = Field(3, ge=1, le=20)
+    max_per_evaluator: Optional[int] = Field(None, ge=1)
+    category_id: Optional[int] = None
+    dry_run: bool = False
+
+class AutoAssignItem(BaseModel):
+    evaluator_id: int
+    project_id: int
+
+class AutoAssignUnfilled(BaseModel):
+    project_id: int
+    assigned: int
+    missing: int
+
+class AutoAssignResult(BaseModel):
+    year: int
+    dry_run: bool
+    evaluators_per_project: int
+    projects_count: int
+    evaluators_count: int
+    created_count: int
+    min_load: int
+    max_load: int
+    assignments: List[AutoAssignItem] = []
+    unfilled: List[AutoAssignUnfilled] = []
+
+class AutoAssignResponse(BaseModel):
+    status: bool
+    message: str
+    data: AutoAssignResult
+
+class BulkAssignmentRequest(BaseModel):
+    year: Optional[int] = None
+    pairs: List[AutoAssignItem]
+    replace: bool = False
+    dry_run: bool = False
+
+class BulkAssignmentResult(BaseModel):
+    year: int
+    dry_run: bool
+    replace: bool
+    requested_count: int
+    created_count: int
+    unchanged_count: int
+    removed_count: int
+    created: List[AutoAssignItem] = []
+    removed: List[AutoAssignItem] = []
+    unchanged: List[AutoAssignItem] = []
+    kept_answered: List[int] = []
+    errors: List[str] = []
+
+class BulkAssignmentResponse(BaseModel):
+    status: bool
+    message: str
+    data: BulkAssignmentResult
@@ -41,4 +41,32 @@ class AwardListResponse(BaseModel):
 class AwardDetailResponse(BaseModel):
     status: bool
     message: str
-    data: AwardWithRelations 
\ No newline at end of file
+    data: AwardWithRelations
+
+class AwardRankingPosition(BaseModel):
+    position: int
+    project_id: int
+    title: str
+    external_id: Optional[str] = None
+    score: float
+    assessments_count: int
+
+class AwardRankingGroup(BaseModel):
+    school_grade: Optional[int] = None
+    school_grade_label: Optional[str] = None
+    category_id: Optional[int] = None
+    category_name: Optional[str] = None
+    positions: List[AwardRankingPosition] = []
+
+class AwardRanking(BaseModel):
+    award_id: int
+    award_name: str
+    year: int
+    total_positions: Optional[int] = None
+    question_ids: List[int] = []
+    groups: List[AwardRankingGroup] = []
+
+class AwardRankingResponse(BaseModel):
+    status: bool
+    message: str
+    data: AwardRanking
@@ -1,5 +1,6 @@
 from pydantic import BaseModel
-from typing import Dict
+from typing import Dict, List, Optional
+from datetime import datetime
 
 class StatusAvaliacoes(BaseModel):
     faltam_1_avaliacao: int
@@ -13,4 +14,35 @@ class CardsResponse(BaseModel):
     avaliadores_ativos: int
     progresso_geral: int
     progresso_geral_inicial: int
-    status_avaliacoes: StatusAvaliacoes 
\ No newline at end of file
+    status_avaliacoes: StatusAvaliacoes
+
+class ProgressoGrupo(BaseModel):
+    id: Optional[int] = None
+    nome: Optional[str] = None
+    main_category_id: Optional[int] = None
+    total_projetos: int
+    trabalhos_avaliados: int
+    trabalhos_concluidos: int
+    progresso: int
+    status_avaliacoes: StatusAvaliacoes
+
+class ProgressResponse(BaseModel):
+    year: int
+    categorias: List[ProgressoGrupo] = []
+    areas: List[ProgressoGrupo] = []
+    niveis_ensino: List[ProgressoGrupo] = []
+    tipos_projeto: List[ProgressoGrupo] = []
+
+class ProgressoHistoricoPonto(BaseModel):
+    taken_at: datetime
+    total_projetos: int
+    trabalhos_avaliados: int
+    avaliadores_ativos: int
+    progresso_geral: int
+    progresso_geral_inicial: int
+    status_avaliacoes: StatusAvaliacoes
+
+class ProgressHistoryResponse(BaseModel):
+    year: int
+    interval_seconds: int
+    points: List[ProgressoHistoricoPonto] = []
@@ -32,4 +32,22 @@ class AssessmentInfo(BaseModel):
 class AssessmentResponse(BaseModel):
     status: bool
     message: str
-    data: List[AssessmentInfo] = [] 
\ No newline at end of file
+    data: List[AssessmentInfo] = []
+
+class NextProjectResponse(BaseModel):
+    status: bool
+    message: str
+    data: Optional[AssessmentInfo] = None
+
+class EvaluatorBundle(BaseModel):
+    year: int
+    version: str
+    cursor: str
+    theme: dict
+    assessments: List[AssessmentInfo] = []
+    question_sets: List[dict] = []
+
+class BundleResponse(BaseModel):
+    status: bool
+    message: str
+    data: Optional[EvaluatorBundle] = None
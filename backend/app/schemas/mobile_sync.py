@@ -0,0 +1,40 @@
+from pydantic import BaseModel, Field
+from typing import Optional, List
+from datetime import datetime
+from app.schemas.mobile_response import ResponseItem
+
+class SyncItem(BaseModel):
+    idempotency_key: str = Field(..., min_length=1, max_length=64)
+    assessment: int
+    client_timestamp: datetime
+    responses: List[ResponseItem] = []
+
+class SyncRequest(BaseModel):
+    cursor: Optional[str] = None
+    year: Optional[int] = None
+    items: List[SyncItem] = Field([], max_length=500)
+
+class SyncItemResult(BaseModel):
+    idempotency_key: str
+    assessment_id: int
+    status: str
+    message: str
+    data: Optional[dict] = None
+
+class SyncDelta(BaseModel):
+    cursor: str
+    year: int
+    assessments: List[dict] = []
+    assessment_ids: List[int] = []
+    removed_assessment_ids: List[int] = []
+    questions_versions: dict = {}
+    question_sets: List[dict] = []
+
+class SyncResult(BaseModel):
+    results: List[SyncItemResult] = []
+    delta: SyncDelta
+
+class SyncResponse(BaseModel):
+    status: bool
+    message: str
+    data: Optional[SyncResult] = None
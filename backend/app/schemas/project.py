@@ -21,6 +21,8 @@ class ProjectResponse(ProjectBase):
         from_attributes = True
 
 class ProjectWithRelations(ProjectResponse):
+    final_note: float = 0.0
+    normalized_note: Optional[float] = None
     category: Optional[dict] = None
     students: List[dict] = []
     assessments: List[dict] = []
@@ -41,4 +41,29 @@ class QuestionListResponse(BaseModel):
 class QuestionDetailResponse(BaseModel):
     status: bool
     message: str
-    data: QuestionWithRelations 
\ No newline at end of file
+    data: QuestionWithRelations
+
+class QuestionHistogramBucket(BaseModel):
+    score: int
+    count: int
+
+class QuestionStat(BaseModel):
+    question_id: int
+    type: int
+    number_alternatives: Optional[int] = None
+    responses_count: int
+    scored_count: int
+    mean: Optional[float] = None
+    stddev: Optional[float] = None
+    min: Optional[int] = None
+    max: Optional[int] = None
+    histogram: List[QuestionHistogramBucket] = []
+
+class QuestionStats(BaseModel):
+    year: int
+    questions: List[QuestionStat] = []
+
+class QuestionStatsResponse(BaseModel):
+    status: bool
+    message: str
+    data: QuestionStats
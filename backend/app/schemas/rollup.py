@@ -0,0 +1,49 @@
+from pydantic import BaseModel
+from typing import Optional, List
+from datetime import datetime
+
+class YearTrend(BaseModel):
+    year: int
+    projects_count: int
+    evaluated_projects_count: int
+    assessments_count: int
+    completed_assessments_count: int
+    evaluators_count: int
+    students_count: int
+    schools_count: int
+    average_note: Optional[float] = None
+    closed: bool
+    updated_at: Optional[datetime] = None
+
+class CategoryTrendPoint(BaseModel):
+    year: int
+    projects_count: int
+    evaluated_projects_count: int
+    assessments_count: int
+    average_note: Optional[float] = None
+
+class CategoryTrend(BaseModel):
+    category_id: int
+    name: str
+    series: List[CategoryTrendPoint] = []
+
+class SchoolTrendPoint(BaseModel):
+    year: int
+    students_count: int
+    projects_count: int
+    average_note: Optional[float] = None
+
+class SchoolTrend(BaseModel):
+    school_id: int
+    name: str
+    series: List[SchoolTrendPoint] = []
+
+class Trends(BaseModel):
+    years: List[YearTrend] = []
+    categories: List[CategoryTrend] = []
+    schools: List[SchoolTrend] = []
+
+class TrendsResponse(BaseModel):
+    status: bool
+    message: str
+    data: Trends
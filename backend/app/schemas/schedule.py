@@ -0,0 +1,47 @@
+from pydantic import BaseModel, Field
+from typing import Optional, List
+from datetime import datetime
+
+class TimetableRequest(BaseModel):
+    year: Optional[int] = None
+    starts_at: datetime
+    ends_at: datetime
+    slot_minutes: int = Field(15, ge=1, le=240)
+    dry_run: bool = False
+
+class UnscheduledAssessment(BaseModel):
+    assessment_id: int
+    evaluator_id: int
+    project_id: int
+
+class TimetableResult(BaseModel):
+    year: int
+    dry_run: bool
+    slots_count: int
+    slot_minutes: int
+    assessments_count: int
+    scheduled_count: int
+    last_slot: Optional[int] = None
+    idle_slots: int
+    unscheduled: List[UnscheduledAssessment] = []
+
+class TimetableResponse(BaseModel):
+    status: bool
+    message: str
+    data: TimetableResult
+
+class ScheduleEntry(BaseModel):
+    assessment_id: int
+    evaluator_id: int
+    evaluator_name: Optional[str] = None
+    project_id: int
+    project_title: Optional[str] = None
+    project_external_id: Optional[str] = None
+    slot: int
+    starts_at: datetime
+    ends_at: datetime
+
+class ScheduleListResponse(BaseModel):
+    status: bool
+    message: str
+    data: List[ScheduleEntry] = []
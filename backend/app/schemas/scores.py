@@ -0,0 +1,101 @@
+from pydantic import BaseModel
+from typing import Optional, List
+from datetime import datetime
+
+class ScoreMatrix(BaseModel):
+    year: int
+    by_evaluator: bool
+    projects: List[int]
+    evaluators: Optional[List[int]] = None
+    questions: List[int]
+    averages: List[List[Optional[float]]]
+    counts: List[List[int]]
+
+class ScoreMatrixResponse(BaseModel):
+    status: bool
+    message: str
+    data: ScoreMatrix
+
+class LeaderboardEntry(BaseModel):
+    position: int
+    project_id: int
+    title: str
+    external_id: Optional[str] = None
+    category_id: int
+    area_id: int
+    project_type: int
+    school_grade: Optional[int] = None
+    final_note: float
+    assessments_count: int
+
+class LeaderboardBoard(BaseModel):
+    dimension: str
+    key: int
+    total: int
+
+class Leaderboard(BaseModel):
+    year: Optional[int] = None
+    updated_at: Optional[datetime] = None
+    dimension: str
+    key: int
+    entries: List[LeaderboardEntry] = []
+    boards: List[LeaderboardBoard] = []
+
+class LeaderboardResponse(BaseModel):
+    status: bool
+    message: str
+    data: Leaderboard
+
+class EvaluatorStat(BaseModel):
+    evaluator_id: int
+    year: int
+    responses_count: int
+    mean: float
+    stddev: float
+
+class ScoreNormalization(BaseModel):
+    year: int
+    responses_count: int
+    evaluators_count: int
+    projects_count: int
+    mean: float
+    stddev: float
+    elapsed_ms: float
+    evaluators: List[EvaluatorStat]
+
+class ScoreNormalizationResponse(BaseModel):
+    status: bool
+    message: str
+    data: ScoreNormalization
+
+class DivergentQuestion(BaseModel):
+    question_id: int
+    variance: float
+    spread: int
+
+class ReviewQueueItem(BaseModel):
+    project_id: int
+    title: str
+    external_id: Optional[str] = None
+    category_id: int
+    assessments_count: int
+    min_note: float
+    max_note: float
+    note_spread: float
+    max_question_variance: float
+    divergent_questions: int
+    questions: List[DivergentQuestion] = []
+
+class ReviewQueue(BaseModel):
+    year: int
+    note_spread: float
+    question_variance: float
+    total: int
+    skip: int
+    limit: int
+    items: List[ReviewQueueItem] = []
+
+class ReviewQueueResponse(BaseModel):
+    status: bool
+    message: str
+    data: ReviewQueue
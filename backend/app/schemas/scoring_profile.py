@@ -0,0 +1,62 @@
+from pydantic import BaseModel, Field
+from typing import Optional, List
+from datetime import datetime
+
+class ScoringProfileWeightItem(BaseModel):
+    question_id: int
+    weight: float = Field(1.0, ge=0)
+
+class ScoringProfileBase(BaseModel):
+    name: str
+    description: Optional[str] = None
+    year: int
+    aggregation: str = "mean"
+    weights: List[ScoringProfileWeightItem] = []
+
+class ScoringProfileCreate(ScoringProfileBase):
+    pass
+
+class ScoringProfileUpdate(BaseModel):
+    name: Optional[str] = None
+    description: Optional[str] = None
+    year: Optional[int] = None
+    aggregation: Optional[str] = None
+    weights: Optional[List[ScoringProfileWeightItem]] = None
+
+class ScoringProfileResponse(ScoringProfileBase):
+    id: int
+    created_at: datetime
+    updated_at: Optional[datetime]
+    deleted_at: Optional[datetime]
+
+    class Config:
+        from_attributes = True
+
+class ScoringProfileListResponse(BaseModel):
+    status: bool
+    message: str
+    data: List[ScoringProfileResponse] = []
+
+class ScoringProfileDetailResponse(BaseModel):
+    status: bool
+    message: str
+    data: ScoringProfileResponse
+
+class ProfileRanking(BaseModel):
+    id: Optional[int] = None
+    name: str
+    aggregation: str
+    scores: List[Optional[float]]
+    positions: List[Optional[int]]
+
+class ScoringComparison(BaseModel):
+    year: int
+    projects: List[int]
+    titles: List[str]
+    assessments_count: List[int]
+    profiles: List[ProfileRanking]
+
+class ScoringComparisonResponse(BaseModel):
+    status: bool
+    message: str
+    data: ScoringComparison
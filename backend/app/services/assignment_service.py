@@ -0,0 +1,200 @@
+import heapq
+from collections import defaultdict
+from typing import Dict, List, Optional, Set, Tuple
+from sqlalchemy import func, insert, select
+from sqlalchemy.orm import Session
+from app.models.assessment import Assessment
+from app.models.category import Category
+from app.models.evaluator import Evaluator
+from app.models.project import Project
+from app.models.relationships import evaluator_categories, student_projects, supervisor_projects
+from app.models.student import Student
+from app.models.supervisor import Supervisor
+from app.models.user import User
+from app.services.score_service import refresh_scores
+
+def _load_candidates(db: Session, year: int, category_id: Optional[int]):
+    categories = {
+        row.id: row.main_category_id
+        for row in db.execute(select(Category.id, Category.main_category_id))
+    }
+
+    project_statement = select(Project.id, Project.category_id).where(
+        Project.deleted_at == None,
+        Project.year == year
+    )
+    if category_id is not None:
+        project_statement = project_statement.where(Project.category_id == category_id)
+    projects = dict(db.execute(project_statement).all())
+
+    evaluators = dict(db.execute(
+        select(Evaluator.id, func.lower(User.email))
+        .join(User, User.id == Evaluator.user_id)
+        .where(Evaluator.deleted_at == None, Evaluator.year == year, User.deleted_at == None)
+    ).all())
+
+    evaluator_category_ids: Dict[int, Set[int]] = defaultdict(set)
+    for evaluator_id, evaluator_category_id in db.execute(
+        select(evaluator_categories.c.evaluator_id, evaluator_categories.c.category_id)
+        .where(evaluator_categories.c.evaluator_id.in_(select(Evaluator.id).where(Evaluator.deleted_at == None, Evaluator.year == year)))
+    ):
+        evaluator_category_ids[evaluator_id].add(evaluator_category_id)
+
+    # Escolas dos projetos (estudantes e orientadores) e dos avaliadores que também orientam
+    project_schools: Dict[int, Set[int]] = defaultdict(set)
+    year_projects = select(Project.id).where(Project.deleted_at == None, Project.year == year)
+    for project_id, school_id in db.execute(
+        select(student_projects.c.project_id, Student.school_id)
+        .join(Student, Student.id == student_projects.c.student_id)
+        .where(Student.deleted_at == None, student_projects.c.project_id.in_(year_projects))
+    ):
+        project_schools[project_id].add(school_id)
+    for project_id, school_id in db.execute(
+        select(supervisor_projects.c.project_id, Supervisor.school_id)
+        .join(Supervisor, Supervisor.id == supervisor_projects.c.supervisor_id)
+        .where(Supervisor.deleted_at == None, supervisor_projects.c.project_id.in_(year_projects))
+    ):
+        project_schools[project_id].add(school_id)
+
+    schools_by_email: Dict[str, Set[int]] = defaultdict(set)
+    for email, school_id in db.execute(
+        select(func.lower(Supervisor.email), Supervisor.school_id)
+        .where(Supervisor.deleted_at == None, Supervisor.email != None, Supervisor.year == year)
+    ):
+        schools_by_email[email].add(school_id)
+    evaluator_schools = {
+        evaluator_id: schools_by_email.get(email, set())
+        for evaluator_id, email in evaluators.items()
+    }
+
+    existing = db.execute(
+        select(Assessment.evaluator_id, Assessment.project_id)
+        .join(Project, Project.id == Assessment.project_id)
+        .where(Assessment.deleted_at == None, Project.deleted_at == None, Project.year == year)
+    ).all()
+
+    return categories, projects, evaluators, evaluator_category_ids, project_schools, evaluator_schools, existing
+
+def assign_evaluators(
+    db: Session,
+    year: int,
+    evaluators_per_project: int = 3,
+    max_per_evaluator: Optional[int] = None,
+    category_id: Optional[int] = None,
+    dry_run: bool = False
+) -> dict:
+    """
+    Distribui avaliadores aos projetos do ano até que cada um tenha K avaliações.
+    Um avaliador é elegível quando uma de suas categorias é a categoria do projeto
+    ou a área (categoria principal) dela, e não há conflito de escola: o avaliador
+    que também orienta (mesmo e-mail de um orientador) não avalia projetos com
+    estudantes ou orientadores da sua escola.
+
+    Guloso com heaps: os projetos com menos avaliadores elegíveis são atendidos
+    primeiro, rodada a rodada, e cada vaga vai para o avaliador elegível com menor
+    carga (avaliações existentes incluídas), mantido em um heap por categoria com
+    atualização preguiçosa. As novas avaliações são gravadas em um único INSERT.
+    """
+    (
+        categories, projects, evaluators, evaluator_category_ids,
+        project_schools, evaluator_schools, existing
+    ) = _load_candidates(db, year, category_id)
+
+    load: Dict[int, int] = {evaluator_id: 0 for evaluator_id in evaluators}
+    assigned: Dict[int, Set[int]] = defaultdict(set)
+    for evaluator_id, project_id in existing:
+        if evaluator_id in load:
+            load[evaluator_id] += 1
+        assigned[project_id].add(evaluator_id)
+
+    # Avaliadores elegíveis por categoria de projeto
+    eligible_by_category: Dict[int, List[int]] = {}
+    for project_category_id in set(projects.values()):
+        area_id = categories.get(project_category_id) or project_category_id
+        eligible_by_category[project_category_id] = [
+            evaluator_id for evaluator_id, evaluator_category_set in evaluator_category_ids.items()
+            if evaluator_id in load and (project_category_id in evaluator_category_set or area_id in evaluator_category_set)
+        ]
+
+    heaps: Dict[int, List[Tuple[int, int]]] = {}
+    for project_category_id, evaluator_ids in eligible_by_category.items():
+        heap = [(load[evaluator_id], evaluator_id) for evaluator_id in evaluator_ids]
+        heapq.heapify(heap)
+        heaps[project_category_id] = heap
+
+    pending = sorted(
+        (project_id for project_id in projects if len(assigned[project_id]) < evaluators_per_project),
+        key=lambda project_id: (len(eligible_by_category[projects[project_id]]), project_id)
+    )
+
+    new_assessments: List[Tuple[int, int]] = []
+    unfilled: Set[int] = set()
+    for _ in range(evaluators_per_project):
+        still_pending = []
+        for project_id in pending:
+            heap = heaps[projects[project_id]]
+            skipped = []
+            chosen = None
+            while heap:
+                evaluator_load, evaluator_id = heapq.heappop(heap)
+                if evaluator_load != load[evaluator_id]:
+                    heapq.heappush(heap, (load[evaluator_id], evaluator_id))
+                    continue
+                if max_per_evaluator is not None and evaluator_load >= max_per_evaluator:
+                    # Heap ordenado por carga: os demais também estão no limite
+                    skipped.append((evaluator_load, evaluator_id))
+                    break
+                if evaluator_id in assigned[project_id] or evaluator_schools[evaluator_id] & project_schools[project_id]:
+                    skipped.append((evaluator_load, evaluator_id))
+                    continue
+                chosen = evaluator_id
+                break
+
+            for entry in skipped:
+                heapq.heappush(heap, entry)
+
+            if chosen is None:
+                unfilled.add(project_id)
+                continue
+
+            load[chosen] += 1
+            heapq.heappush(heap, (load[chosen], chosen))
+            assigned[project_id].add(chosen)
+            new_assessments.append((chosen, project_id))
+            if len(assigned[project_id]) < evaluators_per_project:
+                still_pending.append(project_id)
+        pending = still_pending
+
+    if new_assessments and not dry_run:
+        db.execute(
+            insert(Assessment),
+            [
+                {"evaluator_id": evaluator_id, "project_id": project_id}
+                for evaluator_id, project_id in new_assessments
+            ]
+        )
+        refresh_scores(db, {project_id for _, project_id in new_assessments})
+
+    loads = [load[evaluator_id] for evaluator_id in load]
+    return {
+        "year": year,
+        "dry_run": dry_run,
+        "evaluators_per_project": evaluators_per_project,
+        "projects_count": len(projects),
+        "evaluators_count": len(evaluators),
+        "created_count": len(new_assessments),
+        "min_load": min(loads) if loads else 0,
+        "max_load": max(loads) if loads else 0,
+        "assignments": [
+            {"evaluator_id": evaluator_id, "project_id": project_id}
+            for evaluator_id, project_id in new_assessments
+        ],
+        "unfilled": [
+            {
+                "project_id": project_id,
+                "assigned": len(assigned[project_id]),
+                "missing": evaluators_per_project - len(assigned[project_id])
+            }
+            for project_id in sorted(unfilled)
+        ]
+    }
@@ -0,0 +1,166 @@
+import threading
+from typing import Dict, Tuple
+from sqlalchemy import and_, func, select
+from sqlalchemy.orm import Session, aliased
+from app.models.assessment import Assessment
+from app.models.award import Award
+from app.models.category import Category
+from app.models.project import Project
+from app.models.question import Question
+from app.models.response import Response
+from app.enums.question_type import QuestionType
+from app.enums.school_grade import SchoolGrade
+from app.services.score_service import get_scores_version, project_school_grade_subquery
+
+_cache: Dict[Tuple, Tuple[int, dict]] = {}
+_cache_lock = threading.Lock()
+
+def _cache_key(award: Award, year: int, question_ids: Tuple[int, ...]) -> Tuple:
+    return (
+        award.id,
+        year,
+        award.school_grade,
+        award.total_positions,
+        bool(award.use_school_grades),
+        bool(award.use_categories),
+        question_ids
+    )
+
+def get_award_ranking(db: Session, award: Award, year: int) -> dict:
+    """
+    Calcula os premiados de uma premiação: média das notas das questões da
+    premiação por projeto e ROW_NUMBER() por nível de ensino e/ou área.
+    Empates são resolvidos pelo número de avaliações e, por fim, pelo id do projeto.
+    O resultado fica em cache até que novas respostas sejam gravadas.
+    """
+    question_ids = tuple(sorted(question.id for question in award.questions if question.deleted_at is None))
+    key = _cache_key(award, year, question_ids)
+    version = get_scores_version()
+
+    with _cache_lock:
+        cached = _cache.get(key)
+    if cached and cached[0] == version:
+        return cached[1]
+
+    ranking = _compute_award_ranking(db, award, year, question_ids)
+
+    with _cache_lock:
+        _cache[key] = (version, ranking)
+    return ranking
+
+def _compute_award_ranking(db: Session, award: Award, year: int, question_ids: Tuple[int, ...]) -> dict:
+    main_category = aliased(Category)
+
+    grades = project_school_grade_subquery()
+
+    area_id = func.coalesce(Category.main_category_id, Category.id)
+    area_name = func.coalesce(main_category.name, Category.name)
+
+    response_filter = [
+        Response.assessment_id == Assessment.id,
+        Response.deleted_at == None,
+        Response.score != None
+    ]
+    if question_ids:
+        response_filter.append(Response.question_id.in_(question_ids))
+    else:
+        # Sem questões vinculadas, a premiação considera todas as questões objetivas
+        response_filter.append(Response.question_id.in_(
+            select(Question.id).where(
+                Question.type == QuestionType.MULTIPLE_CHOICE.value,
+                Question.deleted_at == None
+            )
+        ))
+
+    project_scores = (
+        select(
+            Project.id.label("project_id"),
+            Project.title.label("title"),
+            Project.external_id.label("external_id"),
+            grades.c.school_grade.label("school_grade"),
+            area_id.label("category_id"),
+            area_name.label("category_name"),
+            (func.sum(Response.score) * 1.0 / func.count(Response.id)).label("score"),
+            func.count(func.distinct(Assessment.id)).label("assessments_count")
+        )
+        .join(Category, Category.id == Project.category_id)
+        .outerjoin(main_category, main_category.id == Category.main_category_id)
+        .outerjoin(grades, grades.c.project_id == Project.id)
+        .join(Assessment, and_(
+            Assessment.project_id == Project.id,
+            Assessment.deleted_at == None
+        ))
+        .join(Response, and_(*response_filter))
+        .where(
+            Project.deleted_at == None,
+            Project.year == year
+        )
+        .group_by(
+            Project.id, Project.title, Project.external_id,
+            grades.c.school_grade, area_id, area_name
+        )
+    )
+    if award.school_grade:
+        project_scores = project_scores.where(grades.c.school_grade == award.school_grade)
+    project_scores = project_scores.subquery()
+
+    partition_by = []
+    if award.use_school_grades:
+        partition_by.append(project_scores.c.school_grade)
+    if award.use_categories:
+        partition_by.append(project_scores.c.category_id)
+
+    position = func.row_number().over(
+        partition_by=partition_by or None,
+        order_by=[
+            project_scores.c.score.desc(),
+            project_scores.c.assessments_count.desc(),
+            project_scores.c.project_id.asc()
+        ]
+    ).label("position")
+
+    ranked = select(project_scores, position).subquery()
+
+    statement = select(ranked)
+    if award.total_positions:
+        statement = statement.where(ranked.c.position <= award.total_positions)
+    statement = statement.order_by(
+        *([ranked.c.school_grade] if award.use_school_grades else []),
+        *([ranked.c.category_id] if award.use_categories else []),
+        ranked.c.position
+    )
+
+    groups = []
+    groups_by_key = {}
+    for row in db.execute(statement).mappings():
+        school_grade = row["school_grade"] if award.use_school_grades else None
+        category_id = row["category_id"] if award.use_categories else None
+        group_key = (school_grade, category_id)
+
+        if group_key not in groups_by_key:
+            groups_by_key[group_key] = {
+                "school_grade": school_grade,
+                "school_grade_label": SchoolGrade(school_grade).get_label() if school_grade in SchoolGrade.get_values() else None,
+                "category_id": category_id,
+                "category_name": row["category_name"] if award.use_categories else None,
+                "positions": []
+            }
+            groups.append(groups_by_key[group_key])
+
+        groups_by_key[group_key]["positions"].append({
+            "position": row["position"],
+            "project_id": row["project_id"],
+            "title": row["title"],
+            "external_id": row["external_id"],
+            "score": round(float(row["score"]), 2),
+            "assessments_count": row["assessments_count"]
+        })
+
+    return {
+        "award_id": award.id,
+        "award_name": award.name,
+        "year": year,
+        "total_positions": award.total_positions,
+        "question_ids": list(question_ids),
+        "groups": groups
+    }
@@ -0,0 +1,224 @@
+import io
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+import pandas as pd
+from sqlalchemy import func, select, update
+from sqlalchemy.orm import Session
+from app.models.assessment import Assessment
+from app.models.evaluator import Evaluator
+from app.models.project import Project
+from app.models.response import Response
+from app.models.user import User
+from app.services.score_service import refresh_scores
+from app.services.upsert_service import insert_ignoring_conflicts
+
+SAIPRU_PROJECT_COLUMN = "Projetos"
+SAIPRU_EVALUATOR_COLUMNS = ("Avaliador 1", "Avaliador 2", "Avaliador 3")
+
+Pair = Tuple[int, int]
+
+def read_assignment_sheet(content: bytes, filename: str) -> pd.DataFrame:
+    """Lê um CSV ou planilha Excel com todas as colunas como texto."""
+    if filename.endswith(('.xlsx', '.xls', '.xlsm')):
+        df = pd.read_excel(io.BytesIO(content), dtype=str)
+    else:
+        df = pd.read_csv(io.StringIO(content.decode('utf-8-sig')), dtype=str)
+    df.columns = [str(column).strip() for column in df.columns]
+    return df.fillna("")
+
+def _split_names(value: str) -> List[str]:
+    # Mesma convenção do saipru.csv: "Fulano/Beltrano" indica dois avaliadores
+    return [name.strip() for name in value.split("/") if name.strip()]
+
+def resolve_sheet_pairs(db: Session, year: int, df: pd.DataFrame) -> Tuple[List[Tuple[int, Pair]], List[str]]:
+    """
+    Converte as linhas da planilha em pares (avaliador, projeto). Aceita o molde
+    de importação (evaluator_id, project_id) ou o layout do saipru.csv, em que
+    projetos são identificados pelo título e avaliadores pelo nome do usuário.
+    Nomes e títulos são resolvidos com uma consulta cada.
+    """
+    pairs: List[Tuple[int, Pair]] = []
+    errors: List[str] = []
+
+    if {"evaluator_id", "project_id"}.issubset(df.columns):
+        for index, row in enumerate(df.itertuples(index=False), start=2):
+            try:
+                pairs.append((index, (int(float(row.evaluator_id)), int(float(row.project_id)))))
+            except (TypeError, ValueError):
+                errors.append(f"Linha {index}: evaluator_id e project_id devem ser números")
+        return pairs, errors
+
+    missing = [column for column in (SAIPRU_PROJECT_COLUMN, *SAIPRU_EVALUATOR_COLUMNS) if column not in df.columns]
+    if missing:
+        raise ValueError(f"Colunas obrigatórias ausentes: {', '.join(missing)}")
+
+    rows = []
+    titles: Set[str] = set()
+    names: Set[str] = set()
+    for index, row in enumerate(df.to_dict("records"), start=2):
+        title = row[SAIPRU_PROJECT_COLUMN].strip()
+        if not title:
+            continue
+        evaluator_names = [name for column in SAIPRU_EVALUATOR_COLUMNS for name in _split_names(row[column])]
+        rows.append((index, title, evaluator_names))
+        titles.add(title.lower())
+        names.update(name.lower() for name in evaluator_names)
+
+    projects_by_title: Dict[str, List[int]] = defaultdict(list)
+    if titles:
+        for project_id, title in db.execute(
+            select(Project.id, func.lower(Project.title)).where(
+                func.lower(Project.title).in_(titles),
+                Project.year == year,
+                Project.deleted_at == None
+            )
+        ):
+            projects_by_title[title].append(project_id)
+
+    evaluators_by_name: Dict[str, List[int]] = defaultdict(list)
+    if names:
+        for evaluator_id, name in db.execute(
+            select(Evaluator.id, func.lower(User.name))
+            .join(User, User.id == Evaluator.user_id)
+            .where(
+                func.lower(User.name).in_(names),
+                Evaluator.year == year,
+                Evaluator.deleted_at == None,
+                User.deleted_at == None
+            )
+        ):
+            evaluators_by_name[name].append(evaluator_id)
+
+    for index, title, evaluator_names in rows:
+        project_ids = projects_by_title.get(title.lower(), [])
+        if len(project_ids) != 1:
+            errors.append(f"Linha {index}: Projeto '{title}' {'não encontrado' if not project_ids else 'ambíguo'}")
+            continue
+        for name in evaluator_names:
+            evaluator_ids = evaluators_by_name.get(name.lower(), [])
+            if len(evaluator_ids) != 1:
+                errors.append(f"Linha {index}: Avaliador '{name}' {'não encontrado' if not evaluator_ids else 'ambíguo'}")
+                continue
+            pairs.append((index, (evaluator_ids[0], project_ids[0])))
+
+    return pairs, errors
+
+def apply_assignments(
+    db: Session,
+    year: Optional[int],
+    pairs: Iterable[Tuple[Optional[int], Pair]],
+    replace: bool = False,
+    dry_run: bool = False
+) -> dict:
+    """
+    Aplica um conjunto de pares (avaliador, projeto) em uma única transação:
+    valida avaliadores e projetos (do ano, quando informado) com uma consulta
+    cada, compara com as avaliações existentes dos projetos envolvidos e insere
+    apenas as novas. Com replace, as avaliações desses projetos que não constam
+    no conjunto são removidas (exclusão lógica), exceto as que já possuem
+    respostas. Não faz commit.
+    """
+    pairs = list(pairs)
+    errors: List[str] = []
+
+    evaluator_ids = {pair[0] for _, pair in pairs}
+    project_ids = {pair[1] for _, pair in pairs}
+
+    evaluator_statement = select(Evaluator.id).where(Evaluator.id.in_(evaluator_ids), Evaluator.deleted_at == None)
+    project_statement = select(Project.id).where(Project.id.in_(project_ids), Project.deleted_at == None)
+    if year is not None:
+        evaluator_statement = evaluator_statement.where(Evaluator.year == year)
+        project_statement = project_statement.where(Project.year == year)
+
+    valid_evaluators = set(db.scalars(evaluator_statement)) if evaluator_ids else set()
+    valid_projects = set(db.scalars(project_statement)) if project_ids else set()
+    scope = f" em {year}" if year is not None else ""
+
+    requested: Set[Pair] = set()
+    for line, (evaluator_id, project_id) in pairs:
+        prefix = f"Linha {line}: " if line is not None else ""
+        if evaluator_id not in valid_evaluators:
+            errors.append(f"{prefix}Avaliador com ID {evaluator_id} não encontrado{scope}")
+        elif project_id not in valid_projects:
+            errors.append(f"{prefix}Projeto com ID {project_id} não encontrado{scope}")
+        else:
+            requested.add((evaluator_id, project_id))
+
+    touched_projects = {project_id for _, project_id in requested}
+    existing: Dict[Pair, int] = {}
+    if touched_projects:
+        for assessment_id, evaluator_id, project_id in db.execute(
+            select(Assessment.id, Assessment.evaluator_id, Assessment.project_id).where(
+                Assessment.project_id.in_(touched_projects),
+                Assessment.deleted_at == None
+            )
+        ):
+            existing.setdefault((evaluator_id, project_id), assessment_id)
+
+    to_create = sorted(requested - existing.keys())
+    unchanged = requested & existing.keys()
+
+    to_remove: Dict[Pair, int] = {}
+    kept_answered: List[int] = []
+    if replace:
+        stale = {pair: assessment_id for pair, assessment_id in existing.items() if pair not in requested}
+        answered = set(db.scalars(
+            select(Response.assessment_id).where(
+                Response.assessment_id.in_(stale.values()),
+                Response.deleted_at == None
+            ).distinct()
+        )) if stale else set()
+        for pair, assessment_id in stale.items():
+            if assessment_id in answered:
+                kept_answered.append(assessment_id)
+            else:
+                to_remove[pair] = assessment_id
+
+    if not dry_run and (to_create or to_remove):
+        if to_create:
+            # Pares criados por outra requisição desde a leitura acima passam a contar como mantidos
+            inserted = insert_ignoring_conflicts(
+                db,
+                Assessment,
+                [
+                    {"evaluator_id": evaluator_id, "project_id": project_id}
+                    for evaluator_id, project_id in to_create
+                ],
+                index_elements=["evaluator_id", "project_id"],
+                returning=("evaluator_id", "project_id")
+            )
+            created = {(row.evaluator_id, row.project_id) for row in inserted}
+            unchanged |= set(to_create) - created
+            to_create = sorted(created)
+        if to_remove:
+            db.execute(
+                update(Assessment)
+                .where(Assessment.id.in_(to_remove.values()))
+                .values(deleted_at=func.now())
+                .execution_options(synchronize_session=False)
+            )
+        refresh_scores(db, {project_id for _, project_id in to_create} | {project_id for _, project_id in to_remove})
+
+    return {
+        "year": year,
+        "dry_run": dry_run,
+        "replace": replace,
+        "requested_count": len(requested),
+        "created_count": len(to_create),
+        "unchanged_count": len(unchanged),
+        "removed_count": len(to_remove),
+        "created": [
+            {"evaluator_id": evaluator_id, "project_id": project_id}
+            for evaluator_id, project_id in to_create
+        ],
+        "removed": [
+            {"evaluator_id": evaluator_id, "project_id": project_id}
+            for evaluator_id, project_id in sorted(to_remove)
+        ],
+        "unchanged": [
+            {"evaluator_id": evaluator_id, "project_id": project_id}
+            for evaluator_id, project_id in sorted(unchanged)
+        ],
+        "kept_answered": sorted(kept_answered),
+        "errors": errors
+    }
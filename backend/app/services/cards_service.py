@@ -0,0 +1,185 @@
+import threading
+import time
+from typing import Callable, Dict, Tuple
+from sqlalchemy import case, func, select
+from sqlalchemy.orm import Session
+from app.database import settings
+from app.models.category import Category
+from app.models.evaluator import Evaluator
+from app.models.project import Project
+from app.models.score import ProjectScore
+from app.enums.project_type import ProjectType
+from app.enums.school_grade import SchoolGrade
+from app.services.score_service import get_scores_version, project_school_grade_subquery
+
+_cache: Dict[Tuple[str, int], Tuple[int, float, dict]] = {}
+_cache_lock = threading.Lock()
+
+# Avaliações respondidas por projeto, mantidas em project_scores
+ANSWERED = func.coalesce(ProjectScore.assessments_count, 0)
+
+def _count_where(condition):
+    return func.coalesce(func.sum(case((condition, 1), else_=0)), 0)
+
+def _cached(name: str, year: int, compute: Callable[[], dict]) -> dict:
+    """
+    Cache de poucos segundos dos dados do painel. Gravar respostas ou avaliações
+    incrementa a versão das notas e invalida o cache imediatamente.
+    """
+    version = get_scores_version()
+    now = time.monotonic()
+    with _cache_lock:
+        cached = _cache.get((name, year))
+    if cached and cached[0] == version and cached[1] > now:
+        return cached[2]
+
+    data = compute()
+
+    with _cache_lock:
+        _cache[(name, year)] = (version, now + settings.cards_cache_ttl_seconds, data)
+    return data
+
+def get_cards(db: Session, year: int) -> dict:
+    """Valores dos cards do painel para o ano."""
+    return _cached("cards", year, lambda: _compute_cards(db, year))
+
+def get_progress(db: Session, year: int) -> dict:
+    """Progresso das avaliações por categoria, área, nível de ensino e tipo de projeto."""
+    return _cached("progress", year, lambda: _compute_progress(db, year))
+
+def _progress_values(total: int, sem_avaliacao: int, faltam_2: int, faltam_1: int) -> dict:
+    nao_finalizados = sem_avaliacao + faltam_2 + faltam_1
+    return {
+        "total_projetos": total,
+        "trabalhos_avaliados": total - sem_avaliacao,
+        "trabalhos_concluidos": total - nao_finalizados,
+        "progresso": round(((total - nao_finalizados) / total) * 100) if total else 0,
+        "status_avaliacoes": {
+            "faltam_1_avaliacao": faltam_1,
+            "faltam_2_avaliacoes": faltam_2,
+            "faltam_3_avaliacoes": sem_avaliacao
+        }
+    }
+
+def _compute_cards(db: Session, year: int) -> dict:
+    active_evaluators = (
+        select(func.count(Evaluator.id))
+        .where(Evaluator.deleted_at == None, Evaluator.year == year)
+        .scalar_subquery()
+    )
+
+    statement = (
+        select(
+            func.count(Project.id),
+            _count_where(ANSWERED == 0),
+            _count_where(ANSWERED == 1),
+            _count_where(ANSWERED == 2),
+            active_evaluators
+        )
+        .select_from(Project)
+        .outerjoin(ProjectScore, ProjectScore.project_id == Project.id)
+        .where(Project.deleted_at == None, Project.year == year)
+    )
+    total_projetos, projetos_sem_avaliacao, faltam_2_avaliacoes, faltam_1_avaliacao, avaliadores_ativos = (
+        db.execute(statement).one()
+    )
+
+    projetos_avaliados = total_projetos - projetos_sem_avaliacao
+    faltam_3_avaliacoes = projetos_sem_avaliacao
+
+    progresso_geral = 0
+    progresso_geral_inicial = 0
+    if total_projetos > 0:
+        progresso_geral_inicial = round((projetos_avaliados / total_projetos) * 100)
+        soma_projetos_nao_finalizados = faltam_1_avaliacao + faltam_2_avaliacoes + faltam_3_avaliacoes
+        progresso_geral = round(((total_projetos - soma_projetos_nao_finalizados) / total_projetos) * 100)
+
+    return {
+        "total_projetos": total_projetos,
+        "trabalhos_para_avaliar": projetos_sem_avaliacao,
+        "trabalhos_avaliados": projetos_avaliados,
+        "avaliadores_ativos": avaliadores_ativos,
+        "progresso_geral": progresso_geral,
+        "progresso_geral_inicial": progresso_geral_inicial,
+        "status_avaliacoes": {
+            "faltam_1_avaliacao": faltam_1_avaliacao,
+            "faltam_2_avaliacoes": faltam_2_avaliacoes,
+            "faltam_3_avaliacoes": faltam_3_avaliacoes
+        }
+    }
+
+def _compute_progress(db: Session, year: int) -> dict:
+    grades = project_school_grade_subquery()
+
+    statement = (
+        select(
+            Project.category_id,
+            grades.c.school_grade,
+            Project.projectType,
+            func.count(Project.id),
+            _count_where(ANSWERED == 0),
+            _count_where(ANSWERED == 1),
+            _count_where(ANSWERED == 2)
+        )
+        .select_from(Project)
+        .outerjoin(ProjectScore, ProjectScore.project_id == Project.id)
+        .outerjoin(grades, grades.c.project_id == Project.id)
+        .where(Project.deleted_at == None, Project.year == year)
+        .group_by(Project.category_id, grades.c.school_grade, Project.projectType)
+    )
+
+    categories = {
+        category.id: category
+        for category in db.query(Category.id, Category.name, Category.main_category_id).all()
+    }
+
+    # Contadores: [total, sem avaliação, falta 2, falta 1]
+    by_category: Dict[int, list] = {}
+    by_area: Dict[int, list] = {}
+    by_school_grade: Dict[int, list] = {}
+    by_project_type: Dict[int, list] = {}
+
+    for category_id, school_grade, project_type, *counts in db.execute(statement):
+        category = categories.get(category_id)
+        area_id = category.main_category_id if category and category.main_category_id else category_id
+        for groups, key in (
+            (by_category, category_id),
+            (by_area, area_id),
+            (by_school_grade, school_grade),
+            (by_project_type, project_type)
+        ):
+            totals = groups.setdefault(key, [0, 0, 0, 0])
+            for index, value in enumerate(counts):
+                totals[index] += value
+
+    def category_name(category_id):
+        category = categories.get(category_id)
+        return category.name if category else None
+
+    def enum_label(enum, value):
+        return enum(value).get_label() if value in enum.get_values() else None
+
+    return {
+        "year": year,
+        "categorias": [
+            {
+                "id": category_id,
+                "nome": category_name(category_id),
+                "main_category_id": categories[category_id].main_category_id if category_id in categories else None,
+                **_progress_values(*totals)
+            }
+            for category_id, totals in sorted(by_category.items())
+        ],
+        "areas": [
+            {"id": area_id, "nome": category_name(area_id), **_progress_values(*totals)}
+            for area_id, totals in sorted(by_area.items())
+        ],
+        "niveis_ensino": [
+            {"id": school_grade, "nome": enum_label(SchoolGrade, school_grade), **_progress_values(*totals)}
+            for school_grade, totals in sorted(by_school_grade.items(), key=lambda item: (item[0] is None, item[0] or 0))
+        ],
+        "tipos_projeto": [
+            {"id": project_type, "nome": enum_label(ProjectType, project_type), **_progress_values(*totals)}
+            for project_type, totals in sorted(by_project_type.items())
+        ]
+    }
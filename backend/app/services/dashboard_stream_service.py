@@ -0,0 +1,194 @@
+import asyncio
+import json
+import threading
+from collections import deque
+from datetime import datetime
+from typing import Deque, List, Optional, Set, Tuple
+import anyio
+from app.database import SessionLocal
+from app.services.cards_service import get_cards, get_progress
+from app.services.score_service import on_scores_changed
+
+HISTORY_SIZE = 100
+PROGRESS_GROUPS = ("categorias", "areas", "niveis_ensino", "tipos_projeto")
+
+def _cards_delta(previous: dict, current: dict) -> dict:
+    delta = {}
+    for key, value in current.items():
+        if isinstance(value, dict):
+            changed = {k: v for k, v in value.items() if previous.get(key, {}).get(k) != v}
+            if changed:
+                delta[key] = changed
+        elif previous.get(key) != value:
+            delta[key] = value
+    return delta
+
+def _progress_delta(previous: dict, current: dict) -> dict:
+    delta = {}
+    for group in PROGRESS_GROUPS:
+        previous_items = {item["id"]: item for item in previous.get(group, [])}
+        changed = [item for item in current.get(group, []) if previous_items.get(item["id"]) != item]
+        if changed:
+            delta[group] = changed
+    return delta
+
+def format_event(event_id: Optional[int], event: str, data: dict) -> str:
+    lines = []
+    if event_id is not None:
+        lines.append(f"id: {event_id}")
+    lines.append(f"event: {event}")
+    lines.append(f"data: {json.dumps(data, default=str)}")
+    return "\n".join(lines) + "\n\n"
+
+class DashboardStream:
+    """
+    Distribui as alterações dos cards e do progresso do painel via SSE. Cada
+    commit que altera notas agenda um único recálculo compartilhado; a diferença
+    em relação ao estado anterior é enviada a todos os inscritos e guardada em um
+    histórico curto, usado para reenviar eventos perdidos após uma reconexão.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._subscribers: Set[asyncio.Queue] = set()
+        self._history: Deque[Tuple[int, str]] = deque(maxlen=HISTORY_SIZE)
+        self._last_id = 0
+        self._state: Optional[dict] = None
+        self._pending_project_ids: Optional[Set[int]] = set()
+        self._refresh_scheduled = False
+
+    @staticmethod
+    def _compute_state() -> dict:
+        year = datetime.now().year
+        db = SessionLocal()
+        try:
+            return {"cards": get_cards(db, year), "progress": get_progress(db, year)}
+        finally:
+            db.close()
+
+    async def snapshot(self) -> Tuple[int, dict]:
+        with self._lock:
+            state, last_id = self._state, self._last_id
+        if state is None:
+            state = await anyio.to_thread.run_sync(self._compute_state)
+            with self._lock:
+                if self._state is None:
+                    self._state = state
+                last_id = self._last_id
+        return last_id, state
+
+    def subscribe(self) -> asyncio.Queue:
+        queue: asyncio.Queue = asyncio.Queue(maxsize=HISTORY_SIZE)
+        with self._lock:
+            self._loop = asyncio.get_running_loop()
+            self._subscribers.add(queue)
+        return queue
+
+    def unsubscribe(self, queue: asyncio.Queue) -> None:
+        with self._lock:
+            self._subscribers.discard(queue)
+
+    def events_after(self, last_event_id: int) -> Optional[List[Tuple[int, str]]]:
+        """Eventos posteriores ao id informado, ou None se já saíram do histórico."""
+        with self._lock:
+            if last_event_id == self._last_id:
+                return []
+            if last_event_id > self._last_id or not self._history or self._history[0][0] > last_event_id + 1:
+                return None
+            return [(event_id, message) for event_id, message in self._history if event_id > last_event_id]
+
+    async def events(self, last_event_id: Optional[str], heartbeat: int):
+        """
+        Gerador do stream de um inscrito: reenvia os eventos perdidos desde o
+        Last-Event-ID (ou o estado completo) e depois as alterações, com heartbeat.
+        """
+        queue = self.subscribe()
+        try:
+            yield f"retry: {heartbeat * 1000}\n\n"
+
+            replay = self.events_after(int(last_event_id)) if last_event_id and last_event_id.isdigit() else None
+            if replay is None:
+                sent_id, state = await self.snapshot()
+                yield format_event(sent_id, "snapshot", state)
+            else:
+                sent_id = replay[-1][0] if replay else int(last_event_id)
+                for _, message in replay:
+                    yield message
+
+            while True:
+                try:
+                    item = await asyncio.wait_for(queue.get(), timeout=heartbeat)
+                except asyncio.TimeoutError:
+                    yield ": heartbeat\n\n"
+                    continue
+                if item is None:
+                    break
+                event_id, message = item
+                if event_id > sent_id:
+                    sent_id = event_id
+                    yield message
+        finally:
+            self.unsubscribe(queue)
+
+    def notify(self, project_ids: Optional[Set[int]]) -> None:
+        """Chamado após o commit (em qualquer thread); agenda o recálculo no loop do servidor."""
+        with self._lock:
+            if self._pending_project_ids is not None:
+                if project_ids is None:
+                    self._pending_project_ids = None
+                else:
+                    self._pending_project_ids.update(project_ids)
+
+            if not self._subscribers or self._loop is None:
+                # Sem inscritos, o próximo a conectar recebe o estado recalculado
+                self._state = None
+                self._pending_project_ids = set()
+                return
+            if self._refresh_scheduled:
+                return
+            self._refresh_scheduled = True
+            loop = self._loop
+
+        loop.call_soon_threadsafe(lambda: loop.create_task(self._refresh()))
+
+    async def _refresh(self) -> None:
+        with self._lock:
+            self._refresh_scheduled = False
+            project_ids = self._pending_project_ids
+            self._pending_project_ids = set()
+            previous = self._state
+
+        try:
+            current = await anyio.to_thread.run_sync(self._compute_state)
+        except Exception as e:
+            print(f"Erro ao atualizar o stream do painel: {e}")
+            return
+
+        data = {
+            "project_ids": sorted(project_ids) if project_ids is not None else None,
+            "cards": _cards_delta(previous["cards"], current["cards"]) if previous else current["cards"],
+            "progress": _progress_delta(previous["progress"], current["progress"]) if previous else current["progress"]
+        }
+
+        with self._lock:
+            self._state = current
+            self._last_id += 1
+            event_id = self._last_id
+            message = format_event(event_id, "delta", data)
+            self._history.append((event_id, message))
+            subscribers = list(self._subscribers)
+
+        for queue in subscribers:
+            try:
+                queue.put_nowait((event_id, message))
+            except asyncio.QueueFull:
+                # Inscrito lento demais: encerra o stream para que reconecte com Last-Event-ID
+                self.unsubscribe(queue)
+                while not queue.empty():
+                    queue.get_nowait()
+                queue.put_nowait(None)
+
+dashboard_stream = DashboardStream()
+
+on_scores_changed(dashboard_stream.notify)
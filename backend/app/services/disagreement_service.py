@@ -0,0 +1,155 @@
+from typing import Optional
+from sqlalchemy import and_, case, func, or_, select
+from sqlalchemy.orm import Session
+from app.models.assessment import Assessment
+from app.models.project import Project
+from app.models.response import Response
+from app.models.score import AssessmentScore
+
+def _question_variances(year: Optional[int] = None, project_ids=None):
+    """
+    Variância (populacional) das notas de cada questão por projeto, com ao menos
+    duas respostas, restrita aos projetos do ano e/ou aos project_ids informados.
+    """
+    mean = func.avg(Response.score * 1.0)
+    statement = (
+        select(
+            Assessment.project_id.label("project_id"),
+            Response.question_id.label("question_id"),
+            (func.avg(Response.score * Response.score * 1.0) - mean * mean).label("variance"),
+            (func.max(Response.score) - func.min(Response.score)).label("spread")
+        )
+        .join(Response, and_(
+            Response.assessment_id == Assessment.id,
+            Response.deleted_at == None,
+            Response.score != None
+        ))
+        .where(Assessment.deleted_at == None)
+        .group_by(Assessment.project_id, Response.question_id)
+        .having(func.count(Response.id) >= 2)
+    )
+    if year is not None:
+        statement = statement.join(Project, Project.id == Assessment.project_id).where(
+            Project.year == year,
+            Project.deleted_at == None
+        )
+    if project_ids is not None:
+        statement = statement.where(Assessment.project_id.in_(project_ids))
+    return statement
+
+def get_review_queue(
+    db: Session,
+    year: int,
+    note_spread: float,
+    question_variance: float,
+    skip: int = 0,
+    limit: int = 20,
+    category_id: Optional[int] = None
+) -> dict:
+    """
+    Fila de projetos cujas avaliações divergem: diferença entre a maior e a menor
+    nota das avaliações ou variância de alguma questão acima do limite. Tudo é
+    calculado com consultas agrupadas; a página traz as questões mais divergentes
+    de cada projeto em uma única consulta adicional.
+    """
+    note_stats = (
+        select(
+            AssessmentScore.project_id.label("project_id"),
+            func.count(AssessmentScore.assessment_id).label("assessments_count"),
+            func.min(AssessmentScore.note).label("min_note"),
+            func.max(AssessmentScore.note).label("max_note"),
+            (func.max(AssessmentScore.note) - func.min(AssessmentScore.note)).label("note_spread")
+        )
+        .join(Project, Project.id == AssessmentScore.project_id)
+        .where(
+            AssessmentScore.responses_count > 0,
+            Project.year == year,
+            Project.deleted_at == None
+        )
+        .group_by(AssessmentScore.project_id)
+        .having(func.count(AssessmentScore.assessment_id) >= 2)
+        .subquery()
+    )
+
+    variances = _question_variances(year).subquery()
+    question_stats = (
+        select(
+            variances.c.project_id,
+            func.max(variances.c.variance).label("max_question_variance"),
+            func.sum(case((variances.c.variance >= question_variance, 1), else_=0)).label("divergent_questions")
+        )
+        .group_by(variances.c.project_id)
+        .subquery()
+    )
+
+    max_question_variance = func.coalesce(question_stats.c.max_question_variance, 0)
+    queue = (
+        select(
+            Project.id.label("project_id"),
+            Project.title,
+            Project.external_id,
+            Project.category_id,
+            note_stats.c.assessments_count,
+            note_stats.c.min_note,
+            note_stats.c.max_note,
+            note_stats.c.note_spread,
+            max_question_variance.label("max_question_variance"),
+            func.coalesce(question_stats.c.divergent_questions, 0).label("divergent_questions")
+        )
+        .join(note_stats, note_stats.c.project_id == Project.id)
+        .outerjoin(question_stats, question_stats.c.project_id == Project.id)
+        .where(
+            Project.deleted_at == None,
+            Project.year == year,
+            or_(
+                note_stats.c.note_spread >= note_spread,
+                max_question_variance >= question_variance
+            )
+        )
+    )
+    if category_id is not None:
+        queue = queue.where(Project.category_id == category_id)
+
+    total = db.execute(select(func.count()).select_from(queue.subquery())).scalar()
+
+    rows = db.execute(
+        queue
+        .order_by(note_stats.c.note_spread.desc(), max_question_variance.desc(), Project.id)
+        .offset(skip)
+        .limit(limit)
+    ).mappings().all()
+
+    items = [
+        {
+            **row,
+            "note_spread": round(float(row["note_spread"]), 2),
+            "max_question_variance": round(float(row["max_question_variance"]), 2),
+            "questions": []
+        }
+        for row in rows
+    ]
+
+    if items:
+        items_by_project = {item["project_id"]: item for item in items}
+        page_variances = _question_variances(project_ids=list(items_by_project)).subquery()
+        divergent = db.execute(
+            select(page_variances)
+            .where(page_variances.c.variance >= question_variance)
+            .order_by(page_variances.c.project_id, page_variances.c.variance.desc())
+        ).mappings()
+        for row in divergent:
+            items_by_project[row["project_id"]]["questions"].append({
+                "question_id": row["question_id"],
+                "variance": round(float(row["variance"]), 2),
+                "spread": row["spread"]
+            })
+
+    return {
+        "year": year,
+        "note_spread": note_spread,
+        "question_variance": question_variance,
+        "total": total,
+        "skip": skip,
+        "limit": limit,
+        "items": items
+    }
@@ -0,0 +1,166 @@
+import threading
+from bisect import bisect_left, insort
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+from app.database import SessionLocal
+from app.models.category import Category
+from app.models.project import Project
+from app.models.score import ProjectScore
+from app.services.score_service import on_scores_changed, project_school_grade_subquery
+
+DIMENSIONS = ("general", "category", "area", "school_grade", "project_type")
+
+SortKey = Tuple[float, int, int]
+
+class Leaderboard:
+    """
+    Classificação em memória dos projetos do ano corrente, mantida em listas
+    ordenadas por (nota final desc, avaliações desc, id do projeto) para cada
+    categoria, área, nível de ensino e tipo de projeto. Cada alteração localiza
+    a posição por busca binária em vez de reordenar o quadro inteiro.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self.year: Optional[int] = None
+        self.updated_at: Optional[datetime] = None
+        self._entries: Dict[int, dict] = {}
+        self._boards: Dict[Tuple[str, int], List[SortKey]] = {}
+
+    @staticmethod
+    def _sort_key(entry: dict) -> SortKey:
+        return (-entry["final_note"], -entry["assessments_count"], entry["project_id"])
+
+    @staticmethod
+    def _board_keys(entry: dict) -> List[Tuple[str, int]]:
+        keys = [
+            ("general", 0),
+            ("category", entry["category_id"]),
+            ("area", entry["area_id"]),
+            ("project_type", entry["project_type"]),
+        ]
+        if entry["school_grade"] is not None:
+            keys.append(("school_grade", entry["school_grade"]))
+        return keys
+
+    def _remove(self, project_id: int) -> None:
+        entry = self._entries.pop(project_id, None)
+        if entry is None:
+            return
+        sort_key = self._sort_key(entry)
+        for board_key in self._board_keys(entry):
+            board = self._boards.get(board_key)
+            if not board:
+                continue
+            index = bisect_left(board, sort_key)
+            if index < len(board) and board[index] == sort_key:
+                del board[index]
+
+    def _insert(self, entry: dict) -> None:
+        self._entries[entry["project_id"]] = entry
+        sort_key = self._sort_key(entry)
+        for board_key in self._board_keys(entry):
+            insort(self._boards.setdefault(board_key, []), sort_key)
+
+    def _load(self, db: Session, year: int, project_ids: Optional[Set[int]] = None) -> List[dict]:
+        grades = project_school_grade_subquery()
+        statement = (
+            select(
+                Project.id,
+                Project.title,
+                Project.external_id,
+                Project.category_id,
+                func.coalesce(Category.main_category_id, Category.id),
+                Project.projectType,
+                grades.c.school_grade,
+                ProjectScore.final_note,
+                ProjectScore.assessments_count
+            )
+            .join(Category, Category.id == Project.category_id)
+            .join(ProjectScore, ProjectScore.project_id == Project.id)
+            .outerjoin(grades, grades.c.project_id == Project.id)
+            .where(
+                Project.deleted_at == None,
+                Project.year == year,
+                ProjectScore.assessments_count > 0
+            )
+        )
+        if project_ids is not None:
+            statement = statement.where(Project.id.in_(project_ids))
+
+        return [
+            {
+                "project_id": row[0],
+                "title": row[1],
+                "external_id": row[2],
+                "category_id": row[3],
+                "area_id": row[4],
+                "project_type": row[5],
+                "school_grade": row[6],
+                "final_note": row[7],
+                "assessments_count": row[8]
+            }
+            for row in db.execute(statement)
+        ]
+
+    def rebuild(self, db: Session, year: Optional[int] = None) -> None:
+        year = year or datetime.now().year
+        entries = self._load(db, year)
+        with self._lock:
+            self.year = year
+            self._entries = {}
+            self._boards = {}
+            for entry in entries:
+                self._insert(entry)
+            self.updated_at = datetime.now()
+
+    def update_projects(self, db: Session, project_ids: Iterable[int]) -> None:
+        project_ids = set(project_ids)
+        if not project_ids or self.year is None:
+            return
+        entries = self._load(db, self.year, project_ids)
+        with self._lock:
+            for project_id in project_ids:
+                self._remove(project_id)
+            for entry in entries:
+                self._insert(entry)
+            self.updated_at = datetime.now()
+
+    def top(self, dimension: str = "general", key: int = 0, limit: int = 10) -> List[dict]:
+        with self._lock:
+            board = self._boards.get((dimension, key), [])
+            return [
+                {"position": position, **self._entries[sort_key[2]]}
+                for position, sort_key in enumerate(board[:limit], start=1)
+            ]
+
+    def boards(self) -> List[dict]:
+        with self._lock:
+            return [
+                {"dimension": dimension, "key": key, "total": len(board)}
+                for (dimension, key), board in sorted(self._boards.items())
+                if board
+            ]
+
+leaderboard = Leaderboard()
+
+def rebuild_leaderboard() -> None:
+    db = SessionLocal()
+    try:
+        leaderboard.rebuild(db)
+    finally:
+        db.close()
+
+def _on_scores_changed(project_ids: Optional[Set[int]]) -> None:
+    db = SessionLocal()
+    try:
+        if project_ids is None:
+            leaderboard.rebuild(db)
+        else:
+            leaderboard.update_projects(db, project_ids)
+    finally:
+        db.close()
+
+on_scores_changed(_on_scores_changed)
@@ -0,0 +1,399 @@
+import hashlib
+import json
+import os
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional, Sequence
+from sqlalchemy import func, or_, select
+from sqlalchemy.orm import Session
+from app.database import settings
+from app.models.assessment import Assessment
+from app.models.category import Category
+from app.models.event import Event
+from app.models.project import Project
+from app.models.question import Question
+from app.models.relationships import student_projects
+from app.models.response import Response
+from app.models.score import AssessmentScore
+from app.models.student import Student
+from app.models.sync_receipt import SyncReceipt
+from app.enums.project_type import ProjectType
+from app.enums.sync_status import SyncStatus
+from app.services.question_set_service import get_question_set
+from app.services.response_service import load_question_types, parse_response_values, save_responses
+from app.services.score_service import refresh_scores
+from app.utils.uploads import signed_upload_url
+
+def database_now(db: Session) -> datetime:
+    """Horário do banco, o mesmo relógio usado nos created_at/updated_at."""
+    return db.scalar(select(func.now()))
+
+def encode_cursor(moment: datetime) -> str:
+    return moment.isoformat()
+
+def decode_cursor(cursor: Optional[str]) -> Optional[datetime]:
+    """Cursor inválido ou ausente equivale a uma sincronização completa."""
+    if not cursor:
+        return None
+    try:
+        return datetime.fromisoformat(cursor)
+    except ValueError:
+        return None
+
+def _as_utc(moment: datetime) -> datetime:
+    if moment.tzinfo is None:
+        return moment
+    return moment.astimezone(timezone.utc).replace(tzinfo=None)
+
+def load_event_theme(db: Session, year: int) -> dict:
+    """Tema do aplicativo (cores e logo) do evento do ano, com o padrão do Fecitel quando não há evento."""
+    event = db.query(Event).filter(
+        Event.year == year,
+        Event.deleted_at.is_(None)
+    ).first()
+    
+    if not event:
+        return {
+            "id": None,
+            "year": year,
+            "app_primary_color": "#56BA54",
+            "app_font_color": "#FFFFFF",
+            "app_logo_url": signed_upload_url("/uploads/events/IFecitel_logo.png"),
+        }
+    
+    return {
+        "id": event.id,
+        "year": event.year,
+        "app_primary_color": event.app_primary_color,
+        "app_font_color": event.app_font_color,
+        "app_logo_url": f"{os.getenv('API_BASE_URL')}{signed_upload_url(event.app_logo_url)}" if event.app_logo_url and not event.app_logo_url.startswith('http') else event.app_logo_url,
+    }
+
+def load_assessment_payloads(
+    db: Session,
+    evaluator_id: int,
+    year: int,
+    since: Optional[datetime] = None,
+    with_responses: bool = False
+) -> List[dict]:
+    """
+    Avaliações do avaliador no ano no formato do aplicativo, montadas com um
+    número fixo de consultas: avaliações com projeto, categoria e nota; estudantes
+    dos projetos; e, opcionalmente, as respostas. Com since, apenas as avaliações
+    criadas ou alteradas (ou cujo projeto mudou) a partir desse instante.
+    """
+    statement = (
+        select(
+            Assessment.id,
+            Assessment.evaluator_id,
+            Assessment.project_id,
+            Project.title,
+            Project.description,
+            Project.year,
+            Project.file,
+            Project.category_id,
+            Project.projectType,
+            Project.external_id,
+            Category.name.label("category_name"),
+            AssessmentScore.responses_count,
+            AssessmentScore.note
+        )
+        .join(Project, Project.id == Assessment.project_id)
+        .outerjoin(Category, Category.id == Project.category_id)
+        .outerjoin(AssessmentScore, AssessmentScore.assessment_id == Assessment.id)
+        .where(
+            Assessment.evaluator_id == evaluator_id,
+            Assessment.deleted_at == None,
+            Project.deleted_at == None,
+            Project.year == year
+        )
+        .order_by(Assessment.id)
+    )
+    if since is not None:
+        statement = statement.where(or_(
+            Assessment.created_at >= since,
+            Assessment.updated_at >= since,
+            Project.updated_at >= since
+        ))
+    rows = db.execute(statement).all()
+    if not rows:
+        return []
+
+    students_by_project: Dict[int, List[dict]] = defaultdict(list)
+    for project_id, student_id, name, school_grade in db.execute(
+        select(student_projects.c.project_id, Student.id, Student.name, Student.school_grade)
+        .join(Student, Student.id == student_projects.c.student_id)
+        .where(
+            student_projects.c.project_id.in_({row.project_id for row in rows}),
+            Student.deleted_at == None
+        )
+        .order_by(Student.id)
+    ):
+        students_by_project[project_id].append({
+            "id": student_id,
+            "name": name,
+            "school_grade": school_grade
+        })
+
+    responses_by_assessment: Dict[int, List[dict]] = defaultdict(list)
+    if with_responses:
+        for response_id, assessment_id, question_id, response_value, score in db.execute(
+            select(Response.id, Response.assessment_id, Response.question_id, Response.response, Response.score)
+            .where(
+                Response.assessment_id.in_([row.id for row in rows]),
+                Response.deleted_at == None
+            )
+            .order_by(Response.id)
+        ):
+            responses_by_assessment[assessment_id].append({
+                "id": response_id,
+                "question_id": question_id,
+                "response": response_value,
+                "score": score
+            })
+
+    payloads = []
+    for row in rows:
+        students = students_by_project.get(row.project_id, [])
+        payloads.append({
+            "id": row.id,
+            "evaluator_id": row.evaluator_id,
+            "project_id": row.project_id,
+            "has_response": bool(row.responses_count),
+            "note": row.note or 0.0,
+            "project": {
+                "id": row.project_id,
+                "title": row.title,
+                "description": row.description,
+                "year": row.year,
+                "file": signed_upload_url(row.file),
+                "category_id": row.category_id,
+                "projectType": row.projectType,
+                "external_id": row.external_id,
+                "school_grade": students[0]["school_grade"] if students else "",
+                "students": students,
+                "category": {
+                    "id": row.category_id,
+                    "name": row.category_name
+                } if row.category_name is not None else None
+            },
+            "responses": responses_by_assessment.get(row.id, [])
+        })
+    return payloads
+
+def live_assessment_types(db: Session, evaluator_id: int, year: int) -> Dict[int, int]:
+    """{assessment_id: projectType} das avaliações ativas do avaliador no ano."""
+    return dict(db.execute(
+        select(Assessment.id, Project.projectType)
+        .join(Project, Project.id == Assessment.project_id)
+        .where(
+            Assessment.evaluator_id == evaluator_id,
+            Assessment.deleted_at == None,
+            Project.deleted_at == None,
+            Project.year == year
+        )
+    ).all())
+
+def get_sync_delta(db: Session, evaluator_id: int, year: int, since: Optional[datetime]) -> dict:
+    """
+    Alterações do servidor desde o cursor: avaliações novas ou alteradas,
+    avaliações removidas e, se alguma questão do ano mudou, os conjuntos de
+    questões dos tipos de projeto do avaliador. assessment_ids traz a lista
+    completa das avaliações ativas para o aplicativo descartar as que sumiram.
+
+    O cursor é o horário do banco, que no SQLite tem resolução de segundos e no
+    PostgreSQL é o início da transação; linhas gravadas no mesmo segundo ou
+    confirmadas depois do cursor ficariam de fora. Por isso a consulta recua
+    SYNC_CURSOR_OVERLAP_SECONDS: itens podem se repetir entre sincronizações e
+    o aplicativo os substitui pelo id.
+    """
+    now = database_now(db)
+    if since is not None:
+        since = since.replace(microsecond=0) - timedelta(seconds=settings.sync_cursor_overlap_seconds)
+
+    assessment_types = live_assessment_types(db, evaluator_id, year)
+
+    removed_ids: List[int] = []
+    if since is not None:
+        removed_ids = list(db.scalars(
+            select(Assessment.id).where(
+                Assessment.evaluator_id == evaluator_id,
+                Assessment.deleted_at >= since
+            )
+        ))
+
+    questions_changed = since is None or db.scalar(
+        select(func.count(Question.id)).where(
+            Question.year == year,
+            or_(
+                Question.created_at >= since,
+                Question.updated_at >= since,
+                Question.deleted_at >= since
+            )
+        )
+    ) > 0
+
+    question_sets = [
+        get_question_set(db, year, ProjectType(project_type))
+        for project_type in sorted(set(assessment_types.values()))
+        if project_type in ProjectType.get_values()
+    ]
+
+    return {
+        "cursor": encode_cursor(now),
+        "year": year,
+        "assessments": load_assessment_payloads(db, evaluator_id, year, since=since, with_responses=True),
+        "assessment_ids": sorted(assessment_types),
+        "removed_assessment_ids": removed_ids,
+        "questions_versions": {
+            str(question_set["project_type"]["value"]): question_set["version"]
+            for question_set in question_sets
+        },
+        "question_sets": question_sets if questions_changed else []
+    }
+
+def get_evaluator_bundle(db: Session, evaluator_id: int, year: int) -> dict:
+    """
+    Tudo o que o aplicativo precisa ao iniciar: tema do evento, todas as
+    avaliações do avaliador com o estado das respostas e um conjunto de
+    questões por tipo de projeto (sem repetição por avaliação). O número de
+    consultas não depende da quantidade de avaliações. A versão é um hash do
+    conteúdo, usada como ETag, e o cursor permite continuar com /sync.
+    """
+    cursor = encode_cursor(database_now(db))
+    theme = load_event_theme(db, year)
+    assessments = load_assessment_payloads(db, evaluator_id, year, with_responses=True)
+
+    question_sets = [
+        get_question_set(db, year, ProjectType(project_type))
+        for project_type in sorted({assessment["project"]["projectType"] for assessment in assessments})
+        if project_type in ProjectType.get_values()
+    ]
+
+    bundle = {
+        "year": year,
+        "theme": theme,
+        "assessments": assessments,
+        "question_sets": question_sets
+    }
+    # A URL assinada do arquivo muda a cada janela de expiração e também invalida a versão
+    bundle["version"] = hashlib.sha256(
+        json.dumps(bundle, sort_keys=True, default=str).encode()
+    ).hexdigest()[:32]
+    bundle["cursor"] = cursor
+    return bundle
+
+def _item_result(item, status: SyncStatus, message: Optional[str] = None, data: Optional[dict] = None) -> dict:
+    return {
+        "idempotency_key": item.idempotency_key,
+        "assessment_id": item.assessment,
+        "status": status.value,
+        "message": message or status.get_label(),
+        "data": data
+    }
+
+def apply_sync_batch(db: Session, evaluator_id: int, items: Sequence) -> List[dict]:
+    """
+    Aplica os envios do aplicativo em uma única transação, devolvendo um
+    resultado por item na ordem recebida:
+    - chaves de idempotência já processadas devolvem o resultado gravado;
+    - envios com horário do cliente anterior ao último aplicado na mesma
+      avaliação são descartados como desatualizados (vence o mais recente);
+    - itens inválidos são rejeitados sem afetar os demais.
+    Avaliações, questões e recibos são carregados com uma consulta cada e as
+    notas são recalculadas uma única vez. Não faz commit.
+    """
+    results: Dict[int, dict] = {}
+
+    keys = {item.idempotency_key for item in items}
+    receipts = {
+        receipt.idempotency_key: receipt
+        for receipt in db.query(SyncReceipt).filter(
+            SyncReceipt.evaluator_id == evaluator_id,
+            SyncReceipt.idempotency_key.in_(keys)
+        )
+    } if keys else {}
+
+    assessments = {
+        assessment.id: assessment
+        for assessment in db.query(Assessment).filter(
+            Assessment.id.in_({item.assessment for item in items}),
+            Assessment.evaluator_id == evaluator_id,
+            Assessment.deleted_at == None
+        )
+    } if items else {}
+
+    last_applied: Dict[int, datetime] = {
+        assessment_id: _as_utc(client_timestamp)
+        for assessment_id, client_timestamp in db.execute(
+            select(SyncReceipt.assessment_id, func.max(SyncReceipt.client_timestamp))
+            .where(
+                SyncReceipt.assessment_id.in_(assessments.keys()),
+                SyncReceipt.status == SyncStatus.APPLIED.value
+            )
+            .group_by(SyncReceipt.assessment_id)
+        )
+    } if assessments else {}
+
+    question_types = load_question_types(
+        db, (response.question_id for item in items for response in item.responses)
+    )
+
+    changed_project_ids = set()
+    seen_keys: Dict[str, Optional[dict]] = {}
+    # Ordem cronológica do cliente: com vários envios da mesma avaliação, o último prevalece
+    ordered = sorted(enumerate(items), key=lambda entry: (_as_utc(entry[1].client_timestamp), entry[0]))
+    for position, item in ordered:
+        client_timestamp = _as_utc(item.client_timestamp)
+
+        if item.idempotency_key in seen_keys:
+            results[position] = _item_result(item, SyncStatus.DUPLICATE, data=seen_keys[item.idempotency_key])
+            continue
+
+        if item.idempotency_key in receipts:
+            receipt = receipts[item.idempotency_key]
+            stored = json.loads(receipt.result) if receipt.result else None
+            results[position] = _item_result(item, SyncStatus.DUPLICATE, data=stored)
+            continue
+
+        assessment = assessments.get(item.assessment)
+        if assessment is None:
+            results[position] = _item_result(item, SyncStatus.ERROR, "Avaliação não encontrada para este avaliador")
+            continue
+
+        if item.assessment in last_applied and client_timestamp < last_applied[item.assessment]:
+            status = SyncStatus.STALE
+            data = None
+        else:
+            try:
+                values = parse_response_values(db, item.responses, question_types)
+            except ValueError as e:
+                results[position] = _item_result(item, SyncStatus.ERROR, str(e))
+                continue
+
+            try:
+                with db.begin_nested():
+                    data = save_responses(db, assessment, values, refresh=False)
+            except Exception as e:
+                results[position] = _item_result(item, SyncStatus.ERROR, f"Erro ao salvar respostas: {str(e)}")
+                continue
+
+            status = SyncStatus.APPLIED
+            last_applied[item.assessment] = client_timestamp
+            if data["changed"]:
+                changed_project_ids.add(data["project_id"])
+
+        db.add(SyncReceipt(
+            evaluator_id=evaluator_id,
+            idempotency_key=item.idempotency_key,
+            assessment_id=item.assessment,
+            client_timestamp=client_timestamp,
+            status=status.value,
+            result=json.dumps(data) if data is not None else None
+        ))
+        seen_keys[item.idempotency_key] = data
+        results[position] = _item_result(item, status, data=data)
+
+    refresh_scores(db, changed_project_ids)
+
+    return [results[position] for position in range(len(items))]
@@ -0,0 +1,235 @@
+import heapq
+import threading
+import time
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+from sqlalchemy import and_, func, select, update
+from sqlalchemy.orm import Session
+from app.database import SessionLocal, settings
+from app.models.assessment import Assessment
+from app.models.category import Category
+from app.models.project import Project
+from app.models.response import Response
+from app.models.score import AssessmentScore
+from app.services.score_service import on_scores_changed, refresh_scores
+
+class NextProjectQueue:
+    """
+    Fila de prioridade em memória dos projetos do ano corrente, usada para indicar
+    ao avaliador o próximo projeto a avaliar. A prioridade de um projeto é o
+    número de avaliações ativas (respondidas ou pendentes, incluindo as atribuídas
+    manualmente) mais as reservas ainda não gravadas (menor primeiro); há um heap
+    por categoria, com atualização preguiçosa das entradas. Reservas expiram se a
+    avaliação não for enviada no prazo e a avaliação criada pela reserva é então
+    removida por expire_claimed_assessments. Todas as operações ocorrem sob o
+    mesmo lock, de modo que duas requisições não ocupam a mesma vaga.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self.year: Optional[int] = None
+        self._projects: Dict[int, dict] = {}
+        self._heaps: Dict[int, List[Tuple[int, int]]] = {}
+        self._sub_categories: Dict[int, Set[int]] = {}
+        self._expirations: List[Tuple[float, int, int]] = []
+        self._expired_assessments: List[int] = []
+
+    def _priority(self, project_id: int) -> int:
+        project = self._projects[project_id]
+        # Reservas com avaliação já gravada estão contadas em "assigned"
+        pending = sum(1 for claim in project["claims"].values() if claim["assessment_id"] is None)
+        return project["assigned"] + pending
+
+    def _push(self, project_id: int) -> None:
+        category_id = self._projects[project_id]["category_id"]
+        heapq.heappush(self._heaps.setdefault(category_id, []), (self._priority(project_id), project_id))
+
+    def _expire_claims(self) -> None:
+        now = time.monotonic()
+        while self._expirations and self._expirations[0][0] <= now:
+            expires_at, project_id, evaluator_id = heapq.heappop(self._expirations)
+            project = self._projects.get(project_id)
+            claim = project["claims"].get(evaluator_id) if project else None
+            if claim and claim["expires_at"] == expires_at:
+                del project["claims"][evaluator_id]
+                if claim["assessment_id"] is not None:
+                    self._expired_assessments.append(claim["assessment_id"])
+                self._push(project_id)
+
+    def _load(self, db: Session, year: int, project_ids: Optional[Set[int]] = None) -> List[tuple]:
+        statement = (
+            select(
+                Project.id,
+                Project.category_id,
+                func.count(Assessment.id)
+            )
+            .outerjoin(Assessment, and_(
+                Assessment.project_id == Project.id,
+                Assessment.deleted_at == None
+            ))
+            .where(Project.deleted_at == None, Project.year == year)
+            .group_by(Project.id, Project.category_id)
+        )
+        if project_ids is not None:
+            statement = statement.where(Project.id.in_(project_ids))
+        return db.execute(statement).all()
+
+    def rebuild(self, db: Session, year: Optional[int] = None) -> None:
+        year = year or datetime.now().year
+        rows = self._load(db, year)
+        sub_categories: Dict[int, Set[int]] = {}
+        for category_id, main_category_id in db.execute(select(Category.id, Category.main_category_id)):
+            sub_categories.setdefault(category_id, set()).add(category_id)
+            if main_category_id:
+                sub_categories.setdefault(main_category_id, {main_category_id}).add(category_id)
+
+        with self._lock:
+            previous = self._projects
+            self.year = year
+            self._sub_categories = sub_categories
+            self._projects = {}
+            self._heaps = {}
+            for project_id, category_id, assigned in rows:
+                claims = previous.get(project_id, {}).get("claims", {})
+                self._projects[project_id] = {"category_id": category_id, "assigned": assigned, "claims": claims}
+                self._push(project_id)
+
+    def update_projects(self, db: Session, project_ids: Iterable[int]) -> None:
+        project_ids = set(project_ids)
+        if not project_ids or self.year is None:
+            return
+        rows = self._load(db, self.year, project_ids)
+        # Reservas concluídas: o avaliador já enviou respostas para o projeto
+        answered = db.execute(
+            select(AssessmentScore.project_id, AssessmentScore.evaluator_id)
+            .where(AssessmentScore.project_id.in_(project_ids), AssessmentScore.responses_count > 0)
+        ).all()
+
+        with self._lock:
+            for project_id, category_id, assigned in rows:
+                project = self._projects.setdefault(project_id, {"category_id": category_id, "assigned": 0, "claims": {}})
+                project["category_id"] = category_id
+                project["assigned"] = assigned
+            for project_id, evaluator_id in answered:
+                project = self._projects.get(project_id)
+                if project:
+                    project["claims"].pop(evaluator_id, None)
+            found = {row[0] for row in rows}
+            for project_id in project_ids:
+                if project_id not in found:
+                    self._projects.pop(project_id, None)
+                elif project_id in self._projects:
+                    self._push(project_id)
+
+    def claim(self, evaluator_id: int, category_ids: Iterable[int], exclude: Set[int]) -> Optional[int]:
+        """
+        Reserva para o avaliador o projeto elegível com menos avaliações: categoria
+        igual à do avaliador antes das subcategorias de suas áreas, e então o menor
+        id. Quem chama grava a avaliação e informa o id com attach_assessment.
+        """
+        target = settings.next_project_target_assessments
+        with self._lock:
+            self._expire_claims()
+
+            candidates = {}
+            for category_id in category_ids:
+                candidates.setdefault(category_id, 0)
+                for sub_category_id in self._sub_categories.get(category_id, ()):
+                    candidates.setdefault(sub_category_id, 1)
+
+            best = None
+            for category_id, match in candidates.items():
+                heap = self._heaps.get(category_id)
+                skipped = []
+                while heap:
+                    priority, project_id = heap[0]
+                    project = self._projects.get(project_id)
+                    if project is None or project["category_id"] != category_id or priority != self._priority(project_id):
+                        heapq.heappop(heap)
+                        continue
+                    if project_id in exclude or evaluator_id in project["claims"]:
+                        skipped.append(heapq.heappop(heap))
+                        continue
+                    if priority < target and (best is None or (priority, match, project_id) < best):
+                        best = (priority, match, project_id)
+                    break
+                for entry in skipped:
+                    heapq.heappush(heap, entry)
+
+            if best is None:
+                return None
+
+            project_id = best[2]
+            expires_at = time.monotonic() + settings.next_project_claim_minutes * 60
+            self._projects[project_id]["claims"][evaluator_id] = {"expires_at": expires_at, "assessment_id": None}
+            heapq.heappush(self._expirations, (expires_at, project_id, evaluator_id))
+            self._push(project_id)
+            return project_id
+
+    def attach_assessment(self, project_id: int, evaluator_id: int, assessment_id: int) -> None:
+        """Associa à reserva a avaliação gravada, removida caso a reserva expire."""
+        with self._lock:
+            project = self._projects.get(project_id)
+            claim = project["claims"].get(evaluator_id) if project else None
+            if claim is not None:
+                claim["assessment_id"] = assessment_id
+                self._push(project_id)
+
+    def pop_expired_assessments(self) -> List[int]:
+        with self._lock:
+            self._expire_claims()
+            expired, self._expired_assessments = self._expired_assessments, []
+            return expired
+
+    def release(self, project_id: int, evaluator_id: int) -> None:
+        with self._lock:
+            project = self._projects.get(project_id)
+            if project and project["claims"].pop(evaluator_id, None) is not None:
+                self._push(project_id)
+
+next_project_queue = NextProjectQueue()
+
+def expire_claimed_assessments(db: Session) -> None:
+    """
+    Remove (exclusão lógica) as avaliações criadas por reservas expiradas que não
+    receberam respostas, para que não fiquem na lista do avaliador. Não faz commit.
+    """
+    assessment_ids = next_project_queue.pop_expired_assessments()
+    if not assessment_ids:
+        return
+
+    answered = select(Response.assessment_id).where(
+        Response.assessment_id.in_(assessment_ids),
+        Response.deleted_at == None
+    )
+    project_ids = set(db.scalars(
+        update(Assessment)
+        .where(
+            Assessment.id.in_(assessment_ids),
+            Assessment.deleted_at == None,
+            Assessment.id.not_in(answered)
+        )
+        .values(deleted_at=func.now())
+        .returning(Assessment.project_id)
+        .execution_options(synchronize_session=False)
+    ))
+    refresh_scores(db, project_ids)
+
+def rebuild_next_project_queue() -> None:
+    db = SessionLocal()
+    try:
+        next_project_queue.rebuild(db)
+    finally:
+        db.close()
+
+def _on_scores_changed(project_ids: Optional[Set[int]]) -> None:
+    db = SessionLocal()
+    try:
+        if project_ids is None:
+            next_project_queue.rebuild(db)
+        else:
+            next_project_queue.update_projects(db, project_ids)
+    finally:
+        db.close()
+
+on_scores_changed(_on_scores_changed)
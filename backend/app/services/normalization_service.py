@@ -0,0 +1,118 @@
+import time
+import numpy as np
+from sqlalchemy import and_, delete, insert, select
+from sqlalchemy.orm import Session
+from app.models.assessment import Assessment
+from app.models.project import Project
+from app.models.response import Response
+from app.models.score import EvaluatorScoreStat, ProjectNormalizedScore
+
+def _group_mean(groups: np.ndarray, values: np.ndarray, size: int) -> np.ndarray:
+    return np.bincount(groups, weights=values, minlength=size) / np.bincount(groups, minlength=size)
+
+def normalize_scores(db: Session, year: int) -> dict:
+    """
+    Recalcula, para o ano informado, a média e o desvio padrão de cada avaliador
+    e as notas normalizadas dos projetos. Cada nota vira um z-score em relação
+    ao avaliador que a deu; a nota da avaliação é a média dos z-scores e a do
+    projeto, a média das avaliações, convertida de volta para a escala das notas
+    pela média e desvio padrão gerais. Não faz commit.
+    """
+    started = time.perf_counter()
+
+    statement = (
+        select(
+            Assessment.evaluator_id,
+            Assessment.id,
+            Assessment.project_id,
+            Response.score
+        )
+        .join(Response, and_(
+            Response.assessment_id == Assessment.id,
+            Response.deleted_at == None,
+            Response.score != None
+        ))
+        .join(Project, and_(
+            Project.id == Assessment.project_id,
+            Project.deleted_at == None
+        ))
+        .where(
+            Assessment.deleted_at == None,
+            Project.year == year
+        )
+    )
+    rows = db.execute(statement).all()
+    data = np.array(rows, dtype=np.float64).reshape(-1, 4)
+
+    evaluator_ids, evaluator_index = np.unique(data[:, 0].astype(np.int64), return_inverse=True)
+    assessment_ids, assessment_index = np.unique(data[:, 1].astype(np.int64), return_inverse=True)
+    scores = data[:, 3]
+
+    # Média e desvio padrão (populacional) de cada avaliador
+    evaluator_counts = np.bincount(evaluator_index, minlength=len(evaluator_ids))
+    evaluator_means = _group_mean(evaluator_index, scores, len(evaluator_ids))
+    evaluator_variances = _group_mean(evaluator_index, scores ** 2, len(evaluator_ids)) - evaluator_means ** 2
+    evaluator_stddevs = np.sqrt(np.clip(evaluator_variances, 0, None))
+
+    # Avaliadores que deram sempre a mesma nota não têm desvio: z-score 0
+    stddevs = evaluator_stddevs[evaluator_index]
+    z_scores = np.zeros(len(scores))
+    np.divide(scores - evaluator_means[evaluator_index], stddevs, out=z_scores, where=stddevs > 0)
+
+    assessment_z = _group_mean(assessment_index, z_scores, len(assessment_ids))
+    assessment_projects = np.zeros(len(assessment_ids), dtype=np.int64)
+    assessment_projects[assessment_index] = data[:, 2].astype(np.int64)
+
+    project_ids, project_index = np.unique(assessment_projects, return_inverse=True)
+    project_counts = np.bincount(project_index, minlength=len(project_ids))
+    project_z = _group_mean(project_index, assessment_z, len(project_ids))
+
+    overall_mean = float(scores.mean()) if len(scores) else 0.0
+    overall_stddev = float(scores.std()) if len(scores) else 0.0
+    normalized_notes = np.round(overall_mean + overall_stddev * project_z, 2)
+
+    db.execute(delete(EvaluatorScoreStat).where(EvaluatorScoreStat.year == year))
+    db.execute(delete(ProjectNormalizedScore).where(ProjectNormalizedScore.year == year))
+
+    evaluator_rows = [
+        {
+            "evaluator_id": evaluator_id,
+            "year": year,
+            "responses_count": count,
+            "mean": round(mean, 4),
+            "stddev": round(stddev, 4)
+        }
+        for evaluator_id, count, mean, stddev in zip(
+            evaluator_ids.tolist(), evaluator_counts.tolist(),
+            evaluator_means.tolist(), evaluator_stddevs.tolist()
+        )
+    ]
+    project_rows = [
+        {
+            "project_id": project_id,
+            "year": year,
+            "assessments_count": count,
+            "z_score": round(z_score, 4),
+            "normalized_note": note
+        }
+        for project_id, count, z_score, note in zip(
+            project_ids.tolist(), project_counts.tolist(),
+            project_z.tolist(), normalized_notes.tolist()
+        )
+    ]
+    if evaluator_rows:
+        db.execute(insert(EvaluatorScoreStat), evaluator_rows)
+    if project_rows:
+        db.execute(insert(ProjectNormalizedScore), project_rows)
+    db.expire_all()
+
+    return {
+        "year": year,
+        "responses_count": len(scores),
+        "evaluators_count": len(evaluator_rows),
+        "projects_count": len(project_rows),
+        "mean": round(overall_mean, 4),
+        "stddev": round(overall_stddev, 4),
+        "elapsed_ms": round((time.perf_counter() - started) * 1000, 1),
+        "evaluators": evaluator_rows
+    }
@@ -0,0 +1,81 @@
+import hashlib
+import json
+import threading
+from typing import Dict, Tuple
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from app.models.question import Question
+from app.enums.project_type import ProjectType
+
+_cache: Dict[Tuple[int, int], dict] = {}
+_cache_lock = threading.Lock()
+_questions_version = 0
+
+def invalidate_question_set() -> None:
+    """Descarta os conjuntos de questões em cache após alterações nas questões."""
+    global _questions_version
+    with _cache_lock:
+        _questions_version += 1
+        _cache.clear()
+
+def get_question_set(db: Session, year: int, project_type: ProjectType) -> dict:
+    """
+    Questões do ano com apenas o texto do tipo de projeto (científico ou
+    tecnológico), prontas para o aplicativo. O conjunto fica em memória até que
+    o CRUD de questões o invalide e carrega um hash de versão usado como ETag.
+    """
+    key = (year, project_type.value)
+    with _cache_lock:
+        cached = _cache.get(key)
+        version = _questions_version
+    if cached is not None:
+        return cached
+
+    question_set = _load_question_set(db, year, project_type)
+
+    with _cache_lock:
+        if version == _questions_version:
+            _cache[key] = question_set
+    return question_set
+
+def _load_question_set(db: Session, year: int, project_type: ProjectType) -> dict:
+    rows = db.execute(
+        select(
+            Question.id,
+            Question.scientific_text,
+            Question.technological_text,
+            Question.type,
+            Question.number_alternatives
+        )
+        .where(Question.deleted_at == None, Question.year == year)
+        .order_by(Question.id)
+    ).all()
+
+    scientific = project_type == ProjectType.SCIENTIFIC
+    questions = []
+    for row in rows:
+        text = row.scientific_text if scientific else row.technological_text
+        # Sem texto próprio para o tipo, usa o outro texto como fallback
+        text = text or (row.technological_text if scientific else row.scientific_text) or ""
+        questions.append({
+            "id": row.id,
+            "scientific_text": text if scientific else None,
+            "technological_text": None if scientific else text,
+            "type": row.type,
+            "number_alternatives": row.number_alternatives,
+            "display_text": text
+        })
+
+    digest = hashlib.sha256(
+        json.dumps([year, project_type.value, questions], sort_keys=True).encode()
+    ).hexdigest()[:32]
+
+    return {
+        "year": year,
+        "project_type": {
+            "value": project_type.value,
+            "label": project_type.get_label()
+        },
+        "version": digest,
+        "questions": questions
+    }
@@ -0,0 +1,112 @@
+import math
+import threading
+from typing import Dict, Tuple
+from sqlalchemy import and_, func, select
+from sqlalchemy.orm import Session
+from app.models.assessment import Assessment
+from app.models.question import Question
+from app.models.response import Response
+from app.services.score_service import get_scores_version
+
+_cache: Dict[int, Tuple[int, int, dict]] = {}
+_cache_lock = threading.Lock()
+_questions_version = 0
+
+def invalidate_question_stats() -> None:
+    """Descarta as estatísticas em cache após alterações nas questões."""
+    global _questions_version
+    with _cache_lock:
+        _questions_version += 1
+        _cache.clear()
+
+def get_question_stats(db: Session, year: int) -> dict:
+    """
+    Distribuição das notas de cada questão do ano: média, desvio padrão, menor e
+    maior nota e histograma com uma faixa por alternativa (0..number_alternatives).
+    Tudo sai de uma única consulta agrupada por questão e nota; o resultado fica
+    em cache até que respostas ou questões sejam alteradas.
+    """
+    version = (get_scores_version(), _questions_version)
+    with _cache_lock:
+        cached = _cache.get(year)
+    if cached and cached[:2] == version:
+        return cached[2]
+
+    stats = _compute_question_stats(db, year)
+
+    with _cache_lock:
+        if version[1] == _questions_version:
+            _cache[year] = (*version, stats)
+    return stats
+
+def _compute_question_stats(db: Session, year: int) -> dict:
+    live_responses = (
+        select(Response.id, Response.question_id, Response.score)
+        .join(Assessment, and_(
+            Assessment.id == Response.assessment_id,
+            Assessment.deleted_at == None
+        ))
+        .where(Response.deleted_at == None)
+        .subquery()
+    )
+
+    statement = (
+        select(
+            Question.id,
+            Question.type,
+            Question.number_alternatives,
+            live_responses.c.score,
+            func.count(live_responses.c.id)
+        )
+        .outerjoin(live_responses, live_responses.c.question_id == Question.id)
+        .where(
+            Question.deleted_at == None,
+            Question.year == year
+        )
+        .group_by(Question.id, Question.type, Question.number_alternatives, live_responses.c.score)
+        .order_by(Question.id, live_responses.c.score)
+    )
+
+    questions = {}
+    for question_id, question_type, number_alternatives, score, count in db.execute(statement):
+        question = questions.setdefault(question_id, {
+            "question_id": question_id,
+            "type": question_type,
+            "number_alternatives": number_alternatives,
+            "responses_count": 0,
+            "scored_count": 0,
+            "counts": {}
+        })
+        question["responses_count"] += count
+        if score is not None and count:
+            question["scored_count"] += count
+            question["counts"][score] = count
+
+    data = []
+    for question in questions.values():
+        counts = question.pop("counts")
+        scored = question["scored_count"]
+
+        mean = sum(score * count for score, count in counts.items()) / scored if scored else None
+        variance = (
+            sum(count * (score - mean) ** 2 for score, count in counts.items()) / scored
+            if scored else None
+        )
+
+        # Uma faixa por alternativa; notas fora do intervalo também aparecem
+        buckets = set(range(question["number_alternatives"] + 1)) if question["number_alternatives"] else set()
+        buckets.update(counts)
+
+        data.append({
+            **question,
+            "mean": round(mean, 2) if mean is not None else None,
+            "stddev": round(math.sqrt(variance), 2) if variance is not None else None,
+            "min": min(counts) if counts else None,
+            "max": max(counts) if counts else None,
+            "histogram": [
+                {"score": score, "count": counts.get(score, 0)}
+                for score in sorted(buckets)
+            ]
+        })
+
+    return {"year": year, "questions": data}
@@ -0,0 +1,148 @@
+from typing import Dict, Iterable, List, Optional, Tuple
+from sqlalchemy import delete, insert, select, update
+from sqlalchemy.orm import Session
+from app.models.assessment import Assessment
+from app.models.question import Question
+from app.models.response import Response
+from app.enums.question_type import QuestionType
+from app.services.score_service import refresh_scores
+
+def load_question_types(db: Session, question_ids: Iterable[int]) -> Dict[int, int]:
+    question_ids = set(question_ids)
+    if not question_ids:
+        return {}
+    return dict(db.execute(
+        select(Question.id, Question.type).where(Question.id.in_(question_ids))
+    ).all())
+
+def parse_response_values(
+    db: Session,
+    items: Iterable,
+    question_types: Optional[Dict[int, int]] = None
+) -> Dict[int, Tuple[Optional[str], Optional[int]]]:
+    """
+    Valida os itens enviados (question_id, type, value) com uma única consulta
+    às questões (ou com os tipos já carregados em question_types) e devolve
+    {question_id: (response, score)}. Se a mesma questão vier repetida, vale o
+    último valor. Levanta ValueError com a mensagem para o aplicativo quando
+    algum item é inválido.
+    """
+    items = list(items)
+    if question_types is None:
+        question_types = load_question_types(db, (item.question_id for item in items))
+
+    values: Dict[int, Tuple[Optional[str], Optional[int]]] = {}
+    for item in items:
+        question_type = question_types.get(item.question_id)
+
+        if question_type is None:
+            raise ValueError(f"Pergunta com ID {item.question_id} não encontrada")
+
+        if question_type != item.type:
+            raise ValueError(f"Tipo de pergunta não corresponde. Esperado: {question_type}, Recebido: {item.type}")
+
+        response_value = None
+        score_value = None
+        if question_type == QuestionType.TEXT.value:
+            response_value = item.value
+        elif question_type == QuestionType.MULTIPLE_CHOICE.value:
+            try:
+                score_value = int(item.value) if item.value else None
+            except (ValueError, TypeError):
+                raise ValueError(f"Valor inválido para questão de múltipla escolha: {item.value}")
+
+        values[item.question_id] = (response_value, score_value)
+    return values
+
+def save_responses(
+    db: Session,
+    assessment: Assessment,
+    values: Dict[int, Tuple[Optional[str], Optional[int]]],
+    refresh: bool = True
+) -> dict:
+    """
+    Substitui as respostas da avaliação pelas enviadas alterando apenas o que
+    mudou: respostas iguais ficam intocadas, as alteradas são atualizadas em
+    lote, as novas são inseridas em lote e as que não vieram são removidas.
+    A nota é calculada a partir dos valores enviados. Não faz commit; com
+    refresh=False o recálculo das notas fica a cargo de quem chama.
+    """
+    # Lidos antes do refresh_scores, que expira os objetos da sessão
+    assessment_id, evaluator_id, project_id = assessment.id, assessment.evaluator_id, assessment.project_id
+
+    existing: Dict[int, tuple] = {}
+    duplicated_ids: List[int] = []
+    for response_id, question_id, response_value, score_value in db.execute(
+        select(Response.id, Response.question_id, Response.response, Response.score)
+        .where(Response.assessment_id == assessment_id, Response.deleted_at == None)
+        .order_by(Response.id)
+    ):
+        if question_id in existing:
+            duplicated_ids.append(response_id)
+        else:
+            existing[question_id] = (response_id, response_value, score_value)
+
+    to_insert = [question_id for question_id in values if question_id not in existing]
+    to_update = [
+        question_id for question_id, value in values.items()
+        if question_id in existing and existing[question_id][1:] != value
+    ]
+    to_delete = duplicated_ids + [
+        existing[question_id][0] for question_id in existing if question_id not in values
+    ]
+
+    response_ids = {
+        question_id: existing[question_id][0]
+        for question_id in values if question_id in existing
+    }
+
+    if to_delete:
+        db.execute(delete(Response).where(Response.id.in_(to_delete)))
+
+    if to_update:
+        db.execute(
+            update(Response),
+            [
+                {"id": existing[question_id][0], "response": values[question_id][0], "score": values[question_id][1]}
+                for question_id in to_update
+            ]
+        )
+
+    if to_insert:
+        for response_id, question_id in db.execute(
+            insert(Response).returning(Response.id, Response.question_id),
+            [
+                {
+                    "question_id": question_id,
+                    "assessment_id": assessment_id,
+                    "response": values[question_id][0],
+                    "score": values[question_id][1]
+                }
+                for question_id in to_insert
+            ]
+        ):
+            response_ids[question_id] = response_id
+
+    changed = bool(to_insert or to_update or to_delete)
+    if changed and refresh:
+        refresh_scores(db, [project_id])
+
+    scores = [score for _, score in values.values() if score is not None]
+
+    return {
+        "id": assessment_id,
+        "evaluator_id": evaluator_id,
+        "project_id": project_id,
+        "has_response": len(values) > 0,
+        "note": round(sum(scores) / len(scores), 2) if scores else 0.0,
+        "changed": changed,
+        "responses": [
+            {
+                "id": response_ids[question_id],
+                "question_id": question_id,
+                "response": response_value,
+                "score": score_value
+            }
+            for question_id, (response_value, score_value) in values.items()
+        ]
+    }
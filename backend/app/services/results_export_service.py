@@ -0,0 +1,164 @@
+import re
+from typing import List
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Font
+from sqlalchemy import and_, case, func, select
+from sqlalchemy.orm import Session
+from app.models.assessment import Assessment
+from app.models.category import Category
+from app.models.evaluator import Evaluator
+from app.models.project import Project
+from app.models.question import Question
+from app.models.response import Response
+from app.models.score import AssessmentScore, ProjectScore
+from app.models.user import User
+from app.enums.question_type import QuestionType
+
+INVALID_SHEET_CHARS = re.compile(r"[\[\]\*\?/\\:]")
+
+def _sheet_title(name: str, used: set) -> str:
+    base = INVALID_SHEET_CHARS.sub(" ", name or "Sem categoria").strip()[:31] or "Categoria"
+    title, suffix = base, 2
+    while title.lower() in used:
+        tail = f" ({suffix})"
+        title = base[:31 - len(tail)] + tail
+        suffix += 1
+    used.add(title.lower())
+    return title
+
+def write_results_workbook(db: Session, year: int, path: str) -> int:
+    """
+    Gera a planilha de resultados do ano: uma aba por categoria, uma linha por
+    projeto (ordenados pela nota final) e, para cada avaliação, o avaliador, a
+    nota de cada questão e a nota da avaliação. As notas vêm de uma única
+    consulta pivotada por avaliação, lida em lotes e gravada em modo write-only.
+    Retorna o número de projetos exportados.
+    """
+    questions = db.execute(
+        select(Question.id)
+        .where(
+            Question.deleted_at == None,
+            Question.year == year,
+            Question.type == QuestionType.MULTIPLE_CHOICE.value
+        )
+        .order_by(Question.id)
+    ).scalars().all()
+
+    slots = db.execute(
+        select(func.max(select(func.count(Assessment.id))
+            .join(Project, Project.id == Assessment.project_id)
+            .where(Assessment.deleted_at == None, Project.deleted_at == None, Project.year == year)
+            .group_by(Assessment.project_id)
+            .subquery().c[0]))
+    ).scalar() or 0
+
+    question_columns = [
+        func.max(case((Response.question_id == question_id, Response.score))).label(f"q{question_id}")
+        for question_id in questions
+    ]
+    statement = (
+        select(
+            Category.id,
+            Category.name,
+            Project.id,
+            Project.external_id,
+            Project.title,
+            ProjectScore.final_note,
+            Assessment.id,
+            User.name,
+            AssessmentScore.note,
+            *question_columns
+        )
+        .join(Project, and_(
+            Project.category_id == Category.id,
+            Project.deleted_at == None,
+            Project.year == year
+        ))
+        .outerjoin(ProjectScore, ProjectScore.project_id == Project.id)
+        .outerjoin(Assessment, and_(
+            Assessment.project_id == Project.id,
+            Assessment.deleted_at == None
+        ))
+        .outerjoin(Evaluator, Evaluator.id == Assessment.evaluator_id)
+        .outerjoin(User, User.id == Evaluator.user_id)
+        .outerjoin(AssessmentScore, AssessmentScore.assessment_id == Assessment.id)
+        .outerjoin(Response, and_(
+            Response.assessment_id == Assessment.id,
+            Response.deleted_at == None
+        ))
+        .group_by(
+            Category.id, Category.name, Project.id, Project.external_id, Project.title,
+            ProjectScore.final_note, Assessment.id, User.name, AssessmentScore.note
+        )
+        .order_by(
+            Category.name,
+            Category.id,
+            func.coalesce(ProjectScore.final_note, 0).desc(),
+            Project.id,
+            Assessment.id
+        )
+    )
+
+    workbook = Workbook(write_only=True)
+    bold = Font(bold=True)
+
+    def header_row(sheet) -> List:
+        titles = ["Posição", "ID", "Código", "Projeto", "Nota final"]
+        for slot in range(1, slots + 1):
+            titles.append(f"Avaliador {slot}")
+            titles.extend(f"A{slot} Q{question_id}" for question_id in questions)
+            titles.append(f"A{slot} Nota")
+        cells = []
+        for title in titles:
+            cell = WriteOnlyCell(sheet, value=title)
+            cell.font = bold
+            cells.append(cell)
+        return cells
+
+    used_titles = set()
+    sheet = None
+    current_category = None
+    current_project = None
+    row = None
+    position = 0
+    exported = 0
+
+    def flush():
+        if row is not None:
+            sheet.append(row)
+
+    result = db.execute(statement, execution_options={"yield_per": 1000})
+    for record in result:
+        category_id, category_name, project_id, external_id, title, final_note, assessment_id, evaluator_name, note = record[:9]
+        scores = record[9:]
+
+        if category_id != current_category:
+            flush()
+            row = None
+            sheet = workbook.create_sheet(_sheet_title(category_name, used_titles))
+            sheet.append(header_row(sheet))
+            current_category = category_id
+            current_project = None
+            position = 0
+
+        if project_id != current_project:
+            flush()
+            position += 1
+            exported += 1
+            current_project = project_id
+            row = [position, project_id, external_id, title, final_note if final_note is not None else 0.0]
+
+        if assessment_id is not None:
+            row.append(evaluator_name)
+            row.extend(scores)
+            row.append(note)
+
+    flush()
+
+    if sheet is None:
+        sheet = workbook.create_sheet("Resultados")
+        sheet.append(header_row(sheet))
+
+    workbook.save(path)
+    return exported
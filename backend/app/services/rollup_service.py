@@ -0,0 +1,320 @@
+import logging
+import threading
+from datetime import datetime
+from typing import Dict, Iterable, Optional, Set
+from sqlalchemy import and_, case, cast, delete, func, insert, literal, select, Integer, Numeric
+from sqlalchemy.orm import Session
+from app.models.assessment import Assessment
+from app.models.category import Category
+from app.models.project import Project
+from app.models.relationships import student_projects
+from app.models.rollup import YearRollup, CategoryYearRollup, SchoolYearRollup
+from app.models.school import School
+from app.models.score import AssessmentScore, ProjectScore
+from app.models.student import Student
+from app.services.score_service import on_scores_changed
+
+_logger = logging.getLogger(__name__)
+
+# Anos com consolidados pendentes de atualização: None indica recálculo completo,
+# um conjunto indica apenas as categorias e escolas desses projetos
+_stale_years: Dict[int, Optional[Set[int]]] = {}
+_stale_lock = threading.Lock()
+
+def _evaluated_note():
+    """Nota final apenas dos projetos que já receberam avaliações respondidas."""
+    return case((ProjectScore.assessments_count > 0, ProjectScore.final_note))
+
+def _rounded_avg(value):
+    return func.round(cast(func.avg(value), Numeric), 2)
+
+def _refresh_year_totals(db: Session, year: int) -> None:
+    year_projects = select(Project.id).where(Project.deleted_at == None, Project.year == year)
+    year_students = select(Student.id, Student.school_id).where(Student.deleted_at == None, Student.year == year).subquery()
+
+    project_totals = (
+        select(
+            func.count(Project.id),
+            func.count(_evaluated_note()),
+            func.avg(_evaluated_note())
+        )
+        .outerjoin(ProjectScore, ProjectScore.project_id == Project.id)
+        .where(Project.deleted_at == None, Project.year == year)
+    )
+    assessment_totals = (
+        select(
+            func.count(Assessment.id),
+            func.count(AssessmentScore.assessment_id),
+            func.count(func.distinct(Assessment.evaluator_id))
+        )
+        .outerjoin(AssessmentScore, and_(
+            AssessmentScore.assessment_id == Assessment.id,
+            AssessmentScore.responses_count > 0
+        ))
+        .where(Assessment.deleted_at == None, Assessment.project_id.in_(year_projects))
+    )
+    student_totals = select(
+        func.count(year_students.c.id),
+        func.count(func.distinct(year_students.c.school_id))
+    )
+
+    projects_count, evaluated_projects_count, average_note = db.execute(project_totals).one()
+    assessments_count, completed_assessments_count, evaluators_count = db.execute(assessment_totals).one()
+    students_count, schools_count = db.execute(student_totals).one()
+
+    values = {
+        "projects_count": projects_count,
+        "evaluated_projects_count": evaluated_projects_count,
+        "assessments_count": assessments_count,
+        "completed_assessments_count": completed_assessments_count,
+        "evaluators_count": evaluators_count,
+        "students_count": students_count,
+        "schools_count": schools_count,
+        "average_note": round(float(average_note), 2) if average_note is not None else None
+    }
+
+    rollup = db.get(YearRollup, year)
+    if rollup is None:
+        db.add(YearRollup(year=year, **values))
+    else:
+        for field, value in values.items():
+            setattr(rollup, field, value)
+
+def _refresh_categories(db: Session, year: int, category_ids: Optional[Set[int]]) -> None:
+    delete_statement = delete(CategoryYearRollup).where(CategoryYearRollup.year == year)
+    category_select = (
+        select(
+            Project.year,
+            Project.category_id,
+            func.count(Project.id),
+            func.count(_evaluated_note()),
+            func.coalesce(func.sum(ProjectScore.assessments_count), 0),
+            _rounded_avg(_evaluated_note())
+        )
+        .outerjoin(ProjectScore, ProjectScore.project_id == Project.id)
+        .where(Project.deleted_at == None, Project.year == year)
+        .group_by(Project.year, Project.category_id)
+    )
+    if category_ids is not None:
+        delete_statement = delete_statement.where(CategoryYearRollup.category_id.in_(category_ids))
+        category_select = category_select.where(Project.category_id.in_(category_ids))
+
+    db.execute(delete_statement)
+    db.execute(
+        insert(CategoryYearRollup).from_select(
+            ["year", "category_id", "projects_count", "evaluated_projects_count", "assessments_count", "average_note"],
+            category_select
+        )
+    )
+
+def _refresh_schools(db: Session, year: int, school_ids: Optional[Set[int]]) -> None:
+    student_filter = [Student.deleted_at == None, Student.year == year]
+    if school_ids is not None:
+        student_filter.append(Student.school_id.in_(school_ids))
+
+    school_students = (
+        select(Student.school_id, func.count(Student.id).label("students_count"))
+        .where(*student_filter)
+        .group_by(Student.school_id)
+        .subquery()
+    )
+    school_project_pairs = (
+        select(Student.school_id, Project.id.label("project_id"))
+        .join(student_projects, student_projects.c.student_id == Student.id)
+        .join(Project, and_(
+            Project.id == student_projects.c.project_id,
+            Project.deleted_at == None,
+            Project.year == year
+        ))
+        .where(*student_filter)
+        .distinct()
+        .subquery()
+    )
+    school_projects = (
+        select(
+            school_project_pairs.c.school_id,
+            func.count(school_project_pairs.c.project_id).label("projects_count"),
+            _rounded_avg(_evaluated_note()).label("average_note")
+        )
+        .outerjoin(ProjectScore, ProjectScore.project_id == school_project_pairs.c.project_id)
+        .group_by(school_project_pairs.c.school_id)
+        .subquery()
+    )
+    school_select = (
+        select(
+            literal(year, Integer),
+            school_students.c.school_id,
+            school_students.c.students_count,
+            func.coalesce(school_projects.c.projects_count, 0),
+            school_projects.c.average_note
+        )
+        .outerjoin(school_projects, school_projects.c.school_id == school_students.c.school_id)
+    )
+
+    delete_statement = delete(SchoolYearRollup).where(SchoolYearRollup.year == year)
+    if school_ids is not None:
+        delete_statement = delete_statement.where(SchoolYearRollup.school_id.in_(school_ids))
+
+    db.execute(delete_statement)
+    db.execute(
+        insert(SchoolYearRollup).from_select(
+            ["year", "school_id", "students_count", "projects_count", "average_note"],
+            school_select
+        )
+    )
+
+def refresh_rollups(db: Session, year: int, project_ids: Optional[Iterable[int]] = None) -> None:
+    """
+    Recalcula os consolidados do ano com consultas agrupadas, sem commit. Com
+    project_ids, apenas as categorias e escolas desses projetos são refeitas
+    (os totais do ano são sempre recalculados).
+    """
+    category_ids = school_ids = None
+    if project_ids is not None:
+        project_ids = set(project_ids)
+        category_ids = {
+            row[0] for row in db.execute(
+                select(Project.category_id).where(Project.id.in_(project_ids), Project.year == year).distinct()
+            )
+        }
+        school_ids = {
+            row[0] for row in db.execute(
+                select(Student.school_id)
+                .join(student_projects, student_projects.c.student_id == Student.id)
+                .where(student_projects.c.project_id.in_(project_ids), Student.year == year)
+                .distinct()
+            )
+        }
+
+    _refresh_year_totals(db, year)
+    if category_ids is None or category_ids:
+        _refresh_categories(db, year, category_ids)
+    if school_ids is None or school_ids:
+        _refresh_schools(db, year, school_ids)
+    db.flush()
+
+def close_year(db: Session, year: int) -> YearRollup:
+    """Reconstrói os consolidados do ano e o marca como encerrado. Não faz commit."""
+    refresh_rollups(db, year)
+    rollup = db.get(YearRollup, year)
+    rollup.closed_at = datetime.now()
+    return rollup
+
+def reopen_year(db: Session, year: int) -> Optional[YearRollup]:
+    rollup = db.get(YearRollup, year)
+    if rollup is not None:
+        rollup.closed_at = None
+    return rollup
+
+def get_trends(db: Session, from_year: Optional[int] = None, to_year: Optional[int] = None) -> dict:
+    """Séries por ano, categoria e escola lidas apenas das tabelas de consolidados."""
+    def in_range(column):
+        filters = []
+        if from_year is not None:
+            filters.append(column >= from_year)
+        if to_year is not None:
+            filters.append(column <= to_year)
+        return filters
+
+    years = db.query(YearRollup).filter(*in_range(YearRollup.year)).order_by(YearRollup.year).all()
+
+    categories = {}
+    category_rows = db.execute(
+        select(CategoryYearRollup, Category.name)
+        .join(Category, Category.id == CategoryYearRollup.category_id)
+        .where(*in_range(CategoryYearRollup.year))
+        .order_by(CategoryYearRollup.category_id, CategoryYearRollup.year)
+    )
+    for rollup, name in category_rows:
+        category = categories.setdefault(rollup.category_id, {
+            "category_id": rollup.category_id,
+            "name": name,
+            "series": []
+        })
+        category["series"].append({
+            "year": rollup.year,
+            "projects_count": rollup.projects_count,
+            "evaluated_projects_count": rollup.evaluated_projects_count,
+            "assessments_count": rollup.assessments_count,
+            "average_note": rollup.average_note
+        })
+
+    schools = {}
+    school_rows = db.execute(
+        select(SchoolYearRollup, School.name)
+        .join(School, School.id == SchoolYearRollup.school_id)
+        .where(*in_range(SchoolYearRollup.year))
+        .order_by(SchoolYearRollup.school_id, SchoolYearRollup.year)
+    )
+    for rollup, name in school_rows:
+        school = schools.setdefault(rollup.school_id, {
+            "school_id": rollup.school_id,
+            "name": name,
+            "series": []
+        })
+        school["series"].append({
+            "year": rollup.year,
+            "students_count": rollup.students_count,
+            "projects_count": rollup.projects_count,
+            "average_note": rollup.average_note
+        })
+
+    return {
+        "years": [
+            {
+                "year": rollup.year,
+                "projects_count": rollup.projects_count,
+                "evaluated_projects_count": rollup.evaluated_projects_count,
+                "assessments_count": rollup.assessments_count,
+                "completed_assessments_count": rollup.completed_assessments_count,
+                "evaluators_count": rollup.evaluators_count,
+                "students_count": rollup.students_count,
+                "schools_count": rollup.schools_count,
+                "average_note": rollup.average_note,
+                "closed": rollup.closed_at is not None,
+                "updated_at": rollup.updated_at
+            }
+            for rollup in years
+        ],
+        "categories": list(categories.values()),
+        "schools": list(schools.values())
+    }
+
+def _mark_stale(year: int, project_ids: Optional[Set[int]]) -> None:
+    with _stale_lock:
+        if year in _stale_years and _stale_years[year] is None:
+            return
+        if project_ids is None:
+            _stale_years[year] = None
+        else:
+            _stale_years.setdefault(year, set()).update(project_ids)
+
+def refresh_stale_rollups(db: Session) -> None:
+    """
+    Aplica as atualizações pendentes dos consolidados (anos marcados após o envio
+    de notas), com commit. Chamado antes das leituras dos consolidados; uma falha
+    é registrada no log e o ano continua pendente para a próxima leitura.
+    """
+    with _stale_lock:
+        pending = dict(_stale_years)
+        _stale_years.clear()
+
+    for year, project_ids in pending.items():
+        try:
+            rollup = db.get(YearRollup, year)
+            if rollup is not None and rollup.closed_at is not None:
+                continue
+            refresh_rollups(db, year, project_ids if rollup is not None else None)
+            db.commit()
+        except Exception:
+            db.rollback()
+            _mark_stale(year, project_ids)
+            _logger.exception("Erro ao atualizar os consolidados de %s", year)
+
+def _on_scores_changed(project_ids: Optional[Set[int]]) -> None:
+    # Apenas o ano corrente, enquanto não encerrado, é atualizado. O ouvinte roda no
+    # after_commit da requisição, então só marca o ano como pendente; o recálculo
+    # acontece na próxima leitura dos consolidados (refresh_stale_rollups)
+    _mark_stale(datetime.now().year, set(project_ids) if project_ids is not None else None)
+
+on_scores_changed(_on_scores_changed)
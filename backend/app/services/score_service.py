@@ -0,0 +1,274 @@
+import logging
+from typing import Callable, Iterable, List, Optional, Set
+from sqlalchemy import and_, case, cast, delete, event, func, insert, select, union, Numeric
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+from app.models.assessment import Assessment
+from app.models.project import Project
+from app.models.question import Question
+from app.models.relationships import student_projects
+from app.models.response import Response
+from app.models.student import Student
+from app.models.score import AssessmentScore, ProjectQuestionScore, ProjectScore
+from app.enums.question_type import QuestionType
+
+# Versão das notas deste processo: incrementada a cada commit que recalculou notas.
+# Caches derivados das respostas comparam a versão para saber se estão válidos.
+_scores_version = 0
+_logger = logging.getLogger(__name__)
+_listeners: List[Callable[[Optional[Set[int]]], None]] = []
+
+def get_scores_version() -> int:
+    return _scores_version
+
+def on_scores_changed(listener: Callable[[Optional[Set[int]]], None]) -> None:
+    """Registra uma função chamada após o commit com os projetos alterados (None = todos)."""
+    _listeners.append(listener)
+
+@event.listens_for(Session, "after_commit")
+def _notify_scores_changed(session):
+    if "changed_project_ids" not in session.info:
+        return
+
+    global _scores_version
+    project_ids = session.info.pop("changed_project_ids")
+    _scores_version += 1
+
+    # Os dados já foram gravados: a falha de um ouvinte é registrada no log e não
+    # interrompe os demais nem a requisição. Caches que comparam a versão das
+    # notas (ranking, cards) são invalidados mesmo assim.
+    for listener in _listeners:
+        try:
+            listener(project_ids)
+        except Exception:
+            _logger.exception("Erro ao notificar alteração de notas em %s", getattr(listener, "__module__", listener))
+
+@event.listens_for(Session, "after_rollback")
+def _discard_scores_changed(session):
+    session.info.pop("changed_project_ids", None)
+
+def _mark_changed(db: Session, project_ids: Optional[Set[int]]) -> None:
+    if project_ids is None or db.info.get("changed_project_ids", set()) is None:
+        db.info["changed_project_ids"] = None
+    else:
+        db.info.setdefault("changed_project_ids", set()).update(project_ids)
+
+def project_school_grade_subquery():
+    """Nível de ensino de cada projeto, derivado dos estudantes vinculados."""
+    return (
+        select(
+            student_projects.c.project_id,
+            func.min(Student.school_grade).label("school_grade")
+        )
+        .join(Student, Student.id == student_projects.c.student_id)
+        .where(Student.deleted_at == None)
+        .group_by(student_projects.c.project_id)
+        .subquery()
+    )
+
+def _rounded_average(total, count):
+    return func.round(cast(total, Numeric) / count, 2)
+
+def project_ids_for_assessments(db: Session, assessment_ids: Iterable[int]) -> Set[int]:
+    assessment_ids = set(assessment_ids)
+    if not assessment_ids:
+        return set()
+    rows = db.execute(
+        select(Assessment.project_id).where(Assessment.id.in_(assessment_ids)).distinct()
+    )
+    return {row[0] for row in rows}
+
+def refresh_scores(db: Session, project_ids: Optional[Iterable[int]] = None) -> None:
+    """
+    Recalcula as tabelas de notas dos projetos informados (ou de todos, quando
+    project_ids é None) com consultas agrupadas, sem commit: deve ser chamada
+    na mesma transação que alterou avaliações ou respostas.
+    """
+    if project_ids is not None:
+        project_ids = set(project_ids)
+        if not project_ids:
+            return
+
+    db.flush()
+    _mark_changed(db, project_ids)
+
+    def scoped(statement, column):
+        return statement.where(column.in_(project_ids)) if project_ids is not None else statement
+
+    # Notas por avaliação
+    db.execute(scoped(delete(AssessmentScore), AssessmentScore.project_id))
+
+    scored_count = func.count(Response.score)
+    score_sum = func.coalesce(func.sum(Response.score), 0)
+    assessment_select = scoped(
+        select(
+            Assessment.id,
+            Assessment.project_id,
+            Assessment.evaluator_id,
+            func.count(Response.id),
+            scored_count,
+            score_sum,
+            case((scored_count > 0, _rounded_average(score_sum, scored_count)), else_=0)
+        )
+        .outerjoin(Response, and_(
+            Response.assessment_id == Assessment.id,
+            Response.deleted_at == None
+        ))
+        .where(Assessment.deleted_at == None)
+        .group_by(Assessment.id, Assessment.project_id, Assessment.evaluator_id),
+        Assessment.project_id
+    )
+    db.execute(
+        insert(AssessmentScore).from_select(
+            ["assessment_id", "project_id", "evaluator_id", "responses_count", "scored_count", "score_sum", "note"],
+            assessment_select
+        )
+    )
+
+    # Médias por projeto e questão
+    db.execute(scoped(delete(ProjectQuestionScore), ProjectQuestionScore.project_id))
+
+    question_sum = func.coalesce(func.sum(Response.score), 0)
+    question_select = scoped(
+        select(
+            Assessment.project_id,
+            Response.question_id,
+            func.count(Response.id),
+            question_sum,
+            _rounded_average(question_sum, func.count(Response.id))
+        )
+        .join(Response, and_(
+            Response.assessment_id == Assessment.id,
+            Response.deleted_at == None
+        ))
+        .where(Assessment.deleted_at == None)
+        .group_by(Assessment.project_id, Response.question_id),
+        Assessment.project_id
+    )
+    db.execute(
+        insert(ProjectQuestionScore).from_select(
+            ["project_id", "question_id", "responses_count", "score_sum", "average"],
+            question_select
+        )
+    )
+
+    # Nota final por projeto (média das avaliações que possuem respostas)
+    db.execute(scoped(delete(ProjectScore), ProjectScore.project_id))
+
+    answered_count = func.count(AssessmentScore.assessment_id)
+    project_select = scoped(
+        select(
+            Project.id,
+            answered_count,
+            case(
+                (answered_count > 0, _rounded_average(func.sum(AssessmentScore.note), answered_count)),
+                else_=0
+            )
+        )
+        .outerjoin(AssessmentScore, and_(
+            AssessmentScore.project_id == Project.id,
+            AssessmentScore.responses_count > 0
+        ))
+        .where(Project.deleted_at == None)
+        .group_by(Project.id),
+        Project.id
+    )
+    db.execute(
+        insert(ProjectScore).from_select(
+            ["project_id", "assessments_count", "final_note"],
+            project_select
+        )
+    )
+
+    db.expire_all()
+
+def ensure_scores(engine: Engine) -> None:
+    """
+    Preenche as tabelas de notas dos projetos que ainda não as possuem, como em
+    um banco existente antes da criação dessas tabelas (o mesmo que rodar o
+    backfill_scores.py). Chamada na inicialização; sem pendências, custa apenas
+    uma consulta.
+    """
+    with Session(bind=engine) as db:
+        missing = union(
+            select(Project.id)
+            .outerjoin(ProjectScore, ProjectScore.project_id == Project.id)
+            .where(Project.deleted_at == None, ProjectScore.project_id == None),
+            select(Assessment.project_id)
+            .outerjoin(AssessmentScore, AssessmentScore.assessment_id == Assessment.id)
+            .where(Assessment.deleted_at == None, AssessmentScore.assessment_id == None)
+        ).subquery()
+        project_ids = set(db.scalars(select(missing.c[0])))
+        if not project_ids:
+            return
+
+        refresh_scores(db, project_ids)
+        db.commit()
+        print(f"Notas recalculadas para {len(project_ids)} projetos sem registros em project_scores/assessment_scores")
+
+def get_score_matrix(
+    db: Session,
+    year: int,
+    by_evaluator: bool = False,
+    category_id: Optional[int] = None
+) -> dict:
+    """
+    Monta a matriz projeto x questão (ou projeto/avaliador x questão) de médias
+    a partir de uma única consulta agrupada. Linhas sem resposta para uma questão
+    ficam com None.
+    """
+    group_columns = [Assessment.project_id]
+    if by_evaluator:
+        group_columns.append(Assessment.evaluator_id)
+
+    statement = (
+        select(
+            *group_columns,
+            Response.question_id,
+            func.sum(func.coalesce(Response.score, 0)),
+            func.count(Response.id)
+        )
+        .join(Assessment, and_(
+            Assessment.id == Response.assessment_id,
+            Assessment.deleted_at == None
+        ))
+        .join(Project, and_(
+            Project.id == Assessment.project_id,
+            Project.deleted_at == None
+        ))
+        .join(Question, Question.id == Response.question_id)
+        .where(
+            Response.deleted_at == None,
+            Project.year == year,
+            Question.type == QuestionType.MULTIPLE_CHOICE.value
+        )
+        .group_by(*group_columns, Response.question_id)
+    )
+    if category_id is not None:
+        statement = statement.where(Project.category_id == category_id)
+
+    rows = db.execute(statement).all()
+
+    row_keys = sorted({tuple(row[:len(group_columns)]) for row in rows})
+    question_ids = sorted({row[len(group_columns)] for row in rows})
+    row_index = {key: index for index, key in enumerate(row_keys)}
+    question_index = {question_id: index for index, question_id in enumerate(question_ids)}
+
+    averages = [[None] * len(question_ids) for _ in row_keys]
+    counts = [[0] * len(question_ids) for _ in row_keys]
+    for row in rows:
+        key = tuple(row[:len(group_columns)])
+        question_id, total, count = row[len(group_columns):]
+        i, j = row_index[key], question_index[question_id]
+        averages[i][j] = round(total / count, 2) if count else None
+        counts[i][j] = count
+
+    return {
+        "year": year,
+        "by_evaluator": by_evaluator,
+        "projects": [key[0] for key in row_keys],
+        "evaluators": [key[1] for key in row_keys] if by_evaluator else None,
+        "questions": question_ids,
+        "averages": averages,
+        "counts": counts
+    }
@@ -0,0 +1,194 @@
+import threading
+from typing import Dict, Iterable, List, Optional, Tuple
+import numpy as np
+from sqlalchemy import and_, select
+from sqlalchemy.orm import Session
+from app.models.assessment import Assessment
+from app.models.project import Project
+from app.models.response import Response
+from app.enums.aggregation_rule import AggregationRule
+from app.services.score_service import get_scores_version
+
+_cache: Dict[int, Tuple[int, dict]] = {}
+_cache_lock = threading.Lock()
+
+def load_response_matrix(db: Session, year: int) -> dict:
+    """
+    Carrega as notas do ano em uma única consulta e monta a matriz densa
+    avaliação x questão (NaN onde não há resposta). A matriz fica em cache até
+    que novas respostas sejam gravadas.
+    """
+    version = get_scores_version()
+    with _cache_lock:
+        cached = _cache.get(year)
+    if cached and cached[0] == version:
+        return cached[1]
+
+    statement = (
+        select(
+            Project.id,
+            Project.title,
+            Response.assessment_id,
+            Response.question_id,
+            Response.score
+        )
+        .join(Assessment, and_(
+            Assessment.id == Response.assessment_id,
+            Assessment.deleted_at == None
+        ))
+        .join(Project, and_(
+            Project.id == Assessment.project_id,
+            Project.deleted_at == None
+        ))
+        .where(
+            Response.deleted_at == None,
+            Response.score != None,
+            Project.year == year
+        )
+    )
+    rows = db.execute(statement).all()
+
+    titles = {row[0]: row[1] for row in rows}
+    if rows:
+        data = np.array([(row[0], row[2], row[3], row[4]) for row in rows], dtype=np.int64)
+    else:
+        data = np.empty((0, 4), dtype=np.int64)
+
+    project_ids, response_projects = np.unique(data[:, 0], return_inverse=True)
+    assessment_ids, response_assessments = np.unique(data[:, 1], return_inverse=True)
+    question_ids, response_questions = np.unique(data[:, 2], return_inverse=True)
+
+    scores = np.full((len(assessment_ids), len(question_ids)), np.nan)
+    scores[response_assessments, response_questions] = data[:, 3]
+
+    assessment_projects = np.zeros(len(assessment_ids), dtype=np.int64)
+    assessment_projects[response_assessments] = response_projects
+
+    matrix = {
+        "year": year,
+        "project_ids": project_ids,
+        "titles": [titles[project_id] for project_id in project_ids.tolist()],
+        "question_ids": question_ids,
+        "assessment_projects": assessment_projects,
+        "scores": scores
+    }
+
+    with _cache_lock:
+        _cache[year] = (version, matrix)
+    return matrix
+
+def _assessment_notes(matrix: dict, weights: Dict[int, float]) -> np.ndarray:
+    """Nota de cada avaliação: média ponderada das questões respondidas."""
+    question_weights = np.array(
+        [weights.get(question_id, 1.0) for question_id in matrix["question_ids"].tolist()],
+        dtype=float
+    )
+    scores = matrix["scores"]
+    answered = ~np.isnan(scores)
+
+    weighted_sum = np.where(answered, scores, 0.0) @ question_weights
+    weight_total = answered @ question_weights
+    notes = np.full(len(scores), np.nan)
+    np.divide(weighted_sum, weight_total, out=notes, where=weight_total > 0)
+    return notes
+
+def _padded_notes(matrix: dict, notes: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Reorganiza as notas em uma matriz projeto x avaliação completada com NaN."""
+    project_count = len(matrix["project_ids"])
+    valid = ~np.isnan(notes)
+    projects = matrix["assessment_projects"][valid]
+    notes = notes[valid]
+
+    order = np.argsort(projects, kind="stable")
+    projects, notes = projects[order], notes[order]
+
+    counts = np.bincount(projects, minlength=project_count)
+    starts = np.cumsum(counts) - counts
+    slots = np.arange(len(projects)) - starts[projects]
+
+    padded = np.full((project_count, counts.max(initial=0)), np.nan)
+    padded[projects, slots] = notes
+    return padded, counts
+
+def _aggregate(padded: np.ndarray, counts: np.ndarray, aggregation: str) -> np.ndarray:
+    result = np.full(len(counts), np.nan)
+    rated = counts > 0
+    if not rated.any():
+        return result
+
+    rows = padded[rated]
+    n = counts[rated]
+    totals = np.nansum(rows, axis=1)
+
+    if aggregation == AggregationRule.MEDIAN.value:
+        result[rated] = np.nanmedian(rows, axis=1)
+    elif aggregation == AggregationRule.TRIMMED_MEAN.value:
+        # Com três ou mais avaliações, descarta a maior e a menor nota
+        ordered = np.sort(rows, axis=1)
+        lowest = ordered[:, 0]
+        highest = ordered[np.arange(len(n)), n - 1]
+        trimmed = n >= 3
+        values = totals / n
+        values[trimmed] = (totals[trimmed] - lowest[trimmed] - highest[trimmed]) / (n[trimmed] - 2)
+        result[rated] = values
+    elif aggregation == AggregationRule.DROP_OUTLIER.value:
+        # Com três ou mais avaliações, descarta a nota mais distante da média
+        means = totals / n
+        distances = np.nan_to_num(np.abs(rows - means[:, None]), nan=-1.0)
+        outliers = rows[np.arange(len(n)), distances.argmax(axis=1)]
+        dropped = n >= 3
+        values = means.copy()
+        values[dropped] = (totals[dropped] - outliers[dropped]) / (n[dropped] - 1)
+        result[rated] = values
+    else:
+        result[rated] = totals / n
+
+    return result
+
+def _positions(project_ids: np.ndarray, scores: np.ndarray, counts: np.ndarray) -> np.ndarray:
+    """Posição de cada projeto: nota desc, avaliações desc e id do projeto."""
+    positions = np.zeros(len(project_ids), dtype=np.int64)
+    rated = np.flatnonzero(~np.isnan(scores))
+    order = np.lexsort((project_ids[rated], -counts[rated], -scores[rated]))
+    positions[rated[order]] = np.arange(1, len(rated) + 1)
+    return positions
+
+def rank_projects(matrix: dict, weights: Dict[int, float], aggregation: str) -> dict:
+    notes = _assessment_notes(matrix, weights)
+    padded, counts = _padded_notes(matrix, notes)
+    scores = _aggregate(padded, counts, aggregation)
+    positions = _positions(matrix["project_ids"], scores, counts)
+    return {
+        "scores": [None if np.isnan(score) else round(float(score), 2) for score in scores],
+        "positions": [int(position) or None for position in positions],
+        "assessments_count": counts.tolist()
+    }
+
+def compare_profiles(db: Session, year: int, profiles: Iterable[dict]) -> dict:
+    """
+    Reclassifica todos os projetos do ano sob cada perfil (pesos por questão e
+    regra de agregação), reaproveitando a mesma matriz de respostas. Questões sem
+    peso definido no perfil valem 1.
+    """
+    matrix = load_response_matrix(db, year)
+
+    rankings: List[dict] = []
+    assessments_count: Optional[List[int]] = None
+    for profile in profiles:
+        ranking = rank_projects(matrix, profile["weights"], profile["aggregation"])
+        assessments_count = assessments_count or ranking["assessments_count"]
+        rankings.append({
+            "id": profile.get("id"),
+            "name": profile["name"],
+            "aggregation": profile["aggregation"],
+            "scores": ranking["scores"],
+            "positions": ranking["positions"]
+        })
+
+    return {
+        "year": year,
+        "projects": matrix["project_ids"].tolist(),
+        "titles": matrix["titles"],
+        "assessments_count": assessments_count or [0] * len(matrix["project_ids"]),
+        "profiles": rankings
+    }
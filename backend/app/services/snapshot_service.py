@@ -0,0 +1,64 @@
+import asyncio
+from datetime import datetime
+from typing import Optional
+import anyio
+from sqlalchemy.orm import Session
+from app.database import SessionLocal, settings
+from app.models.progress_snapshot import ProgressSnapshot
+from app.services.cards_service import get_cards
+
+_scheduler_task: Optional[asyncio.Task] = None
+
+def take_snapshot(db: Session, year: int) -> ProgressSnapshot:
+    """Registra os valores atuais dos cards no histórico de progresso. Não faz commit."""
+    cards = get_cards(db, year)
+    snapshot = ProgressSnapshot(
+        year=year,
+        taken_at=datetime.now(),
+        total_projetos=cards["total_projetos"],
+        trabalhos_avaliados=cards["trabalhos_avaliados"],
+        avaliadores_ativos=cards["avaliadores_ativos"],
+        progresso_geral=cards["progresso_geral"],
+        progresso_geral_inicial=cards["progresso_geral_inicial"],
+        **cards["status_avaliacoes"]
+    )
+    db.add(snapshot)
+    return snapshot
+
+def _take_current_snapshot() -> None:
+    db = SessionLocal()
+    try:
+        take_snapshot(db, datetime.now().year)
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+async def _run_scheduler(interval: int) -> None:
+    while True:
+        try:
+            await anyio.to_thread.run_sync(_take_current_snapshot)
+        except Exception as e:
+            print(f"Erro ao registrar histórico de progresso: {e}")
+        await asyncio.sleep(interval)
+
+def start_snapshot_scheduler() -> None:
+    """Inicia o agendador em segundo plano (desativado quando o intervalo é 0)."""
+    global _scheduler_task
+    interval = settings.progress_snapshot_interval_seconds
+    if interval <= 0 or _scheduler_task is not None:
+        return
+    _scheduler_task = asyncio.get_running_loop().create_task(_run_scheduler(interval))
+
+async def stop_snapshot_scheduler() -> None:
+    global _scheduler_task
+    if _scheduler_task is None:
+        return
+    _scheduler_task.cancel()
+    try:
+        await _scheduler_task
+    except asyncio.CancelledError:
+        pass
+    _scheduler_task = None
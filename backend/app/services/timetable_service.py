@@ -0,0 +1,152 @@
+from collections import defaultdict
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+from sqlalchemy import and_, delete, insert, select
+from sqlalchemy.orm import Session
+from app.models.assessment import Assessment
+from app.models.assessment_schedule import AssessmentSchedule
+from app.models.project import Project
+from app.models.score import AssessmentScore
+
+def generate_timetable(
+    db: Session,
+    year: int,
+    starts_at: datetime,
+    ends_at: datetime,
+    slot_minutes: int,
+    dry_run: bool = False
+) -> dict:
+    """
+    Distribui as avaliações ainda não respondidas do ano em horários da sessão,
+    sem que um avaliador ou um projeto tenha dois compromissos no mesmo horário.
+
+    Heurística gulosa: avaliadores com mais avaliações primeiro; cada avaliador
+    percorre os horários a partir do primeiro em que tem projeto livre e, em
+    cada horário, fica com o projeto livre mais disputado (com mais avaliadores
+    ainda sem horário). A ocupação dos projetos é um bitmask por projeto, de
+    modo que cada verificação é O(1). Os horários das avaliações já respondidas
+    são preservados e continuam ocupando o avaliador e o projeto. Sem commit.
+    """
+    slot_length = timedelta(minutes=slot_minutes)
+    slots_count = int((ends_at - starts_at) / slot_length)
+
+    pending = (
+        select(Assessment.id, Assessment.evaluator_id, Assessment.project_id)
+        .join(Project, and_(
+            Project.id == Assessment.project_id,
+            Project.deleted_at == None,
+            Project.year == year
+        ))
+        .outerjoin(AssessmentScore, AssessmentScore.assessment_id == Assessment.id)
+        .where(
+            Assessment.deleted_at == None,
+            (AssessmentScore.responses_count == None) | (AssessmentScore.responses_count == 0)
+        )
+    )
+    rows = db.execute(pending.order_by(Assessment.id)).all()
+
+    by_evaluator: Dict[int, List[tuple]] = defaultdict(list)
+    project_demand: Dict[int, int] = defaultdict(int)
+    for assessment_id, evaluator_id, project_id in rows:
+        by_evaluator[evaluator_id].append((assessment_id, project_id))
+        project_demand[project_id] += 1
+
+    # Horários mantidos (avaliações já respondidas) ocupam os bits correspondentes
+    # da nova sessão, para o avaliador e para o projeto
+    removed_assessments = select(Assessment.id).where(Assessment.deleted_at != None)
+    kept = db.execute(
+        select(AssessmentSchedule.evaluator_id, AssessmentSchedule.project_id, AssessmentSchedule.starts_at, AssessmentSchedule.ends_at)
+        .where(
+            AssessmentSchedule.year == year,
+            AssessmentSchedule.starts_at < ends_at,
+            AssessmentSchedule.ends_at > starts_at,
+            AssessmentSchedule.assessment_id.not_in(pending.with_only_columns(Assessment.id)),
+            AssessmentSchedule.assessment_id.not_in(removed_assessments)
+        )
+    ).all()
+
+    evaluator_busy: Dict[int, int] = defaultdict(int)
+    project_busy: Dict[int, int] = defaultdict(int)
+    for evaluator_id, project_id, kept_starts_at, kept_ends_at in kept:
+        first = max(int((kept_starts_at - starts_at) // slot_length), 0)
+        last = min(-int((starts_at - kept_ends_at) // slot_length), slots_count)
+        for slot in range(first, last):
+            evaluator_busy[evaluator_id] |= 1 << slot
+            project_busy[project_id] |= 1 << slot
+
+    schedule = []
+    unscheduled = []
+
+    for evaluator_id in sorted(by_evaluator, key=lambda evaluator_id: (-len(by_evaluator[evaluator_id]), evaluator_id)):
+        remaining = list(by_evaluator[evaluator_id])
+        slot = 0
+        while remaining and slot < slots_count:
+            bit = 1 << slot
+            if evaluator_busy[evaluator_id] & bit:
+                slot += 1
+                continue
+            free = [item for item in remaining if not project_busy[item[1]] & bit]
+            if free:
+                assessment_id, project_id = max(free, key=lambda item: (project_demand[item[1]], -item[1]))
+                remaining.remove((assessment_id, project_id))
+                project_busy[project_id] |= bit
+                project_demand[project_id] -= 1
+                schedule.append((assessment_id, evaluator_id, project_id, slot))
+            slot += 1
+
+        for assessment_id, project_id in remaining:
+            project_demand[project_id] -= 1
+            unscheduled.append({"assessment_id": assessment_id, "evaluator_id": evaluator_id, "project_id": project_id})
+
+    if not dry_run:
+        # Apenas os horários das avaliações reagendadas (e de avaliações excluídas) são
+        # descartados; o histórico das avaliações já respondidas é mantido
+        db.execute(
+            delete(AssessmentSchedule).where(
+                AssessmentSchedule.year == year,
+                AssessmentSchedule.assessment_id.in_(pending.with_only_columns(Assessment.id))
+                | AssessmentSchedule.assessment_id.in_(removed_assessments)
+            )
+        )
+        if schedule:
+            db.execute(
+                insert(AssessmentSchedule),
+                [
+                    {
+                        "assessment_id": assessment_id,
+                        "evaluator_id": evaluator_id,
+                        "project_id": project_id,
+                        "year": year,
+                        "slot": slot,
+                        "starts_at": starts_at + slot * slot_length,
+                        "ends_at": starts_at + (slot + 1) * slot_length
+                    }
+                    for assessment_id, evaluator_id, project_id, slot in schedule
+                ]
+            )
+
+    # Compactação: horários ocupados sobre a janela entre o primeiro e o último de cada avaliador
+    spans: Dict[int, List[int]] = defaultdict(list)
+    for _, evaluator_id, _, slot in schedule:
+        spans[evaluator_id].append(slot)
+    idle_slots = sum(max(slots) - min(slots) + 1 - len(slots) for slots in spans.values())
+
+    return {
+        "year": year,
+        "dry_run": dry_run,
+        "slots_count": slots_count,
+        "slot_minutes": slot_minutes,
+        "assessments_count": len(rows),
+        "scheduled_count": len(schedule),
+        "last_slot": max((item[3] for item in schedule), default=None),
+        "idle_slots": idle_slots,
+        "unscheduled": unscheduled
+    }
+
+def get_schedule_rows(db: Session, year: int, evaluator_id: Optional[int] = None, project_id: Optional[int] = None):
+    query = db.query(AssessmentSchedule).filter(AssessmentSchedule.year == year)
+    if evaluator_id is not None:
+        query = query.filter(AssessmentSchedule.evaluator_id == evaluator_id)
+    if project_id is not None:
+        query = query.filter(AssessmentSchedule.project_id == project_id)
+    return query.order_by(AssessmentSchedule.evaluator_id, AssessmentSchedule.slot).all()
@@ -0,0 +1,127 @@
+from typing import Dict, List, Optional, Sequence
+from sqlalchemy import func, inspect, insert, select, text
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.engine import Engine, Row
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from app.database import Base
+
+_DIALECT_INSERTS = {
+    "postgresql": postgresql.insert,
+    "sqlite": sqlite.insert,
+}
+
+# Índices criados por versões anteriores que deixaram de existir nos modelos.
+# Título e ano de projeto não são únicos: a importação de projetos descarta as
+# repetições, mas o cadastro manual e os seeders aceitam títulos repetidos.
+_OBSOLETE_INDEXES = {
+    "projects": ("uq_projects_live_title_year",),
+}
+
+def ensure_indexes(engine: Engine) -> None:
+    """
+    Cria os índices declarados nos modelos que ainda não existem no banco.
+    O create_all não altera tabelas já existentes, então índices únicos novos
+    precisam ser criados aqui. Se houver registros ativos duplicados que impeçam
+    a criação de um índice único, a inicialização é interrompida com a lista das
+    duplicatas: sem o índice, os INSERT ... ON CONFLICT dessa tabela falham.
+    Índices obsoletos (_OBSOLETE_INDEXES) são removidos.
+    """
+    inspector = inspect(engine)
+    existing_tables = set(inspector.get_table_names())
+    for table_name, index_names in _OBSOLETE_INDEXES.items():
+        if table_name not in existing_tables:
+            continue
+        existing_indexes = {index["name"] for index in inspector.get_indexes(table_name)}
+        with engine.begin() as connection:
+            for index_name in index_names:
+                if index_name in existing_indexes:
+                    connection.execute(text(f"DROP INDEX {index_name}"))
+    for table in Base.metadata.sorted_tables:
+        if table.name not in existing_tables:
+            continue
+        existing_indexes = {index["name"] for index in inspector.get_indexes(table.name)}
+        for index in table.indexes:
+            if index.name in existing_indexes:
+                continue
+            if index.unique:
+                duplicates = _live_duplicates(engine, table, list(index.columns))
+                if duplicates:
+                    columns = ", ".join(column.name for column in index.columns)
+                    examples = "; ".join(
+                        f"({', '.join(str(value) for value in row[:-1])}) x{row[-1]}" for row in duplicates
+                    )
+                    raise RuntimeError(
+                        f"Não foi possível criar o índice único {index.name}: a tabela {table.name} "
+                        f"possui registros ativos duplicados em ({columns}), por exemplo {examples}. "
+                        f"Remova (exclusão lógica) ou renomeie as duplicatas e reinicie a aplicação."
+                    )
+            index.create(bind=engine)
+
+def _live_duplicates(engine: Engine, table, columns, limit: int = 5) -> List[tuple]:
+    statement = select(*columns, func.count()).group_by(*columns).having(func.count() > 1).limit(limit)
+    if "deleted_at" in table.c:
+        statement = statement.where(table.c.deleted_at.is_(None))
+    with engine.connect() as connection:
+        return [tuple(row) for row in connection.execute(statement)]
+
+def insert_ignoring_conflicts(
+    db: Session,
+    model,
+    rows: Sequence[dict],
+    index_elements: Optional[Sequence[str]] = None,
+    returning: Sequence[str] = ("id",)
+) -> List[Row]:
+    """
+    Insere as linhas com INSERT ... ON CONFLICT DO NOTHING e retorna as colunas
+    de `returning` apenas das linhas efetivamente inseridas; as demais entraram
+    em conflito com uma restrição única. index_elements indica o índice único
+    usado como alvo (o filtro deleted_at IS NULL dos índices parciais é aplicado
+    automaticamente); sem ele, qualquer restrição única é considerada.
+    Em bancos sem ON CONFLICT, cada linha é inserida em um savepoint próprio.
+    """
+    if not rows:
+        return []
+
+    columns = [getattr(model, name) for name in returning]
+    dialect_insert = _DIALECT_INSERTS.get(db.get_bind().dialect.name)
+
+    if dialect_insert is not None:
+        statement = dialect_insert(model)
+        if index_elements:
+            statement = statement.on_conflict_do_nothing(
+                index_elements=list(index_elements),
+                index_where=model.deleted_at.is_(None) if hasattr(model, "deleted_at") else None
+            )
+        else:
+            statement = statement.on_conflict_do_nothing()
+        return list(db.execute(statement.returning(*columns), list(rows)))
+
+    inserted = []
+    for row in rows:
+        try:
+            with db.begin_nested():
+                inserted.extend(db.execute(insert(model).returning(*columns), [row]))
+        except IntegrityError:
+            continue
+    return inserted
+
+def split_conflicts(rows: Sequence[dict], inserted: Sequence[Row], key: Sequence[str]) -> List[int]:
+    """
+    Retorna as posições de `rows` que não foram inseridas, comparando as chaves
+    devolvidas pelo INSERT. Linhas repetidas no próprio lote contam como conflito
+    a partir da segunda ocorrência.
+    """
+    remaining: Dict[tuple, int] = {}
+    for row in inserted:
+        row_key = tuple(getattr(row, name) for name in key)
+        remaining[row_key] = remaining.get(row_key, 0) + 1
+
+    conflicts = []
+    for position, row in enumerate(rows):
+        row_key = tuple(row[name] for name in key)
+        if remaining.get(row_key, 0) > 0:
+            remaining[row_key] -= 1
+        else:
+            conflicts.append(position)
+    return conflicts
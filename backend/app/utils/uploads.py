@@ -0,0 +1,259 @@
+import base64
+import hashlib
+import hmac
+import mimetypes
+import os
+import re
+import stat
+import threading
+import time
+from email.utils import formatdate, parsedate
+from typing import Dict, Optional, Tuple
+
+import anyio
+from starlette.datastructures import Headers, QueryParams
+from starlette.exceptions import HTTPException
+from starlette.responses import FileResponse, Response, StreamingResponse
+from starlette.staticfiles import StaticFiles
+from starlette.types import Scope
+
+from app.database import settings
+
+CHUNK_SIZE = 64 * 1024
+
+# Arquivos cujo nome muda a cada upload (uuid dos logos de eventos e prefixo
+# de data/hora dos arquivos de projetos) podem ser cacheados indefinidamente.
+CONTENT_ADDRESSED_PATTERNS = [
+    re.compile(r"^events/[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}\.[\w]+$"),
+    re.compile(r"^projects/\d{8}_\d{6}_.+$"),
+]
+
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+REVALIDATE_CACHE_CONTROL = "no-cache"
+
+_etag_cache: Dict[str, Tuple[int, int, str]] = {}
+_etag_lock = threading.Lock()
+
+
+def upload_signature(path: str, expires: int) -> str:
+    message = f"{path}:{expires}".encode()
+    digest = hmac.new(settings.secret_key.encode(), message, hashlib.sha256).digest()
+    return base64.urlsafe_b64encode(digest[:16]).decode().rstrip("=")
+
+
+def signed_upload_url(stored_path: Optional[str]) -> Optional[str]:
+    """
+    Converte o caminho armazenado (ex.: "uploads/projects/x.pdf" ou "/uploads/events/y.png")
+    em uma URL assinada com HMAC e sempre com expiração. A expiração é arredondada para
+    janelas fixas, de modo que a mesma URL se repete dentro da janela. O cache de longa
+    duração dos arquivos de nome único fica no Cache-Control da resposta, que depende
+    apenas do caminho e não do token.
+    """
+    if not stored_path or stored_path.startswith(("http://", "https://")):
+        return stored_path
+
+    path = stored_path.lstrip("/")
+    if path.startswith("uploads/"):
+        path = path[len("uploads/"):]
+
+    # Validade mínima de um minuto: nenhuma configuração gera tokens permanentes
+    ttl = max(settings.upload_url_expire_minutes, 1) * 60
+    expires = (int(time.time()) // ttl + 2) * ttl
+    return f"/uploads/{path}?expires={expires}&signature={upload_signature(path, expires)}"
+
+
+def verify_upload_signature(path: str, expires: Optional[str], signature: Optional[str]) -> bool:
+    if not expires or not signature or not expires.isdigit():
+        return False
+    if int(expires) < time.time():
+        return False
+    expected = upload_signature(path.replace(os.sep, "/"), int(expires))
+    return hmac.compare_digest(expected, signature)
+
+
+def compute_etag(full_path: str, stat_result: os.stat_result) -> str:
+    """ETag forte baseado no conteúdo, recalculado apenas quando o arquivo muda."""
+    with _etag_lock:
+        cached = _etag_cache.get(full_path)
+    if cached and cached[0] == stat_result.st_mtime_ns and cached[1] == stat_result.st_size:
+        return cached[2]
+
+    digest = hashlib.sha256()
+    with open(full_path, "rb") as file:
+        for chunk in iter(lambda: file.read(CHUNK_SIZE), b""):
+            digest.update(chunk)
+    etag = f'"{digest.hexdigest()[:32]}"'
+
+    with _etag_lock:
+        _etag_cache[full_path] = (stat_result.st_mtime_ns, stat_result.st_size, etag)
+    return etag
+
+
+def is_content_addressed(path: str) -> bool:
+    path = path.replace(os.sep, "/")
+    return any(pattern.match(path) for pattern in CONTENT_ADDRESSED_PATTERNS)
+
+
+def parse_range(range_header: str, file_size: int) -> Optional[Tuple[int, int]]:
+    """
+    Interpreta um cabeçalho Range de intervalo único e retorna (início, fim) inclusivos.
+    Retorna None quando o cabeçalho deve ser ignorado e levanta ValueError se o
+    intervalo não puder ser satisfeito.
+    """
+    unit, _, ranges = range_header.partition("=")
+    if unit.strip().lower() != "bytes" or "," in ranges:
+        return None
+
+    start_text, sep, end_text = ranges.strip().partition("-")
+    start_text, end_text = start_text.strip(), end_text.strip()
+    if not sep or not (start_text or end_text):
+        return None
+    if (start_text and not start_text.isdigit()) or (end_text and not end_text.isdigit()):
+        return None
+
+    if not start_text:
+        suffix_length = int(end_text)
+        if suffix_length == 0:
+            raise ValueError("Intervalo vazio")
+        start = max(file_size - suffix_length, 0)
+        end = file_size - 1
+    else:
+        start = int(start_text)
+        end = min(int(end_text), file_size - 1) if end_text else file_size - 1
+
+    if start > end or start >= file_size:
+        raise ValueError("Intervalo não satisfatório")
+    return start, end
+
+
+def guess_media_type(full_path: str) -> str:
+    return mimetypes.guess_type(full_path)[0] or "application/octet-stream"
+
+
+def etag_matches(header_value: str, etag: str) -> bool:
+    if header_value.strip() == "*":
+        return True
+    candidates = [value.strip() for value in header_value.split(",")]
+    return any(candidate.removeprefix("W/") == etag for candidate in candidates)
+
+
+async def iter_file_range(full_path: str, start: int, length: int):
+    async with await anyio.open_file(full_path, mode="rb") as file:
+        await file.seek(start)
+        remaining = length
+        while remaining > 0:
+            chunk = await file.read(min(CHUNK_SIZE, remaining))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+            yield chunk
+
+
+class UploadFiles(StaticFiles):
+    """
+    Serve o diretório de uploads com ETag forte, cache de longa duração para
+    arquivos de nome único, suporte a HTTP Range e, opcionalmente, delegação
+    da entrega ao proxy via X-Accel-Redirect (nginx) ou X-Sendfile (Apache).
+    Quando exigido, o acesso depende apenas da assinatura HMAC da URL, sem
+    consultar o banco de dados.
+    """
+
+    async def get_response(self, path: str, scope: Scope) -> Response:
+        if scope["method"] not in ("GET", "HEAD"):
+            raise HTTPException(status_code=405)
+
+        if settings.uploads_require_signature:
+            query_params = QueryParams(scope["query_string"])
+            if not verify_upload_signature(path, query_params.get("expires"), query_params.get("signature")):
+                raise HTTPException(status_code=403)
+
+        try:
+            full_path, stat_result = await anyio.to_thread.run_sync(self.lookup_path, path)
+        except PermissionError:
+            raise HTTPException(status_code=401)
+
+        if not stat_result or not stat.S_ISREG(stat_result.st_mode):
+            raise HTTPException(status_code=404)
+
+        etag = await anyio.to_thread.run_sync(compute_etag, full_path, stat_result)
+        return self.upload_response(path, full_path, stat_result, etag, scope)
+
+    def upload_response(
+        self,
+        path: str,
+        full_path: str,
+        stat_result: os.stat_result,
+        etag: str,
+        scope: Scope
+    ) -> Response:
+        method = scope["method"]
+        request_headers = Headers(scope=scope)
+        last_modified = formatdate(stat_result.st_mtime, usegmt=True)
+        headers = {
+            "etag": etag,
+            "last-modified": last_modified,
+            "cache-control": IMMUTABLE_CACHE_CONTROL if is_content_addressed(path) else REVALIDATE_CACHE_CONTROL,
+            "accept-ranges": "bytes",
+        }
+
+        if self.is_not_modified_upload(request_headers, etag, stat_result):
+            return Response(status_code=304, headers=headers)
+
+        sendfile_mode = settings.uploads_sendfile_mode.lower()
+        if sendfile_mode in ("x-accel-redirect", "x-sendfile"):
+            # O proxy entrega o arquivo (incluindo Range); a aplicação apenas autoriza.
+            media_type = guess_media_type(full_path)
+            if sendfile_mode == "x-accel-redirect":
+                prefix = settings.uploads_accel_prefix.rstrip("/")
+                headers["x-accel-redirect"] = f"{prefix}/{path.replace(os.sep, '/')}"
+            else:
+                headers["x-sendfile"] = os.path.abspath(full_path)
+            return Response(status_code=200, headers=headers, media_type=media_type)
+
+        range_header = request_headers.get("range")
+        if range_header and method == "GET" and self.if_range_allows(request_headers, etag, last_modified):
+            file_size = stat_result.st_size
+            try:
+                byte_range = parse_range(range_header, file_size)
+            except ValueError:
+                headers["content-range"] = f"bytes */{file_size}"
+                return Response(status_code=416, headers=headers)
+
+            if byte_range is not None:
+                start, end = byte_range
+                length = end - start + 1
+                headers["content-range"] = f"bytes {start}-{end}/{file_size}"
+                headers["content-length"] = str(length)
+                media_type = guess_media_type(full_path)
+                return StreamingResponse(
+                    iter_file_range(full_path, start, length),
+                    status_code=206,
+                    headers=headers,
+                    media_type=media_type
+                )
+
+        return FileResponse(full_path, stat_result=stat_result, method=method, headers=headers)
+
+    @staticmethod
+    def is_not_modified_upload(request_headers: Headers, etag: str, stat_result: os.stat_result) -> bool:
+        if_none_match = request_headers.get("if-none-match")
+        if if_none_match is not None:
+            return etag_matches(if_none_match, etag)
+
+        if_modified_since = request_headers.get("if-modified-since")
+        if if_modified_since:
+            parsed = parsedate(if_modified_since)
+            last_modified = parsedate(formatdate(stat_result.st_mtime, usegmt=True))
+            if parsed is not None and last_modified is not None and parsed >= last_modified:
+                return True
+        return False
+
+    @staticmethod
+    def if_range_allows(request_headers: Headers, etag: str, last_modified: str) -> bool:
+        if_range = request_headers.get("if-range")
+        if if_range is None:
+            return True
+        if_range = if_range.strip()
+        if if_range.startswith('"'):
+            return if_range == etag
+        return if_range == last_modified
@@ -0,0 +1,29 @@
+import sys
+import os
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app.database import SessionLocal, engine
+from app.models import Base, AssessmentScore, ProjectScore
+from app.services.score_service import refresh_scores
+
+def main():
+    print("🚀 Recalculando tabelas de notas...")
+    
+    Base.metadata.create_all(bind=engine)
+    
+    db = SessionLocal()
+    
+    try:
+        refresh_scores(db)
+        db.commit()
+        print(f"✅ {db.query(AssessmentScore).count()} avaliações e {db.query(ProjectScore).count()} projetos recalculados")
+    except Exception as e:
+        print(f"❌ Erro ao recalcular notas: {e}")
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    main()
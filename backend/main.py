@@ -1,14 +1,21 @@
 from fastapi import FastAPI, Depends
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.staticfiles import StaticFiles
-from app.routers.crud import users, evaluators, students, supervisors, schools, categories, projects, awards, assessments, questions, responses, events
-from app.routers.mobile import auth, assessments as mobile_assessments, questions as mobile_questions, responses as mobile_responses, events as mobile_events
-from app.routers import web_auth, documents, cards, password_reset_configs, import_general
+from app.routers.crud import users, evaluators, students, supervisors, schools, categories, projects, awards, assessments, questions, responses, events, scoring_profiles
+from app.routers.mobile import auth, assessments as mobile_assessments, questions as mobile_questions, responses as mobile_responses, events as mobile_events, sync as mobile_sync
+from app.routers import web_auth, documents, cards, password_reset_configs, import_general, scores, rollups, schedules
 from app.database import engine, Base
 from app.utils.auth import get_current_user
+from app.utils.uploads import UploadFiles
+from app.services.leaderboard_service import rebuild_leaderboard
+from app.services.next_project_service import rebuild_next_project_queue
+from app.services.snapshot_service import start_snapshot_scheduler, stop_snapshot_scheduler
+from app.services.score_service import ensure_scores
+from app.services.upsert_service import ensure_indexes
 from pathlib import Path
 
 Base.metadata.create_all(bind=engine)
+ensure_indexes(engine)
+ensure_scores(engine)
 
 app = FastAPI(
     title="Fecitel API",
@@ -34,6 +41,8 @@ app.include_router(mobile_questions.router, prefix="/api/v3/mobile", tags=["mobi
 app.include_router(mobile_responses.router, prefix="/api/v3/mobile", tags=["mobile"])
 # Rotas de eventos para o aplicativo mobile
 app.include_router(mobile_events.router, prefix="/api/v3/mobile/events", tags=["mobile"])
+# Rotas de sincronização offline para o aplicativo mobile
+app.include_router(mobile_sync.router, prefix="/api/v3/mobile", tags=["mobile"])
 
 # Rotas de autenticação para o sistema web
 app.include_router(web_auth.router, prefix="/api/v3/auth", tags=["auth"])
@@ -68,15 +77,43 @@ app.include_router(password_reset_configs.router, prefix="/api/v3/password-reset
 # Rotas de cards (autenticação obrigatória)
 app.include_router(cards.router, prefix="/api/v3/cards", tags=["cards"], dependencies=[Depends(get_current_user)])
 
+# Rotas de notas e análises (autenticação obrigatória)
+app.include_router(scores.router, prefix="/api/v3/scores", tags=["scores"], dependencies=[Depends(get_current_user)])
+
+# Rotas de consolidados anuais (autenticação obrigatória)
+app.include_router(rollups.router, prefix="/api/v3/rollups", tags=["rollups"], dependencies=[Depends(get_current_user)])
+
+# Rotas de horários das avaliações (autenticação obrigatória)
+app.include_router(schedules.router, prefix="/api/v3/schedules", tags=["schedules"], dependencies=[Depends(get_current_user)])
+
+# Rotas de perfis de pontuação (autenticação obrigatória)
+app.include_router(scoring_profiles.router, prefix="/api/v3/scoring-profiles", tags=["scoring-profiles"], dependencies=[Depends(get_current_user)])
+
 # Rotas de documentos (autenticação obrigatória)
 app.include_router(documents.router, prefix="/api/v3/docs", tags=["documents"], dependencies=[Depends(get_current_user)])
 
 # Rotas de importação (autenticação obrigatória)
 app.include_router(import_general.router, prefix="/api/v3/general", tags=["import"], dependencies=[Depends(get_current_user)])
 
+@app.on_event("startup")
+def load_leaderboard():
+    rebuild_leaderboard()
+
+@app.on_event("startup")
+def load_next_project_queue():
+    rebuild_next_project_queue()
+
+@app.on_event("startup")
+async def start_progress_snapshots():
+    start_snapshot_scheduler()
+
+@app.on_event("shutdown")
+async def stop_progress_snapshots():
+    await stop_snapshot_scheduler()
+
 uploads_dir = Path("uploads")
 uploads_dir.mkdir(exist_ok=True)
-app.mount("/uploads", StaticFiles(directory="uploads"), name="uploads")
+app.mount("/uploads", UploadFiles(directory="uploads"), name="uploads")
 
 @app.get("/")
 async def root():
@@ -0,0 +1,34 @@
+import sys
+import os
+from datetime import datetime
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app.database import SessionLocal, engine
+from app.models import Base
+from app.services.normalization_service import normalize_scores
+
+def main():
+    year = int(sys.argv[1]) if len(sys.argv) > 1 else datetime.now().year
+    print(f"🚀 Normalizando notas de {year} pelo viés dos avaliadores...")
+    
+    Base.metadata.create_all(bind=engine)
+    
+    db = SessionLocal()
+    
+    try:
+        summary = normalize_scores(db, year)
+        db.commit()
+        print(
+            f"✅ {summary['responses_count']} respostas, {summary['evaluators_count']} avaliadores e "
+            f"{summary['projects_count']} projetos processados em {summary['elapsed_ms']} ms"
+        )
+    except Exception as e:
+        print(f"❌ Erro ao normalizar notas: {e}")
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    main()